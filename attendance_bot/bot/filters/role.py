@@ -2,7 +2,8 @@ from aiogram.filters import BaseFilter
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.crud.employee import get_employee_by_telegram_id
+from database.crud.employee import get_employee_identity
+from schemas.employee import EmployeeIdentity
 
 
 async def is_user_verified(
@@ -10,8 +11,8 @@ async def is_user_verified(
     telegram_id: int,
 ) -> bool:
     """Проверить, верифицирован ли пользователь (есть в БД)."""
-    employee = await get_employee_by_telegram_id(session, telegram_id)
-    return employee is not None
+    identity = await get_employee_identity(session, telegram_id)
+    return identity is not None
 
 
 async def is_user_admin(
@@ -19,12 +20,12 @@ async def is_user_admin(
     telegram_id: int,
 ) -> bool:
     """Проверить, является ли пользователь админом."""
-    employee = await get_employee_by_telegram_id(session, telegram_id)
+    identity = await get_employee_identity(session, telegram_id)
 
-    if not employee:
+    if not identity:
         return False
 
-    return employee.role in ("admin", "superuser")
+    return identity.is_admin
 
 
 async def get_user_role(
@@ -32,12 +33,12 @@ async def get_user_role(
     telegram_id: int,
 ) -> str | None:
     """Получить роль пользователя. None если не найден."""
-    employee = await get_employee_by_telegram_id(session, telegram_id)
+    identity = await get_employee_identity(session, telegram_id)
 
-    if not employee:
+    if not identity:
         return None
 
-    return employee.role
+    return identity.role
 
 
 class IsVerifiedUser(BaseFilter):
@@ -46,9 +47,9 @@ class IsVerifiedUser(BaseFilter):
     async def __call__(
         self,
         event: Message | CallbackQuery,
-        session: AsyncSession
+        identity: EmployeeIdentity | None
     ) -> bool:
-        return await is_user_verified(session, event.from_user.id)
+        return identity is not None
 
 
 class IsAdmin(BaseFilter):
@@ -57,9 +58,9 @@ class IsAdmin(BaseFilter):
     async def __call__(
         self,
         event: Message | CallbackQuery,
-        session: AsyncSession
+        identity: EmployeeIdentity | None
     ) -> bool:
-        return await is_user_admin(session, event.from_user.id)
+        return identity is not None and identity.is_admin
 
 
 class IsAnonymous(BaseFilter):
@@ -68,6 +69,6 @@ class IsAnonymous(BaseFilter):
     async def __call__(
         self,
         event: Message | CallbackQuery,
-        session: AsyncSession
+        identity: EmployeeIdentity | None
     ) -> bool:
-        return not await is_user_verified(session, event.from_user.id)
+        return identity is None
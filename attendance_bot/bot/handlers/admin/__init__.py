@@ -4,6 +4,7 @@ from bot.filters.role import IsAdmin
 from .employees import router as employees_router
 from .invite_codes import router as invite_codes_router
 from .menu import router as menu_router
+from .reports import router as reports_router
 from .request_management import router as request_router
 from .start import router as start_router
 
@@ -14,5 +15,6 @@ admin_router.callback_query.filter(IsAdmin())
 admin_router.include_router(start_router)
 admin_router.include_router(menu_router)
 admin_router.include_router(request_router)
+admin_router.include_router(reports_router)
 admin_router.include_router(employees_router)
 admin_router.include_router(invite_codes_router)
@@ -7,6 +7,7 @@ from bot.keyboards.admin.menu import (
     employees_menu,
     requests_menu,
 )
+from bot.keyboards.admin.report_keyboards import get_report_period_keyboard
 from bot.lexicon.lexicon import AdminMessages
 from database.crud.employee import count_employees
 
@@ -26,8 +27,8 @@ async def open_requests_menu(message: Message):
 async def open_reports_menu(message: Message):
     """Открывает меню отчётов."""
     await message.answer(
-        AdminMessages.REPORTS_IN_PROGRESS,
-        reply_markup=admin_menu
+        AdminMessages.REPORTS_MENU,
+        reply_markup=get_report_period_keyboard()
     )
 
 
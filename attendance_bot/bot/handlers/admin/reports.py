@@ -0,0 +1,110 @@
+from aiogram import F, Router
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery
+
+from bot.keyboards.admin.report_keyboards import (
+    get_report_format_keyboard,
+    get_report_period_keyboard,
+)
+from bot.lexicon.lexicon import AdminMessages
+from bot.services.exports import ExportParams
+from bot.services.report_jobs import ReportJobQueue
+from bot.services.reports_request import ReportParams, report_period
+from core.logger import setup_logging
+from database.enums import ReportJobKindEnum
+from schemas.employee import EmployeeIdentity
+
+router = Router()
+logger = setup_logging(__name__)
+
+
+@router.callback_query(F.data.startswith("report:period:"))
+async def choose_report_format(callback: CallbackQuery):
+    """Предлагает выбрать формат отчёта за выбранный период."""
+    period = callback.data.split(":")[2]
+    date_from, date_to = report_period(period)
+
+    await callback.message.edit_text(
+        AdminMessages.REPORT_CHOOSE_FORMAT.format(
+            date_from=date_from.strftime('%d.%m.%Y'),
+            date_to=date_to.strftime('%d.%m.%Y')
+        ),
+        reply_markup=get_report_format_keyboard(period)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("report:build:"))
+async def build_report(
+    callback: CallbackQuery,
+    session,
+    identity: EmployeeIdentity,
+    reports: ReportJobQueue
+):
+    """Ставит сводный отчёт за период в очередь."""
+    _, _, period, fmt = callback.data.split(":")
+    date_from, date_to = report_period(period)
+
+    await callback.answer()
+    await reports.submit(
+        session,
+        ReportJobKindEnum.SUMMARY,
+        ReportParams(date_from=date_from, date_to=date_to, fmt=fmt),
+        callback.message.chat.id,
+        identity.id
+    )
+
+    await callback.message.edit_text(
+        AdminMessages.REPORTS_MENU,
+        reply_markup=get_report_period_keyboard()
+    )
+
+    logger.info(
+        f"Админ {callback.from_user.id} запросил отчёт "
+        f"за {date_from} — {date_to} ({fmt})"
+    )
+
+
+@router.callback_query(F.data.startswith("report:export:"))
+async def export_requests(
+    callback: CallbackQuery,
+    session,
+    identity: EmployeeIdentity,
+    reports: ReportJobQueue
+):
+    """Ставит полную выгрузку заявок с историей в очередь."""
+    fmt = callback.data.split(":")[2]
+
+    await callback.answer()
+    await reports.submit(
+        session,
+        ReportJobKindEnum.EXPORT,
+        ExportParams(fmt=fmt),
+        callback.message.chat.id,
+        identity.id
+    )
+
+    logger.info(
+        f"Админ {callback.from_user.id} запросил выгрузку заявок ({fmt})"
+    )
+
+
+@router.callback_query(F.data == "report:back")
+async def back_to_report_periods(callback: CallbackQuery):
+    """Возвращает к выбору периода."""
+    await callback.message.edit_text(
+        AdminMessages.REPORTS_MENU,
+        reply_markup=get_report_period_keyboard()
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data == "report:close")
+async def close_reports(callback: CallbackQuery):
+    """Закрывает меню отчётов."""
+    try:
+        await callback.message.delete()
+    except TelegramBadRequest:
+        pass
+
+    await callback.answer()
@@ -1,3 +1,5 @@
+from functools import partial
+
 from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message, ReplyKeyboardRemove
@@ -12,9 +14,10 @@ from bot.keyboards.admin.request_keyboards import (
     get_request_view_keyboard,
 )
 from bot.lexicon.lexicon import AdminMessages, status_icons, type_names
-from bot.services.notifications import NotificationService
+from bot.services.outbox import OutboxDispatcher
+from bot.services.request_window import request_windows
 from bot.states.states_fsm import RejectRequestStates
-from database.crud.employee import get_employee_by_telegram_id
+from database.absence_index import absence_index
 from database.crud.requests import (
     count_all_requests,
     count_pending_requests,
@@ -23,6 +26,7 @@ from database.crud.requests import (
     get_request_by_id,
     update_request_status,
 )
+from schemas.employee import EmployeeIdentity
 
 router = Router()
 
@@ -71,6 +75,11 @@ async def _cleanup_state_messages(
             await _safe_delete_by_id(bot, chat_id, msg_id)
 
 
+def _pending_window(chat_id: int) -> tuple:
+    """Ключ окна новых заявок для чата."""
+    return chat_id, "pending"
+
+
 def _get_total_pages(total: int, per_page: int = REQUESTS_PER_PAGE) -> int:
     """Вычисляет общее количество страниц."""
     return max(1, (total + per_page - 1) // per_page)
@@ -98,6 +107,10 @@ def _format_request_for_admin(request, index: int, total: int) -> str:
             comment=request.comment
         )
 
+    peak = absence_index.peak(request.start_date, request.end_date)
+    if peak is not None:
+        text += AdminMessages.REQUEST_VIEW_PEAK.format(peak=peak)
+
     text += AdminMessages.REQUEST_VIEW_FOOTER.format(
         created_at=request.created_at.strftime('%d.%m.%Y %H:%M'),
         current=index + 1,
@@ -149,27 +162,42 @@ def _format_requests_list(
     return text
 
 
-def _get_admin_full_name(admin) -> str:
-    """Возвращает полное имя админа."""
-    return f"{admin.last_name} {admin.name}"
+async def _get_pending_after(
+    session,
+    chat_id: int,
+    request_id: int,
+    index: int
+) -> tuple:
+    """Находит заявку для показа после обработки текущей и её индекс."""
+    key = _pending_window(chat_id)
+    loader = partial(get_pending_requests_paginated, session)
+
+    request = await request_windows.neighbour(key, loader, request_id)
+    if request:
+        return request, index
+
+    request = await request_windows.neighbour(
+        key,
+        loader,
+        request_id,
+        backward=True
+    )
+    if request:
+        return request, max(index - 1, 0)
+
+    return None, 0
 
 
-async def _show_request_at_index(
+async def _show_request(
     message: Message,
-    session,
+    request,
     index: int,
     total: int,
     edit: bool = False,
     state: FSMContext | None = None
 ):
-    """Показывает заявку по индексу."""
-    requests = await get_pending_requests_paginated(
-        session,
-        offset=index,
-        limit=1
-    )
-
-    if not requests:
+    """Показывает заявку с номером index из total."""
+    if request is None:
         if edit:
             try:
                 await message.edit_text(AdminMessages.NO_REQUESTS_LEFT)
@@ -185,7 +213,6 @@ async def _show_request_at_index(
             await state.clear()
         return
 
-    request = requests[0]
     text = _format_request_for_admin(request, index, total)
     keyboard = get_request_view_keyboard(request.id, index, total)
 
@@ -218,13 +245,26 @@ async def all_requests(message: Message, session, state: FSMContext, bot: Bot):
     page = 0
     requests = await get_all_requests_paginated(
         session,
-        offset=0,
         limit=REQUESTS_PER_PAGE
     )
 
+    # Счётчик и страница читаются отдельно (страница может прийти и из
+    # отстающей реплики), поэтому страница бывает пустой при total > 0.
+    if not requests:
+        await message.answer(
+            AdminMessages.ALL_REQUESTS_EMPTY,
+            reply_markup=requests_menu
+        )
+        return
+
     total_pages = _get_total_pages(total)
     text = _format_requests_list(requests, page, total)
-    keyboard = get_all_requests_pagination_keyboard(page, total_pages)
+    keyboard = get_all_requests_pagination_keyboard(
+        page,
+        total_pages,
+        requests[0].id,
+        requests[-1].id
+    )
 
     sent = await message.answer(text, reply_markup=keyboard)
     await state.update_data(
@@ -240,7 +280,15 @@ async def paginate_all_requests(
     state: FSMContext
 ):
     """Переключает страницу всех заявок."""
-    page = int(callback.data.split(":")[2])
+    parts = callback.data.split(":")
+    cursor, page, backward = None, 0, False
+
+    # Кнопки, отправленные до keyset-пагинации, несут только номер
+    # страницы (all_req:page:N): для них показываем первую страницу.
+    if len(parts) == 5:
+        _, _, direction, cursor_str, page_str = parts
+        cursor, page = int(cursor_str), int(page_str)
+        backward = direction == "prev"
 
     total = await count_all_requests(session)
 
@@ -253,8 +301,9 @@ async def paginate_all_requests(
 
     requests = await get_all_requests_paginated(
         session,
-        offset=page * REQUESTS_PER_PAGE,
-        limit=REQUESTS_PER_PAGE
+        cursor=cursor,
+        limit=REQUESTS_PER_PAGE,
+        backward=backward
     )
 
     if not requests:
@@ -262,8 +311,14 @@ async def paginate_all_requests(
         return
 
     total_pages = _get_total_pages(total)
+    page = min(page, total_pages - 1)
     text = _format_requests_list(requests, page, total)
-    keyboard = get_all_requests_pagination_keyboard(page, total_pages)
+    keyboard = get_all_requests_pagination_keyboard(
+        page,
+        total_pages,
+        requests[0].id,
+        requests[-1].id
+    )
 
     await state.update_data(all_req_page=page)
 
@@ -320,10 +375,15 @@ async def show_pending_requests(
     await _safe_delete_message(message)
     await _hide_reply_keyboard(message)
 
+    request = await request_windows.first(
+        _pending_window(chat_id),
+        partial(get_pending_requests_paginated, session)
+    )
+
     await state.update_data(current_index=0)
-    await _show_request_at_index(
+    await _show_request(
         message,
-        session,
+        request,
         index=0,
         total=total,
         state=state
@@ -337,20 +397,39 @@ async def navigate_requests(
     state: FSMContext
 ):
     """Навигация между заявками."""
-    _, index_str = callback.data.split(":")
-
-    if index_str == "ignore":
+    if callback.data == "req_nav:ignore":
         await callback.answer()
         return
 
-    index = int(index_str)
+    parts = callback.data.split(":")
     total = await count_pending_requests(session)
 
+    key = _pending_window(callback.message.chat.id)
+    loader = partial(get_pending_requests_paginated, session)
+
+    request = None
+    # Старые кнопки (req_nav:N) без курсора открывают первую заявку
+    if len(parts) == 4:
+        _, direction, cursor, index_str = parts
+        index = int(index_str)
+        request = await request_windows.neighbour(
+            key,
+            loader,
+            int(cursor),
+            backward=direction == "prev"
+        )
+
+    if not request:
+        # Список изменился, пока админ листал: начинаем с начала
+        request = await request_windows.first(key, loader)
+        index = 0
+
+    index = max(0, min(index, total - 1))
     await state.update_data(current_index=index)
 
-    await _show_request_at_index(
+    await _show_request(
         callback.message,
-        session,
+        request,
         index,
         total,
         edit=True,
@@ -363,6 +442,7 @@ async def navigate_requests(
 async def back_to_requests_menu(callback: CallbackQuery, state: FSMContext):
     """Возвращает в меню заявок."""
     await state.clear()
+    request_windows.drop(_pending_window(callback.message.chat.id))
     await _safe_delete_message(callback.message)
 
     await callback.message.answer(
@@ -376,22 +456,21 @@ async def back_to_requests_menu(callback: CallbackQuery, state: FSMContext):
 async def approve_request(
     callback: CallbackQuery,
     session,
-    bot: Bot,
-    state: FSMContext
+    state: FSMContext,
+    identity: EmployeeIdentity,
+    outbox: OutboxDispatcher
 ):
     """Одобряет заявку."""
     request_id = int(callback.data.split(":")[1])
 
-    request = await get_request_by_id(session, request_id)
+    request = await update_request_status(
+        session,
+        request_id=request_id,
+        new_status="approved",
+        changed_by_id=identity.id
+    )
 
     if not request:
-        await callback.answer(
-            AdminMessages.ERROR_REQUEST_NOT_FOUND,
-            show_alert=True
-        )
-        return
-
-    if request.status != "pending":
         await callback.answer(
             AdminMessages.ERROR_REQUEST_ALREADY_PROCESSED,
             show_alert=True
@@ -402,36 +481,7 @@ async def approve_request(
             pass
         return
 
-    admin = await get_employee_by_telegram_id(session, callback.from_user.id)
-
-    if not admin:
-        await callback.answer(AdminMessages.ERROR_AUTH, show_alert=True)
-        return
-
-    await update_request_status(
-        session,
-        request_id=request_id,
-        new_status="approved",
-        changed_by_id=admin.id
-    )
-
-    admin_name = _get_admin_full_name(admin)
-
-    notifier = NotificationService(bot)
-    await notifier.update_admin_notifications(
-        session,
-        request,
-        admin.id,
-        "approved",
-        admin_name
-    )
-
-    if request.employee.telegram_id:
-        await notifier.notify_user_request_approved(
-            request.employee.telegram_id,
-            request,
-            admin_name
-        )
+    outbox.wakeup()
 
     await callback.answer("✅ Заявка одобрена")
 
@@ -452,13 +502,18 @@ async def approve_request(
         await state.clear()
         return
 
-    if current_index >= total:
-        current_index = total - 1
+    next_request, current_index = await _get_pending_after(
+        session,
+        callback.message.chat.id,
+        request_id,
+        current_index
+    )
+    current_index = min(current_index, total - 1)
 
     await state.update_data(current_index=current_index)
-    await _show_request_at_index(
+    await _show_request(
         callback.message,
-        session,
+        next_request,
         current_index,
         total,
         edit=True,
@@ -519,7 +574,9 @@ async def process_reject_reason(
     message: Message,
     state: FSMContext,
     session,
-    bot: Bot
+    bot: Bot,
+    identity: EmployeeIdentity,
+    outbox: OutboxDispatcher
 ):
     """Обрабатывает введенную причину отклонения."""
     data = await state.get_data()
@@ -535,54 +592,23 @@ async def process_reject_reason(
     if reason_message_id:
         await _safe_delete_by_id(bot, chat_id, reason_message_id)
 
-    request = await get_request_by_id(session, request_id)
+    request = await update_request_status(
+        session,
+        request_id=request_id,
+        new_status="rejected",
+        changed_by_id=identity.id,
+        reason=reason
+    )
 
     if not request:
         await message.answer(
-            AdminMessages.ERROR_REQUEST_NOT_FOUND,
+            AdminMessages.ERROR_REQUEST_ALREADY_PROCESSED,
             reply_markup=requests_menu
         )
         await state.clear()
         return
 
-    admin = await get_employee_by_telegram_id(session, message.from_user.id)
-
-    if not admin:
-        await message.answer(
-            AdminMessages.ERROR_AUTH,
-            reply_markup=requests_menu
-        )
-        await state.clear()
-        return
-
-    await update_request_status(
-        session,
-        request_id=request_id,
-        new_status="rejected",
-        changed_by_id=admin.id,
-        reason=reason
-    )
-
-    admin_name = _get_admin_full_name(admin)
-
-    notifier = NotificationService(bot)
-
-    await notifier.update_admin_notifications(
-        session,
-        request,
-        admin.id,
-        "rejected",
-        admin_name,
-        reason
-    )
-
-    if request.employee and request.employee.telegram_id:
-        await notifier.notify_user_request_rejected(
-            request.employee.telegram_id,
-            request,
-            reason,
-            admin_name
-        )
+    outbox.wakeup()
 
     total = await count_pending_requests(session)
 
@@ -604,37 +630,34 @@ async def process_reject_reason(
         await state.clear()
         return
 
-    if current_index >= total:
-        current_index = total - 1
+    req, current_index = await _get_pending_after(
+        session,
+        chat_id,
+        request_id,
+        current_index
+    )
+    current_index = min(current_index, total - 1)
 
     await state.clear()
     await state.update_data(current_index=current_index)
 
-    if reject_message_id:
-        requests_list = await get_pending_requests_paginated(
-            session,
-            offset=current_index,
-            limit=1
+    if reject_message_id and req:
+        text = _format_request_for_admin(req, current_index, total)
+        keyboard = get_request_view_keyboard(
+            req.id,
+            current_index,
+            total
         )
 
-        if requests_list:
-            req = requests_list[0]
-            text = _format_request_for_admin(req, current_index, total)
-            keyboard = get_request_view_keyboard(
-                req.id,
-                current_index,
-                total
+        try:
+            await bot.edit_message_text(
+                text,
+                chat_id=chat_id,
+                message_id=reject_message_id,
+                reply_markup=keyboard
             )
-
-            try:
-                await bot.edit_message_text(
-                    text,
-                    chat_id=chat_id,
-                    message_id=reject_message_id,
-                    reply_markup=keyboard
-                )
-            except TelegramBadRequest:
-                pass
+        except TelegramBadRequest:
+            pass
 
 
 @router.callback_query(
@@ -645,7 +668,9 @@ async def reject_without_reason(
     callback: CallbackQuery,
     state: FSMContext,
     session,
-    bot: Bot
+    bot: Bot,
+    identity: EmployeeIdentity,
+    outbox: OutboxDispatcher
 ):
     """Отклоняет заявку без указания причины."""
     request_id = int(callback.data.split(":")[1])
@@ -654,50 +679,23 @@ async def reject_without_reason(
     reject_message_id = data.get("reject_message_id")
     chat_id = callback.message.chat.id
 
-    request = await get_request_by_id(session, request_id)
+    request = await update_request_status(
+        session,
+        request_id=request_id,
+        new_status="rejected",
+        changed_by_id=identity.id,
+        reason=None
+    )
 
     if not request:
         await callback.answer(
-            AdminMessages.ERROR_REQUEST_NOT_FOUND,
+            AdminMessages.ERROR_REQUEST_ALREADY_PROCESSED,
             show_alert=True
         )
         await state.clear()
         return
 
-    admin = await get_employee_by_telegram_id(session, callback.from_user.id)
-
-    if not admin:
-        await callback.answer(AdminMessages.ERROR_AUTH, show_alert=True)
-        await state.clear()
-        return
-
-    await update_request_status(
-        session,
-        request_id=request_id,
-        new_status="rejected",
-        changed_by_id=admin.id,
-        reason=None
-    )
-
-    admin_name = _get_admin_full_name(admin)
-
-    notifier = NotificationService(bot)
-
-    await notifier.update_admin_notifications(
-        session,
-        request,
-        admin.id,
-        "rejected",
-        admin_name
-    )
-
-    if request.employee.telegram_id:
-        await notifier.notify_user_request_rejected(
-            request.employee.telegram_id,
-            request,
-            None,
-            admin_name
-        )
+    outbox.wakeup()
 
     await callback.answer("✅ Заявка отклонена")
 
@@ -723,37 +721,34 @@ async def reject_without_reason(
         await state.clear()
         return
 
-    if current_index >= total:
-        current_index = total - 1
+    req, current_index = await _get_pending_after(
+        session,
+        chat_id,
+        request_id,
+        current_index
+    )
+    current_index = min(current_index, total - 1)
 
     await state.clear()
     await state.update_data(current_index=current_index)
 
-    if reject_message_id:
-        requests_list = await get_pending_requests_paginated(
-            session,
-            offset=current_index,
-            limit=1
+    if reject_message_id and req:
+        text = _format_request_for_admin(req, current_index, total)
+        keyboard = get_request_view_keyboard(
+            req.id,
+            current_index,
+            total
         )
 
-        if requests_list:
-            req = requests_list[0]
-            text = _format_request_for_admin(req, current_index, total)
-            keyboard = get_request_view_keyboard(
-                req.id,
-                current_index,
-                total
+        try:
+            await bot.edit_message_text(
+                text,
+                chat_id=chat_id,
+                message_id=reject_message_id,
+                reply_markup=keyboard
             )
-
-            try:
-                await bot.edit_message_text(
-                    text,
-                    chat_id=chat_id,
-                    message_id=reject_message_id,
-                    reply_markup=keyboard
-                )
-            except TelegramBadRequest:
-                pass
+        except TelegramBadRequest:
+            pass
 
 
 @router.callback_query(F.data == "req_reject_cancel")
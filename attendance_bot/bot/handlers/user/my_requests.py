@@ -1,14 +1,12 @@
-from aiogram import Bot, F, Router
+from functools import partial
+
+from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from aiogram.exceptions import TelegramBadRequest
 
 
 from core.logger import setup_logging
-from database.crud.employee import (
-    get_employee_role,
-    get_employee_by_telegram_id
-)
 from database.crud.requests import (
     cancel_request_by_user,
     count_user_requests,
@@ -26,13 +24,20 @@ from bot.keyboards.user.inline_keyboards import (
     get_cancel_confirm_keyboard,
     get_user_request_keyboard,
 )
-from bot.services.notifications import NotificationService
+from bot.services.outbox import OutboxDispatcher
+from bot.services.request_window import request_windows
 from bot.utils.utils import get_menu_by_role
+from schemas.employee import EmployeeIdentity
 
 router = Router()
 logger = setup_logging(__name__)
 
 
+def _my_window(chat_id: int) -> tuple:
+    """Ключ окна заявок пользователя для чата."""
+    return chat_id, "my"
+
+
 def format_user_request(request, index: int, total: int) -> str:
     """Форматирует заявку для просмотра пользователем."""
 
@@ -77,18 +82,19 @@ def format_user_request(request, index: int, total: int) -> str:
     return text
 
 
-async def show_request_at_index(
+async def show_user_request(
     message: Message,
     session,
     employee_id: int,
+    request,
     index: int,
     edit: bool = False
 ) -> None:
-    """Показывает заявку по индексу."""
+    """Показывает заявку пользователя с номером index."""
 
     total = await count_user_requests(session, employee_id)
 
-    if total == 0:
+    if total == 0 or request is None:
         text = RequestMessages.NO_REQUESTS
         if edit:
             await message.edit_text(text)
@@ -96,22 +102,7 @@ async def show_request_at_index(
             await message.answer(text)
         return
 
-    if index >= total:
-        index = total - 1
-    if index < 0:
-        index = 0
-
-    requests = await get_user_requests_paginated(
-        session,
-        employee_id,
-        offset=index,
-        limit=1
-    )
-
-    if not requests:
-        return
-
-    request = requests[0]
+    index = max(0, min(index, total - 1))
     text = format_user_request(request, index, total)
 
     can_cancel = request.status == "pending"
@@ -132,13 +123,14 @@ async def show_request_at_index(
 
 
 @router.message(F.text == "📋 Мои заявки")
-async def my_requests(message: Message, session, state: FSMContext):
+async def my_requests(
+    message: Message,
+    session,
+    state: FSMContext,
+    identity: EmployeeIdentity
+):
     """Показывает заявки пользователя."""
-    employee = await get_employee_by_telegram_id(session, message.from_user.id)
-
-    if not employee:
-        await message.answer(RequestMessages.PROFILE_NOT_FOUND)
-        return
+    employee = identity
 
     total = await count_user_requests(session, employee.id)
 
@@ -146,12 +138,17 @@ async def my_requests(message: Message, session, state: FSMContext):
         await message.answer(RequestMessages.NO_REQUESTS)
         return
 
+    request = await request_windows.first(
+        _my_window(message.chat.id),
+        partial(get_user_requests_paginated, session, employee.id)
+    )
+
     await state.update_data(
-        employee_id=employee.id,
-        current_index=0
+        current_index=0,
+        current_request_id=request.id if request else None
     )
 
-    await show_request_at_index(message, session, employee.id, 0)
+    await show_user_request(message, session, employee.id, request, 0)
 
     logger.info(f"Показ заявок пользователю {message.from_user.id}")
 
@@ -160,33 +157,42 @@ async def my_requests(message: Message, session, state: FSMContext):
 async def paginate_requests(
     callback: CallbackQuery,
     session,
-    state: FSMContext
+    state: FSMContext,
+    identity: EmployeeIdentity
 ):
     """Переключает страницу заявок."""
-    index = int(callback.data.split(":")[2])
+    parts = callback.data.split(":")
+    employee_id = identity.id
+
+    key = _my_window(callback.message.chat.id)
+    loader = partial(get_user_requests_paginated, session, employee_id)
+
+    request = None
+    # Старые кнопки (my_req:page:N) без курсора открывают первую заявку
+    if len(parts) == 5:
+        _, _, direction, cursor, index_str = parts
+        index = int(index_str)
+        request = await request_windows.neighbour(
+            key,
+            loader,
+            int(cursor),
+            backward=direction == "prev"
+        )
 
-    data = await state.get_data()
-    employee_id = data.get("employee_id")
-
-    if not employee_id:
-        employee = await get_employee_by_telegram_id(
-            session,
-            callback.from_user.id
-            )
-        if not employee:
-            await callback.answer(
-                RequestMessages.PROFILE_NOT_FOUND,
-                show_alert=True
-            )
-            return
-        employee_id = employee.id
-
-    await state.update_data(current_index=index)
-
-    await show_request_at_index(
+    if not request:
+        request = await request_windows.first(key, loader)
+        index = 0
+
+    await state.update_data(
+        current_index=index,
+        current_request_id=request.id if request else None
+    )
+
+    await show_user_request(
         callback.message,
         session,
         employee_id,
+        request,
         index,
         edit=True
     )
@@ -235,22 +241,12 @@ async def confirm_cancel_request(
     callback: CallbackQuery,
     session,
     state: FSMContext,
-    bot: Bot
+    identity: EmployeeIdentity,
+    outbox: OutboxDispatcher
 ):
     """Подтверждает отмену заявки."""
     request_id = int(callback.data.split(":")[2])
-
-    employee = await get_employee_by_telegram_id(
-        session,
-        callback.from_user.id
-        )
-
-    if not employee:
-        await callback.answer(
-            RequestMessages.PROFILE_NOT_FOUND,
-            show_alert=True
-        )
-        return
+    employee = identity
 
     request = await cancel_request_by_user(session, request_id, employee.id)
 
@@ -261,12 +257,7 @@ async def confirm_cancel_request(
         )
         return
 
-    notifier = NotificationService(bot)
-    await notifier.notify_admins_request_cancelled(
-        session,
-        request,
-        employee
-    )
+    outbox.wakeup()
 
     await callback.answer(
         RequestMessages.REQUEST_CANCELLED_SUCCESS.format(id=request_id),
@@ -284,23 +275,18 @@ async def confirm_cancel_request(
         except TelegramBadRequest:
             pass
 
-        role = await get_employee_role(session, callback.from_user.id)
         await callback.message.answer(
             RequestMessages.NO_REQUESTS,
-            reply_markup=get_menu_by_role(role)
+            reply_markup=get_menu_by_role(identity.role)
         )
         await state.clear()
         return
 
-    if current_index >= total:
-        current_index = total - 1
-
-    await state.update_data(current_index=current_index)
-
-    await show_request_at_index(
+    await show_user_request(
         callback.message,
         session,
         employee.id,
+        request,
         current_index,
         edit=True
     )
@@ -310,46 +296,58 @@ async def confirm_cancel_request(
 async def cancel_back(
     callback: CallbackQuery,
     session,
-    state: FSMContext
+    state: FSMContext,
+    identity: EmployeeIdentity
 ):
     """Возвращает к просмотру заявки."""
     data = await state.get_data()
-    employee_id = data.get("employee_id")
     current_index = data.get("current_index", 0)
-
-    if not employee_id:
-        employee = await get_employee_by_telegram_id(
-            session, callback.from_user.id)
-        if employee:
-            employee_id = employee.id
-
-    if employee_id:
-        await show_request_at_index(
-            callback.message,
-            session,
-            employee_id,
-            current_index,
-            edit=True
+    key = _my_window(callback.message.chat.id)
+
+    request = None
+    request_id = data.get("current_request_id")
+    if request_id:
+        request = request_windows.get(key, request_id)
+        if request is None:
+            request = await get_request_by_id(session, request_id)
+
+    if request is None or request.employee_id != identity.id:
+        request = await request_windows.first(
+            key,
+            partial(get_user_requests_paginated, session, identity.id)
         )
+        current_index = 0
+
+    await show_user_request(
+        callback.message,
+        session,
+        identity.id,
+        request,
+        current_index,
+        edit=True
+    )
 
     await callback.answer()
 
 
 @router.callback_query(F.data == "my_req:close")
-async def close_requests(callback: CallbackQuery, session, state: FSMContext):
+async def close_requests(
+    callback: CallbackQuery,
+    state: FSMContext,
+    identity: EmployeeIdentity
+):
     """Закрывает просмотр заявок."""
     await state.clear()
+    request_windows.drop(_my_window(callback.message.chat.id))
 
     try:
         await callback.message.delete()
     except TelegramBadRequest:
         pass
 
-    role = await get_employee_role(session, callback.from_user.id)
-
     await callback.message.answer(
         MenuButtons.MAIN_MENU,
-        reply_markup=get_menu_by_role(role)
+        reply_markup=get_menu_by_role(identity.role)
     )
     await callback.answer()
 
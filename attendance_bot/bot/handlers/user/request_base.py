@@ -5,7 +5,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 from aiogram.exceptions import TelegramBadRequest
 
-from bot.services.notifications import NotificationService
+from bot.services.outbox import OutboxDispatcher
 from bot.states.states_fsm import CreateRequestStates
 from bot.keyboards.user.inline_keyboards import (
     get_cancel_keyboard,
@@ -19,6 +19,7 @@ from bot.lexicon.lexicon import (
     RequestMessages,
 )
 from bot.utils.utils import (
+    find_request_conflicts,
     get_menu_by_role,
     format_request_preview,
     safe_delete_message,
@@ -27,10 +28,7 @@ from bot.utils.utils import (
     hide_reply_keyboard,
     cleanup_state_messages,
 )
-from database.crud.employee import (
-    get_employee_by_telegram_id,
-    get_employee_role,
-)
+from schemas.employee import EmployeeIdentity
 
 router = Router(name="request_base")
 
@@ -75,7 +73,7 @@ async def start_request(message: Message, state: FSMContext) -> None:
 async def cancel_request(
     callback: CallbackQuery,
     state: FSMContext,
-    session
+    identity: EmployeeIdentity
 ) -> None:
     """Отменяет создание заявки."""
     bot = callback.bot
@@ -90,11 +88,9 @@ async def cancel_request(
 
     await state.clear()
 
-    role = await get_employee_role(session, callback.from_user.id)
-
     await callback.message.answer(
         RequestMessages.REQUEST_CANCELLED,
-        reply_markup=get_menu_by_role(role)
+        reply_markup=get_menu_by_role(identity.role)
     )
     await callback.answer()
 
@@ -144,7 +140,8 @@ async def process_type(callback: CallbackQuery, state: FSMContext) -> None:
 async def skip_comment(
     callback: CallbackQuery,
     state: FSMContext,
-    session
+    session,
+    identity: EmployeeIdentity
 ) -> None:
     """Пропускает ввод комментария."""
     data = await state.get_data()
@@ -157,11 +154,9 @@ async def skip_comment(
         await safe_delete_message(callback, state)
         await state.clear()
 
-        role = await get_employee_role(session, callback.from_user.id)
-
         await callback.message.answer(
             MenuButtons.MAIN_MENU,
-            reply_markup=get_menu_by_role(role)
+            reply_markup=get_menu_by_role(identity.role)
         )
         return
 
@@ -169,11 +164,16 @@ async def skip_comment(
     await state.update_data(keyboard_type="preview")
 
     from bot.handlers.user.request_navigation import show_request_preview
-    await show_request_preview(callback, state)
+    await show_request_preview(callback, state, session, identity.id)
 
 
 @router.message(CreateRequestStates.entering_comment)
-async def process_comment(message: Message, state: FSMContext) -> None:
+async def process_comment(
+    message: Message,
+    state: FSMContext,
+    session,
+    identity: EmployeeIdentity
+) -> None:
     """Обрабатывает ввод комментария текстом."""
     comment = message.text.strip()
     if comment == "-":
@@ -190,9 +190,11 @@ async def process_comment(message: Message, state: FSMContext) -> None:
     except TelegramBadRequest:
         pass
 
+    conflicts = await find_request_conflicts(session, identity.id, data)
+
     await send_new_message(
         message,
-        format_request_preview(data),
+        format_request_preview(data, conflicts),
         get_edit_options_keyboard(data["request_type"]),
         state
     )
@@ -203,23 +205,40 @@ async def confirm_request(
     callback: CallbackQuery,
     state: FSMContext,
     session,
-    bot: Bot
+    bot: Bot,
+    identity: EmployeeIdentity,
+    outbox: OutboxDispatcher
 ) -> None:
-    """Сохраняет заявку и отправляет уведомления."""
+    """Сохраняет заявку и ставит уведомления админам в очередь.
+
+    Перед сохранением пересечения проверяются ещё раз: с момента
+    предпросмотра могла появиться другая заявка.
+    """
     data = await state.get_data()
     request_type = data["request_type"]
+
+    conflicts = await find_request_conflicts(session, identity.id, data)
+    if conflicts:
+        from bot.handlers.user.request_navigation import show_request_preview
+        await callback.answer(
+            RequestMessages.ALERT_REQUEST_CONFLICT.format(id=conflicts[0].id),
+            show_alert=True
+        )
+        await show_request_preview(callback, state, session, identity.id)
+        return
+
     if request_type == "partial_absence":
         from bot.handlers.user.request_partial import create_partial_request
         request = await create_partial_request(
             session,
-            callback.from_user.id,
+            identity.id,
             data
         )
     else:
         from bot.handlers.user.request_full import create_full_request
         request = await create_full_request(
             session,
-            callback.from_user.id,
+            identity.id,
             data
         )
     if not request:
@@ -230,26 +249,14 @@ async def confirm_request(
 
         await state.clear()
 
-        role = await get_employee_role(session, callback.from_user.id)
-
         await callback.message.answer(
             RequestMessages.ERROR_PROFILE_NOT_FOUND,
-            reply_markup=get_menu_by_role(role)
+            reply_markup=get_menu_by_role(identity.role)
         )
         await callback.answer()
         return
 
-    employee = await get_employee_by_telegram_id(
-        session,
-        callback.from_user.id
-    )
-
-    notifier = NotificationService(bot)
-    admin_results = await notifier.notify_admins_new_request(
-        session,
-        request,
-        employee
-    )
+    outbox.wakeup()
 
     chat_id = callback.message.chat.id
     await cleanup_state_messages(bot, chat_id, state)
@@ -257,7 +264,6 @@ async def confirm_request(
     await state.clear()
 
     type_name = REQUEST_TYPE_LABELS.get(request_type, request_type)
-    admin_count = len(admin_results['success'])
 
     if request_type == "partial_absence":
         start_dt = datetime.fromisoformat(data["start_date"])
@@ -268,8 +274,7 @@ async def confirm_request(
             type=type_name,
             date=start_dt.strftime('%d.%m.%Y'),
             start_time=start_dt.strftime('%H:%M'),
-            end_time=end_dt.strftime('%H:%M'),
-            count=admin_count
+            end_time=end_dt.strftime('%H:%M')
         )
     else:
         start_dt = datetime.fromisoformat(data["start_date"])
@@ -279,8 +284,7 @@ async def confirm_request(
             id=request.id,
             type=type_name,
             start_date=start_dt.strftime('%d.%m.%Y'),
-            end_date=end_dt.strftime('%d.%m.%Y'),
-            count=admin_count
+            end_date=end_dt.strftime('%d.%m.%Y')
         )
 
     try:
@@ -288,11 +292,9 @@ async def confirm_request(
     except TelegramBadRequest:
         pass
 
-    role = await get_employee_role(session, callback.from_user.id)
-
     await callback.message.answer(
         success_text,
-        reply_markup=get_menu_by_role(role)
+        reply_markup=get_menu_by_role(identity.role)
     )
     await callback.answer("✅ Заявка отправлена!")
 
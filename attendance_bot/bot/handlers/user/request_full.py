@@ -143,14 +143,14 @@ async def process_end_date(
     await callback.answer()
 
 
-async def create_full_request(session, telegram_id: int, data: dict):
+async def create_full_request(session, employee_id: int, data: dict):
     """Создаёт заявку на полный день."""
     start_date = datetime.fromisoformat(data["start_date"])
     end_date = datetime.fromisoformat(data["end_date"])
 
     return await create_absence_request(
         session=session,
-        telegram_id=telegram_id,
+        employee_id=employee_id,
         request_type=data["request_type"],
         start_date=start_date,
         end_date=end_date,
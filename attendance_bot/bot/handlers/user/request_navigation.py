@@ -20,10 +20,12 @@ from bot.lexicon.lexicon import (
 )
 from bot.states.states_fsm import CreateRequestStates
 from bot.utils.utils import (
+    find_request_conflicts,
     format_request_preview,
     send_new_message,
     safe_delete_message,
 )
+from schemas.employee import EmployeeIdentity
 
 router = Router(name="request_navigation")
 
@@ -50,16 +52,24 @@ def _get_partial_times(data: dict) -> tuple[str, str]:
 
 async def show_request_preview(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    session,
+    employee_id: int
 ):
-    """Показывает предпросмотр заявки с вариантами редактирования."""
+    """Показывает предпросмотр заявки с вариантами редактирования.
+
+    Если период пересекается с другими заявками сотрудника, они
+    перечисляются под предпросмотром.
+    """
     data = await state.get_data()
     await state.set_state(CreateRequestStates.confirming)
     await state.update_data(keyboard_type="preview")
 
+    conflicts = await find_request_conflicts(session, employee_id, data)
+
     await send_new_message(
         callback,
-        format_request_preview(data),
+        format_request_preview(data, conflicts),
         get_edit_keyboard_by_type(data["request_type"]),
         state
     )
@@ -274,7 +284,12 @@ async def edit_comment(
 
 
 @router.callback_query(F.data.startswith("back:"))
-async def go_back(callback: CallbackQuery, state: FSMContext):
+async def go_back(
+    callback: CallbackQuery,
+    state: FSMContext,
+    session,
+    identity: EmployeeIdentity
+):
     """Возвращает на предыдущий шаг."""
     action = callback.data.split(":")[1]
     data = await state.get_data()
@@ -296,7 +311,7 @@ async def go_back(callback: CallbackQuery, state: FSMContext):
         await back_to_end_date(callback, state, data)
 
     elif action == "to_preview":
-        await show_request_preview(callback, state)
+        await show_request_preview(callback, state, session, identity.id)
 
     await callback.answer()
 
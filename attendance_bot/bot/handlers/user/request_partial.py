@@ -195,14 +195,14 @@ async def process_partial_end_time(
     await callback.answer()
 
 
-async def create_partial_request(session, telegram_id: int, data: dict):
+async def create_partial_request(session, employee_id: int, data: dict):
     """Создаёт заявку на частичное отсутствие."""
     start_datetime = datetime.fromisoformat(data["start_date"])
     end_datetime = datetime.fromisoformat(data["end_date"])
 
     return await create_absence_request(
         session=session,
-        telegram_id=telegram_id,
+        employee_id=employee_id,
         request_type="partial_absence",
         start_date=start_datetime,
         end_date=end_datetime,
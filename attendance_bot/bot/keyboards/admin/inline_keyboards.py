@@ -47,9 +47,14 @@ def get_confirm_employee_keyboard():
 
 def get_all_requests_pagination_keyboard(
     page: int,
-    total_pages: int
+    total_pages: int,
+    first_id: int,
+    last_id: int
 ) -> InlineKeyboardMarkup:
-    """Создаёт клавиатуру пагинации для всех заявок."""
+    """Создаёт клавиатуру пагинации для всех заявок.
+
+    first_id и last_id — крайние заявки страницы, курсоры для переходов.
+    """
     builder = InlineKeyboardBuilder()
 
     nav_buttons = []
@@ -57,7 +62,7 @@ def get_all_requests_pagination_keyboard(
     if page > 0:
         nav_buttons.append(InlineKeyboardButton(
             text="◀️ Назад",
-            callback_data=f"all_req:page:{page - 1}"
+            callback_data=f"all_req:page:prev:{first_id}:{page - 1}"
         ))
 
     nav_buttons.append(InlineKeyboardButton(
@@ -68,7 +73,7 @@ def get_all_requests_pagination_keyboard(
     if page < total_pages - 1:
         nav_buttons.append(InlineKeyboardButton(
             text="Вперёд ▶️",
-            callback_data=f"all_req:page:{page + 1}"
+            callback_data=f"all_req:page:next:{last_id}:{page + 1}"
         ))
 
     builder.row(*nav_buttons)
@@ -0,0 +1,36 @@
+from aiogram.types import InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+
+def get_report_period_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура выбора периода отчёта."""
+
+    builder = InlineKeyboardBuilder()
+    builder.button(
+        text="📅 Текущий месяц", callback_data="report:period:month")
+    builder.button(
+        text="📅 Прошлый месяц", callback_data="report:period:prev_month")
+    builder.button(
+        text="📅 С начала года", callback_data="report:period:year")
+    builder.button(
+        text="📦 Выгрузка XLSX", callback_data="report:export:xlsx")
+    builder.button(
+        text="📦 Выгрузка CSV", callback_data="report:export:csv")
+    builder.button(text="❌ Закрыть", callback_data="report:close")
+    builder.adjust(1, 1, 1, 2, 1)
+
+    return builder.as_markup()
+
+
+def get_report_format_keyboard(period: str) -> InlineKeyboardMarkup:
+    """Клавиатура выбора формата отчёта за период."""
+
+    builder = InlineKeyboardBuilder()
+    builder.button(
+        text="📗 Excel (XLSX)", callback_data=f"report:build:{period}:xlsx")
+    builder.button(
+        text="📄 CSV", callback_data=f"report:build:{period}:csv")
+    builder.button(text="🔙 Назад", callback_data="report:back")
+    builder.adjust(2, 1)
+
+    return builder.as_markup()
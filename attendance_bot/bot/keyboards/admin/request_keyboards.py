@@ -20,7 +20,11 @@ def get_request_view_keyboard(
     current_index: int,
     total_count: int
 ) -> InlineKeyboardMarkup:
-    """Клавиатура просмотра заявки с пагинацией."""
+    """Клавиатура просмотра заявки с пагинацией.
+
+    Кнопки навигации несут id текущей заявки как курсор и индекс
+    соседней заявки для счётчика.
+    """
 
     builder = InlineKeyboardBuilder()
 
@@ -32,7 +36,7 @@ def get_request_view_keyboard(
     if current_index > 0:
         builder.button(
             text="◀️ Пред.",
-            callback_data=f"req_nav:{current_index - 1}"
+            callback_data=f"req_nav:prev:{request_id}:{current_index - 1}"
         )
     else:
         builder.button(text="◀️", callback_data="req_nav:ignore")
@@ -45,7 +49,7 @@ def get_request_view_keyboard(
     if current_index < total_count - 1:
         builder.button(
             text="След. ▶️",
-            callback_data=f"req_nav:{current_index + 1}"
+            callback_data=f"req_nav:next:{request_id}:{current_index + 1}"
         )
     else:
         builder.button(text="▶️", callback_data="req_nav:ignore")
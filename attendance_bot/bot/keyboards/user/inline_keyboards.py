@@ -18,7 +18,7 @@ def get_user_request_keyboard(
     if index > 0:
         nav_buttons.append(InlineKeyboardButton(
             text="◀️",
-            callback_data=f"my_req:page:{index - 1}"
+            callback_data=f"my_req:page:prev:{request_id}:{index - 1}"
         ))
 
     nav_buttons.append(InlineKeyboardButton(
@@ -29,7 +29,7 @@ def get_user_request_keyboard(
     if index < total - 1:
         nav_buttons.append(InlineKeyboardButton(
             text="▶️",
-            callback_data=f"my_req:page:{index + 1}"
+            callback_data=f"my_req:page:next:{request_id}:{index + 1}"
         ))
 
     builder.row(*nav_buttons)
@@ -154,6 +154,17 @@ class RequestMessages:
         "❌ Нельзя выбрать дату в прошлом!\n"
         "Выберите сегодняшний или будущий день."
     )
+    REQUEST_CONFLICTS = (
+        "\n\n⚠️ <b>Период пересекается с вашими заявками:</b>\n"
+        "{conflicts}\n"
+        "<i>Измените даты или отмените прежнюю заявку "
+        "в «Мои заявки».</i>"
+    )
+    REQUEST_CONFLICT_ITEM = "{status_icon} #{id} {type_name}: {dates}\n"
+    ALERT_REQUEST_CONFLICT = (
+        "❌ Период пересекается с заявкой #{id}.\n"
+        "Измените даты перед отправкой."
+    )
     REQUEST_CANCELLED = "❌ Создание заявки отменено"
     REQUEST_CREATED = "✅ Заявка #{id} отправлена!"
     ADMINS_NOTIFIED = "📨 Уведомлено администраторов: {count}"
@@ -175,14 +186,14 @@ class RequestMessages:
         "✅ <b>Заявка #{id} отправлена!</b>\n\n"
         "📌 Тип: {type}\n"
         "📅 Период: {start_date} — {end_date}\n\n"
-        "📨 Уведомлено администраторов: {count}"
+        "📨 Администраторы получат уведомление"
     )
     REQUEST_SUCCESS_PARTIAL = (
         "✅ <b>Заявка #{id} отправлена!</b>\n\n"
         "📌 Тип: {type}\n"
         "📅 Дата: {date}\n"
         "⏰ Время: {start_time} — {end_time}\n\n"
-        "📨 Уведомлено администраторов: {count}"
+        "📨 Администраторы получат уведомление"
     )
     MY_REQUESTS_HEADER = (
         "📋 <b>Ваша заявка</b> "
@@ -342,7 +353,27 @@ class AdminMessages:
         "📁 <b>Меню заявок</b>\n\n"
         "Выберите действие:"
     )
-    REPORTS_IN_PROGRESS = "📊 <b>Отчёты</b>\n\n🚧 В разработке"
+    REPORTS_MENU = (
+        "📊 <b>Отчёты</b>\n\n"
+        "Сводка по сотрудникам: одобренные дни отсутствия по типам "
+        "и количество заявок по статусам.\n\n"
+        "Выберите период:"
+    )
+    REPORT_CHOOSE_FORMAT = (
+        "📊 <b>Отчёт за {date_from} — {date_to}</b>\n\n"
+        "Выберите формат:"
+    )
+    REPORT_CAPTION = "📊 Отсутствия за {date_from} — {date_to}"
+    REPORT_QUEUED = "🕐 Отчёт поставлен в очередь"
+    REPORT_RUNNING = "⏳ Формирую отчёт..."
+    REPORT_PROGRESS = "⏳ Формирую отчёт: обработано строк {rows}"
+    REPORT_DONE = "✅ Отчёт готов"
+    REPORT_FAILED = "❌ Не удалось сформировать отчёт, попробуйте позже"
+    EXPORT_CAPTION = "📦 Выгрузка заявок с историей (строк: {rows})"
+    DIGEST_HEADER = "📅 <b>Сегодня, {date}, отсутствуют:</b>\n"
+    DIGEST_TYPE = "\n<b>{type_name}</b> ({count}):\n"
+    DIGEST_ITEM = "   👤 {full_name} — {dates}\n"
+    DIGEST_EMPTY = "📅 <b>Сегодня, {date}</b>\n\n✨ Все на месте"
     MAIN_MENU_ADMIN = "🏠 <b>Главное меню администратора</b>"
     ACTION_CANCELLED = "Действие отменено"
     EMPLOYEES_COUNT = "👥 Сотрудников в системе: {count}"
@@ -365,6 +396,9 @@ class AdminMessages:
         "📅 <b>Даты:</b> {start_date} — {end_date} ({days} дн.)\n"
     )
     REQUEST_VIEW_COMMENT = "💬 <b>Комментарий:</b> {comment}\n"
+    REQUEST_VIEW_PEAK = (
+        "👥 <b>В эти даты уже отсутствуют:</b> до {peak} чел.\n"
+    )
     REQUEST_VIEW_FOOTER = (
         "\n🕐 <b>Подана:</b> {created_at}\n\n"
         "<i>Заявка {current} из {total}</i>"
@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import suppress
+from datetime import date, datetime, time, timedelta
+
+from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.services.notifications import NotificationService
+from consts import DIGEST_HOUR, DIGEST_MINUTE, DIGEST_WEEKDAYS
+from core.logger import setup_logging
+from database.crud.digest import claim_digest_day
+from database.crud.requests import LOCAL_TIMEZONE
+
+logger = setup_logging(__name__)
+
+
+class DailyDigest:
+    """Утренняя сводка «кто сегодня отсутствует» для админов.
+
+    Фоновая задача спит до DIGEST_HOUR:DIGEST_MINUTE по московскому
+    времени и в рабочие дни рассылает одно сообщение со всеми одобренными
+    отсутствиями на сегодня. Сводка строится одним запросом к таблице
+    absence_days.
+
+    День закрепляется в таблице digest_runs до рассылки, поэтому при
+    нескольких инстансах сводку отправляет только один. Инстанс,
+    запущенный после времени рассылки, досылает сегодняшнюю сводку, если
+    её ещё никто не отправил.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        at: time = time(DIGEST_HOUR, DIGEST_MINUTE),
+        weekdays: tuple[int, ...] = DIGEST_WEEKDAYS,
+    ):
+        """Инициализирует рассылку."""
+
+        self.session_factory = session_factory
+        self.at = at
+        self.weekdays = weekdays
+        self.notifier = NotificationService(bot)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Запускает фоновую задачу."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run(),
+                name="daily-digest"
+            )
+            logger.info(
+                f"Утренняя сводка запланирована на {self.at:%H:%M} (МСК)"
+            )
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def send(self, day: date) -> None:
+        """Рассылает сводку за указанный день, если её ещё не отправили."""
+        async with self.session_factory() as session:
+            if not await claim_digest_day(session, day):
+                logger.info(f"Сводка за {day:%d.%m.%Y} уже разослана")
+                return
+
+            results = await self.notifier.notify_admins_daily_digest(
+                session,
+                day
+            )
+
+        logger.info(
+            f"Сводка за {day:%d.%m.%Y}: доставлено "
+            f"{len(results['success'])}, не доставлено "
+            f"{len(results['failed'])}"
+        )
+
+    def is_due(self, now: datetime) -> bool:
+        """Наступило ли сегодня время рассылки."""
+        local = now.astimezone(LOCAL_TIMEZONE)
+        return local.weekday() in self.weekdays and local.time() >= self.at
+
+    def next_run(self, now: datetime) -> datetime:
+        """Ближайший момент рассылки после now."""
+        run = LOCAL_TIMEZONE.localize(
+            datetime.combine(now.astimezone(LOCAL_TIMEZONE).date(), self.at)
+        )
+        while run <= now or run.weekday() not in self.weekdays:
+            run = LOCAL_TIMEZONE.localize(
+                datetime.combine(run.date() + timedelta(days=1), self.at)
+            )
+        return run
+
+    async def _run(self) -> None:
+        """Основной цикл: рассылка за сегодня и ожидание следующего утра."""
+        while True:
+            now = datetime.now(LOCAL_TIMEZONE)
+
+            if self.is_due(now):
+                try:
+                    await self.send(now.date())
+                except Exception:
+                    logger.exception("Не удалось разослать утреннюю сводку")
+
+            now = datetime.now(LOCAL_TIMEZONE)
+            run = self.next_run(now)
+            await asyncio.sleep((run - now).total_seconds())
@@ -0,0 +1,194 @@
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Awaitable, Callable, Literal
+
+from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.lexicon.lexicon import status_names, type_names
+from consts import EXPORT_CHUNK_SIZE, XLSX_MAX_ROWS
+from core.logger import setup_logging
+from database.crud.reports import stream_requests_export
+from database.crud.requests import LOCAL_TIMEZONE
+
+logger = setup_logging(__name__)
+
+ExportFormat = Literal["xlsx", "csv"]
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+EXPORT_HEADER = [
+    "ID заявки",
+    "Тип",
+    "Статус",
+    "Начало",
+    "Окончание",
+    "Комментарий",
+    "Причина отклонения",
+    "Подана",
+    "Сотрудник",
+    "Email",
+    "Должность",
+    "Изменение",
+    "Было",
+    "Стало",
+    "Причина изменения",
+    "Когда изменено",
+    "Кем изменено",
+]
+
+
+@dataclass(frozen=True)
+class ExportParams:
+    """Параметры выгрузки заявок."""
+
+    fmt: ExportFormat = "xlsx"
+    date_from: date | None = None
+    date_to: date | None = None
+
+    @property
+    def filename(self) -> str:
+        """Имя файла выгрузки."""
+        period = ""
+        if self.date_from or self.date_to:
+            period = (
+                f"_{self.date_from or date.min:%Y%m%d}"
+                f"_{self.date_to or date.max:%Y%m%d}"
+            )
+        return f"absence_requests{period}.{self.fmt}"
+
+
+def _local(value: datetime | None) -> datetime | None:
+    """Переводит дату в местное время без tzinfo (Excel не знает таймзон)."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(LOCAL_TIMEZONE).replace(tzinfo=None)
+
+
+def _export_row(row) -> list:
+    """Значения ячеек строки выгрузки в порядке EXPORT_HEADER."""
+    changer = None
+    if row.changer_last_name:
+        changer = f"{row.changer_last_name} {row.changer_name}"
+
+    return [
+        row.id,
+        type_names.get(row.request_type, row.request_type),
+        status_names.get(row.status, row.status),
+        _local(row.start_date),
+        _local(row.end_date),
+        row.comment,
+        row.rejected_reason,
+        _local(row.created_at),
+        f"{row.last_name} {row.name}",
+        row.email,
+        row.position,
+        row.change_type,
+        row.old_value,
+        row.new_value,
+        row.change_reason,
+        _local(row.changed_at),
+        changer,
+    ]
+
+
+class RequestExportService:
+    """Полная выгрузка заявок с сотрудниками и историей в файл.
+
+    Строки читаются из БД серверным курсором пачками по chunk_size и
+    сразу дописываются в файл: CSV пишется построчно, XLSX — в режиме
+    write-only, где openpyxl сбрасывает строки листа во временный файл.
+    Память не зависит от числа заявок, а готовый файл отправляется с
+    диска. При превышении лимита строк Excel выгрузка продолжается на
+    следующем листе.
+    """
+
+    def __init__(self, chunk_size: int = EXPORT_CHUNK_SIZE):
+        """Инициализирует сервис выгрузки."""
+
+        self.chunk_size = chunk_size
+
+    async def write(
+        self,
+        session: AsyncSession,
+        params: ExportParams,
+        path: str,
+        on_progress: ProgressCallback | None = None
+    ) -> int:
+        """Пишет выгрузку в файл path и возвращает число строк.
+
+        on_progress, если задан, вызывается после каждой пачки с числом
+        уже записанных строк.
+        """
+        result = await stream_requests_export(
+            session,
+            date_from=params.date_from,
+            date_to=params.date_to,
+            chunk_size=self.chunk_size
+        )
+
+        if params.fmt == "csv":
+            rows = await self._write_csv(result, path, on_progress)
+        else:
+            rows = await self._write_xlsx(result, path, on_progress)
+
+        logger.info(f"Выгрузка {params.filename}: {rows} строк")
+        return rows
+
+    async def _write_csv(
+        self,
+        result,
+        path: str,
+        on_progress: ProgressCallback | None
+    ) -> int:
+        """Пишет CSV (UTF-8 с BOM для Excel) по мере чтения пачек."""
+        rows = 0
+
+        with open(path, "w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file, delimiter=";")
+            writer.writerow(EXPORT_HEADER)
+
+            async for chunk in result.partitions():
+                writer.writerows(_export_row(row) for row in chunk)
+                rows += len(chunk)
+
+                if on_progress is not None:
+                    await on_progress(rows)
+
+        return rows
+
+    async def _write_xlsx(
+        self,
+        result,
+        path: str,
+        on_progress: ProgressCallback | None
+    ) -> int:
+        """Пишет XLSX в режиме write-only по мере чтения пачек."""
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_rows = XLSX_MAX_ROWS
+        rows = 0
+
+        async for chunk in result.partitions():
+            for row in chunk:
+                if sheet_rows >= XLSX_MAX_ROWS:
+                    title = "Заявки"
+                    if sheet is not None:
+                        title += f" ({len(workbook.worksheets) + 1})"
+                    sheet = workbook.create_sheet(title)
+                    sheet.append(EXPORT_HEADER)
+                    sheet_rows = 1
+
+                sheet.append(_export_row(row))
+                sheet_rows += 1
+
+            rows += len(chunk)
+
+            if on_progress is not None:
+                await on_progress(rows)
+
+        if sheet is None:
+            workbook.create_sheet("Заявки").append(EXPORT_HEADER)
+
+        workbook.save(path)
+        return rows
@@ -1,18 +1,31 @@
-from datetime import timezone, timedelta
+import asyncio
+import time
+from datetime import date, timezone, timedelta
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
-from sqlalchemy import select
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import InlineKeyboardMarkup
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.keyboards.admin.request_keyboards import get_request_actions_keyboard
-from bot.lexicon.lexicon import type_names
+from bot.lexicon.lexicon import AdminMessages, type_names
+from bot.services.telegram_limits import message_editor, telegram_limiter
+from consts import NOTIFY_CONCURRENCY
+from core.logger import setup_logging
+from database.crud.absence_days import get_absences_on
 from database.crud.admin_notifications import (
-    create_admin_notification,
+    create_admin_notifications,
     deactivate_notifications_for_request,
     get_active_notifications_for_request,
+    get_notified_admin_ids,
 )
-from database.models import AbsenceRequest, Employee
+from database.crud.employee import get_admin_recipients
+from database.crud.requests import LOCAL_TIMEZONE, ensure_timezone
+from database.enums import RequestTypeEnum
+from database.models import AbsenceRequest, AdminNotification, Employee
+from schemas.employee import EmployeeIdentity
+
+logger = setup_logging(__name__)
 
 MSK = timezone(timedelta(hours=3))
 
@@ -29,47 +42,76 @@ class NotificationService:
         self,
         session: AsyncSession,
         request: AbsenceRequest,
-        employee: Employee
+        employee: Employee | EmployeeIdentity,
+        deadline: float | None = None
     ) -> dict:
-        """Уведомить всех админов о новой заявке."""
+        """Уведомить админов о новой заявке.
+
+        Админы, у которых уже есть уведомление о заявке, пропускаются:
+        при повторе события сообщение получают только те, кому оно не
+        дошло. Отправки, не успевшие до deadline (time.monotonic()),
+        отменяются и попадают в failed.
+        """
+
+        notified = await get_notified_admin_ids(session, request.id)
+        admins = [
+            admin for admin in await get_admin_recipients(session)
+            if admin[0] not in notified
+        ]
+        sent_messages = await self._send_to_admins(
+            admins,
+            self._format_new_request(request, employee),
+            get_request_actions_keyboard(request.id),
+            deadline
+        )
 
-        admin_ids = await self._get_admin_telegram_ids(session)
-        message_text = self._format_new_request(request, employee)
-        keyboard = get_request_actions_keyboard(request.id)
+        results = {"success": [], "failed": [], "blocked": []}
+        sent = []
 
-        results = {"success": [], "failed": []}
+        for (admin_id, chat_id), sent_message in zip(admins, sent_messages):
+            if isinstance(sent_message, TelegramForbiddenError):
+                results["blocked"].append(chat_id)
+                continue
 
-        for admin_telegram_id in admin_ids:
-            try:
-                sent_message = await self.bot.send_message(
-                    chat_id=admin_telegram_id,
-                    text=message_text,
-                    reply_markup=keyboard,
-                    parse_mode="HTML"
-                )
+            if isinstance(sent_message, Exception):
+                results["failed"].append({
+                    "id": chat_id,
+                    "error": str(sent_message)
+                })
+                continue
 
-                admin = await self._get_employee_by_telegram_id(
-                    session, admin_telegram_id
-                )
+            sent.append((admin_id, sent_message.message_id, chat_id))
+            results["success"].append(chat_id)
 
-                if admin:
-                    await create_admin_notification(
-                        session,
-                        request_id=request.id,
-                        admin_id=admin.id,
-                        message_id=sent_message.message_id,
-                        chat_id=admin_telegram_id
-                    )
+        await create_admin_notifications(session, request.id, sent)
+        await session.commit()
+        return results
 
-                results["success"].append(admin_telegram_id)
+    async def notify_admins_daily_digest(
+        self,
+        session: AsyncSession,
+        day: date
+    ) -> dict:
+        """Разослать админам сводку отсутствующих в указанный день."""
+
+        absences = await get_absences_on(session, day)
+        admins = await get_admin_recipients(session)
+        sent_messages = await self._send_to_admins(
+            admins,
+            self._format_daily_digest(day, absences)
+        )
+
+        results = {"success": [], "failed": []}
 
-            except Exception as e:
+        for (_, chat_id), sent_message in zip(admins, sent_messages):
+            if isinstance(sent_message, Exception):
                 results["failed"].append({
-                    "id": admin_telegram_id,
-                    "error": str(e)
+                    "id": chat_id,
+                    "error": str(sent_message)
                 })
+            else:
+                results["success"].append(chat_id)
 
-        await session.commit()
         return results
 
     async def update_admin_notifications(
@@ -89,38 +131,23 @@ class NotificationService:
             exclude_admin_id=processed_by_admin_id
         )
 
-        if new_status == "approved":
-            status_text = "✅ ОДОБРЕНО"
-        else:
-            status_text = "❌ ОТКЛОНЕНО"
-
-        for notification in notifications:
-            try:
-                original_text = self._format_new_request(
-                    request,
-                    request.employee
-                )
-
-                updated_text = (
-                    f"{original_text}\n\n"
-                    f"{'─' * 20}\n"
-                    f"{status_text}\n"
-                    f"👤 Обработал: {admin_name}"
-                )
-
-                if reason:
-                    updated_text += f"\n💬 Причина: {reason}"
+        if notifications:
+            if new_status == "approved":
+                status_text = "✅ ОДОБРЕНО"
+            else:
+                status_text = "❌ ОТКЛОНЕНО"
+
+            updated_text = (
+                f"{self._format_new_request(request, request.employee)}\n\n"
+                f"{'─' * 20}\n"
+                f"{status_text}\n"
+                f"👤 Обработал: {admin_name}"
+            )
 
-                await self.bot.edit_message_text(
-                    chat_id=notification.chat_id,
-                    message_id=notification.message_id,
-                    text=updated_text,
-                    reply_markup=None,
-                    parse_mode="HTML"
-                )
+            if reason:
+                updated_text += f"\n💬 Причина: {reason}"
 
-            except TelegramBadRequest:
-                pass
+            await self._edit_notifications(notifications, updated_text)
 
         await deactivate_notifications_for_request(
             session,
@@ -132,7 +159,7 @@ class NotificationService:
         self,
         session: AsyncSession,
         request: AbsenceRequest,
-        employee: Employee
+        employee: Employee | EmployeeIdentity
     ) -> None:
         """Уведомить админов об отмене заявки пользователем."""
 
@@ -141,29 +168,17 @@ class NotificationService:
             request.id
         )
 
-        full_name = f"{employee.last_name} {employee.name}"
-
-        for notification in notifications:
-            try:
-                original_text = self._format_new_request(request, employee)
+        if notifications:
+            full_name = f"{employee.last_name} {employee.name}"
 
-                updated_text = (
-                    f"{original_text}\n\n"
-                    f"{'─' * 20}\n"
-                    f"🚫 ОТМЕНЕНО СОТРУДНИКОМ\n"
-                    f"👤 Отменил: {full_name}"
-                )
-
-                await self.bot.edit_message_text(
-                    chat_id=notification.chat_id,
-                    message_id=notification.message_id,
-                    text=updated_text,
-                    reply_markup=None,
-                    parse_mode="HTML"
-                )
+            updated_text = (
+                f"{self._format_new_request(request, employee)}\n\n"
+                f"{'─' * 20}\n"
+                f"🚫 ОТМЕНЕНО СОТРУДНИКОМ\n"
+                f"👤 Отменил: {full_name}"
+            )
 
-            except TelegramBadRequest:
-                pass
+            await self._edit_notifications(notifications, updated_text)
 
         await deactivate_notifications_for_request(session, request.id)
 
@@ -246,50 +261,129 @@ class NotificationService:
 
         return await self._safe_send(telegram_id, text)
 
-    async def _safe_send(self, chat_id: int, text: str) -> bool:
-        """Безопасная отправка сообщения."""
+    async def _send_to_admins(
+        self,
+        admins: list[tuple[int, int]],
+        text: str,
+        keyboard: InlineKeyboardMarkup | None = None,
+        deadline: float | None = None
+    ) -> list:
+        """Параллельно отправляет сообщение админам.
 
-        try:
-            await self.bot.send_message(
+        Возвращает отправленные сообщения или исключения в порядке admins.
+        После deadline новые запросы не начинаются, а ждущие своей
+        очереди в лимитере отменяются с TimeoutError.
+        """
+
+        if not admins:
+            return []
+
+        semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+        async def send_message(chat_id: int):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError("Рассылка не уложилась в аренду события")
+
+            return await self.bot.send_message(
                 chat_id=chat_id,
                 text=text,
+                reply_markup=keyboard,
                 parse_mode="HTML"
             )
-            return True
-        except Exception:
-            return False
 
-    async def _get_admin_telegram_ids(
-        self,
-        session: AsyncSession
-    ) -> list[int]:
-        """Получить telegram_id всех активных админов."""
-
-        result = await session.execute(
-            select(Employee.telegram_id).where(
-                Employee.role.in_(["admin", "superuser"]),
-                Employee.telegram_id.isnot(None),
-                Employee.is_active.is_(True)
-            )
-        )
-        return list(result.scalars().all())
+        async def send(chat_id: int):
+            async with semaphore:
+                return await telegram_limiter.call(
+                    chat_id,
+                    lambda: send_message(chat_id)
+                )
+
+        tasks = [
+            asyncio.create_task(send(chat_id)) for _, chat_id in admins
+        ]
+        timeout = None
+        if deadline is not None:
+            timeout = max(deadline - time.monotonic(), 0)
+
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append(
+                    TimeoutError("Рассылка не уложилась в аренду события")
+                )
+            else:
+                results.append(task.exception() or task.result())
+        return results
 
-    async def _get_employee_by_telegram_id(
+    async def _edit_notifications(
         self,
-        session: AsyncSession,
-        telegram_id: int
-    ) -> Employee | None:
-        """Получить сотрудника по telegram_id."""
+        notifications: list[AdminNotification],
+        text: str
+    ) -> None:
+        """Параллельно заменяет текст уведомлений и убирает кнопки.
 
-        result = await session.execute(
-            select(Employee).where(Employee.telegram_id == telegram_id)
+        Удалённое сообщение или заблокированный бот у одного админа не
+        мешают остальным и не приводят к повтору события.
+        """
+
+        semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+        async def edit(notification: AdminNotification):
+            async with semaphore:
+                return await message_editor.edit(
+                    self.bot,
+                    notification.chat_id,
+                    notification.message_id,
+                    text
+                )
+
+        results = await asyncio.gather(
+            *(edit(n) for n in notifications),
+            return_exceptions=True
         )
-        return result.scalar_one_or_none()
+
+        failed = None
+        for notification, result in zip(notifications, results):
+            if result is False or isinstance(
+                result,
+                (TelegramBadRequest, TelegramForbiddenError)
+            ):
+                logger.warning(
+                    f"Не удалось обновить уведомление админа "
+                    f"{notification.admin_id} о заявке "
+                    f"#{notification.request_id}: {result!r}"
+                )
+            elif isinstance(result, Exception):
+                failed = result
+
+        if failed:
+            raise failed
+
+    async def _safe_send(self, chat_id: int, text: str) -> bool:
+        """Безопасная отправка сообщения."""
+
+        try:
+            await telegram_limiter.call(
+                chat_id,
+                lambda: self.bot.send_message(
+                    chat_id=chat_id,
+                    text=text,
+                    parse_mode="HTML"
+                )
+            )
+            return True
+        except Exception:
+            return False
 
     def _format_new_request(
         self,
         request: AbsenceRequest,
-        employee: Employee
+        employee: Employee | EmployeeIdentity
     ) -> str:
         """Форматировать сообщение о новой заявке."""
 
@@ -322,3 +416,51 @@ class NotificationService:
         )
 
         return text
+
+    def _format_daily_digest(self, day: date, absences: list) -> str:
+        """Форматировать сводку отсутствующих, сгруппированную по типам."""
+
+        if not absences:
+            return AdminMessages.DIGEST_EMPTY.format(
+                date=day.strftime('%d.%m.%Y')
+            )
+
+        by_type: dict[str, list] = {}
+        for absence in absences:
+            by_type.setdefault(absence.request_type, []).append(absence)
+
+        text = AdminMessages.DIGEST_HEADER.format(
+            date=day.strftime('%d.%m.%Y')
+        )
+
+        for request_type in RequestTypeEnum:
+            items = by_type.get(request_type.value)
+            if not items:
+                continue
+
+            text += AdminMessages.DIGEST_TYPE.format(
+                type_name=type_names[request_type.value],
+                count=len(items)
+            )
+
+            for item in items:
+                start = ensure_timezone(item.start_date).astimezone(
+                    LOCAL_TIMEZONE
+                )
+                end = ensure_timezone(item.end_date).astimezone(
+                    LOCAL_TIMEZONE
+                )
+
+                if request_type == RequestTypeEnum.PARTIAL_ABSENCE:
+                    dates = (
+                        f"{start.strftime('%H:%M')}–{end.strftime('%H:%M')}"
+                    )
+                else:
+                    dates = f"до {end.strftime('%d.%m.%Y')}"
+
+                text += AdminMessages.DIGEST_ITEM.format(
+                    full_name=f"{item.last_name} {item.name}",
+                    dates=dates
+                )
+
+        return text
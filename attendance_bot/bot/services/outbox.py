@@ -0,0 +1,275 @@
+import asyncio
+import json
+import time
+from contextlib import suppress
+from datetime import timedelta
+
+from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.services.notifications import NotificationService
+from consts import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_LEASE_MARGIN,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_POLL_INTERVAL,
+    OUTBOX_RETENTION_DAYS,
+)
+from core.logger import setup_logging
+from database.crud.outbox import (
+    claim_due_events,
+    mark_event_failed,
+    mark_event_sent,
+    purge_sent_events,
+)
+from database.crud.requests import get_request_by_id
+from database.enums import OutboxEventEnum, RequestStatusEnum
+from database.models import Employee
+
+logger = setup_logging(__name__)
+
+PURGE_INTERVAL = 3600
+
+
+class OutboxDispatcher:
+    """Фоновая доставка уведомлений из таблицы notification_outbox.
+
+    Хендлеры только коммитят заявку вместе с событием и вызывают wakeup();
+    все обращения к Telegram API выполняются здесь, с повторами.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+    ):
+        """Инициализирует диспетчер."""
+
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.notifier = NotificationService(bot)
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._lease_deadline = 0.0
+        self._handlers = {
+            OutboxEventEnum.REQUEST_CREATED.value: self._on_request_created,
+            OutboxEventEnum.REQUEST_STATUS_CHANGED.value:
+                self._on_request_status_changed,
+            OutboxEventEnum.REQUEST_CANCELLED.value:
+                self._on_request_cancelled,
+        }
+
+    def wakeup(self) -> None:
+        """Просит диспетчер обработать очередь, не дожидаясь опроса."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу."""
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._run(),
+                name="outbox-dispatcher"
+            )
+            logger.info("Outbox-диспетчер запущен")
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("Outbox-диспетчер остановлен")
+
+    async def _run(self) -> None:
+        """Основной цикл: разбор очереди пачками и ожидание новых событий."""
+        last_purge = 0.0
+
+        while True:
+            self._wakeup.clear()
+
+            try:
+                processed = await self.process_batch()
+
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    await self._purge()
+                    last_purge = time.monotonic()
+            except Exception:
+                logger.exception("Ошибка при обработке outbox")
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self.poll_interval
+                )
+
+    async def process_batch(self) -> int:
+        """Обрабатывает одну пачку событий. Возвращает их количество."""
+        async with self.session_factory() as session:
+            events = await claim_due_events(session, self.batch_size)
+
+        # Аренда общая на всю пачку. Что не успели до её конца (с запасом),
+        # остаётся в очереди: иначе другой диспетчер заберёт событие
+        # повторно и админы получат дубли.
+        self._lease_deadline = (
+            time.monotonic() + OUTBOX_LEASE_SECONDS - OUTBOX_LEASE_MARGIN
+        )
+
+        # События одной заявки доставляются по порядку: если одно упало,
+        # следующие ждут повтора, чтобы не отредактировать ещё не
+        # отправленные сообщения.
+        blocked: set[int] = set()
+
+        for event in events:
+            payload = json.loads(event.payload)
+            request_id = payload.get("request_id")
+
+            if request_id in blocked:
+                continue
+
+            if time.monotonic() >= self._lease_deadline:
+                break
+
+            async with self.session_factory() as session:
+                try:
+                    handler = self._handlers[event.event_type]
+                    await handler(session, **payload)
+                except Exception as e:
+                    await session.rollback()
+                    blocked.add(request_id)
+
+                    dead = await mark_event_failed(session, event, repr(e))
+                    if dead:
+                        logger.error(
+                            f"Событие outbox #{event.id} ({event.event_type}) "
+                            f"перемещено в dead letter: {e!r}"
+                        )
+                    else:
+                        logger.warning(
+                            f"Событие outbox #{event.id} ({event.event_type}) "
+                            f"не доставлено, будет повтор: {e!r}"
+                        )
+                else:
+                    await mark_event_sent(session, event.id)
+
+        return len(events)
+
+    async def _purge(self) -> None:
+        """Удаляет старые отправленные события."""
+        async with self.session_factory() as session:
+            deleted = await purge_sent_events(
+                session,
+                timedelta(days=OUTBOX_RETENTION_DAYS)
+            )
+
+        if deleted:
+            logger.info(f"Удалено старых событий outbox: {deleted}")
+
+    async def _on_request_created(
+        self,
+        session: AsyncSession,
+        request_id: int
+    ) -> None:
+        """Рассылает админам новую заявку."""
+        request = await get_request_by_id(session, request_id)
+
+        if not request or request.status != RequestStatusEnum.PENDING.value:
+            return
+
+        results = await self.notifier.notify_admins_new_request(
+            session,
+            request,
+            request.employee,
+            self._lease_deadline
+        )
+
+        if results["blocked"]:
+            logger.warning(
+                f"Заявка #{request_id}: бот заблокирован у "
+                f"{len(results['blocked'])} админов"
+            )
+
+        # Доставленные уведомления уже сохранены, повтор разошлёт
+        # заявку только тем, кому она не дошла.
+        if results["failed"]:
+            raise RuntimeError(
+                f"Заявка #{request_id}: не доставлено "
+                f"{len(results['failed'])} админам"
+            )
+
+    async def _on_request_status_changed(
+        self,
+        session: AsyncSession,
+        request_id: int,
+        admin_id: int,
+        status: str,
+        reason: str | None = None
+    ) -> None:
+        """Обновляет сообщения админов и уведомляет сотрудника о решении."""
+        request = await get_request_by_id(session, request_id)
+
+        if not request:
+            return
+
+        admin = await session.get(Employee, admin_id)
+        admin_name = f"{admin.last_name} {admin.name}" if admin else None
+
+        await self.notifier.update_admin_notifications(
+            session,
+            request,
+            admin_id,
+            status,
+            admin_name or "—",
+            reason
+        )
+        await session.commit()
+
+        telegram_id = request.employee.telegram_id
+        if not telegram_id:
+            return
+
+        if status == RequestStatusEnum.APPROVED.value:
+            delivered = await self.notifier.notify_user_request_approved(
+                telegram_id,
+                request,
+                admin_name
+            )
+        else:
+            delivered = await self.notifier.notify_user_request_rejected(
+                telegram_id,
+                request,
+                reason,
+                admin_name
+            )
+
+        if not delivered:
+            raise RuntimeError(
+                f"Не удалось уведомить сотрудника {telegram_id}"
+            )
+
+    async def _on_request_cancelled(
+        self,
+        session: AsyncSession,
+        request_id: int
+    ) -> None:
+        """Обновляет сообщения админов об отменённой заявке."""
+        request = await get_request_by_id(session, request_id)
+
+        if not request:
+            return
+
+        await self.notifier.notify_admins_request_cancelled(
+            session,
+            request,
+            request.employee
+        )
+        await session.commit()
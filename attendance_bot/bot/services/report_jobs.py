@@ -0,0 +1,394 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from dataclasses import asdict
+from datetime import date
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import FSInputFile
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
+
+from bot.lexicon.lexicon import AdminMessages
+from bot.services.exports import ExportParams, RequestExportService
+from bot.services.reports_request import AbsenceReportService, ReportParams
+from bot.services.telegram_limits import message_editor, telegram_limiter
+from config import config
+from consts import (
+    REPORT_CACHE_MAXSIZE,
+    REPORT_CACHE_TTL,
+    REPORT_POLL_INTERVAL,
+    REPORT_PROCESSES,
+    REPORT_PROGRESS_INTERVAL,
+    REPORT_WORKERS,
+)
+from core.cache import MISSING, TTLCache
+from core.logger import setup_logging
+from database.counters import request_counters
+from database.crud.report_jobs import (
+    claim_next_job,
+    create_report_job,
+    finish_job,
+    get_job_progress,
+    update_job_progress,
+)
+from database.enums import ReportJobKindEnum
+from database.models import ReportJob
+from database.routing import routing_sessionmaker
+from database.sqlite import apply_sqlite_pragmas
+
+logger = setup_logging(__name__)
+
+JobParams = ReportParams | ExportParams
+
+
+def _dump_params(params: JobParams) -> dict:
+    """Параметры отчёта в виде, пригодном для JSON."""
+    return {
+        name: value.isoformat() if isinstance(value, date) else value
+        for name, value in asdict(params).items()
+    }
+
+
+def _load_params(kind: str, data: dict) -> JobParams:
+    """Восстанавливает параметры отчёта из JSON задания."""
+    params_class = ExportParams
+    if kind == ReportJobKindEnum.SUMMARY.value:
+        params_class = ReportParams
+
+    return params_class(**{
+        name: (
+            date.fromisoformat(value)
+            if name.startswith("date_") and value
+            else value
+        )
+        for name, value in data.items()
+    })
+
+
+def _caption(kind: str, params: JobParams, rows: int) -> str:
+    """Подпись к готовому файлу."""
+    if kind == ReportJobKindEnum.SUMMARY.value:
+        return AdminMessages.REPORT_CAPTION.format(
+            date_from=params.date_from.strftime('%d.%m.%Y'),
+            date_to=params.date_to.strftime('%d.%m.%Y')
+        )
+    return AdminMessages.EXPORT_CAPTION.format(rows=rows)
+
+
+def _warm_up() -> None:
+    """Пустая задача: заставляет пул заранее запустить процесс."""
+
+
+def run_report_job(job_id: int, kind: str, data: dict, path: str) -> int:
+    """Строит файл отчёта в отдельном процессе и возвращает число строк.
+
+    Точка входа для пула процессов: процесс открывает собственное
+    подключение к БД, а прогресс выгрузки пишет в строку задания.
+    """
+    return asyncio.run(_build_report(job_id, kind, data, path))
+
+
+async def _build_report(job_id: int, kind: str, data: dict, path: str) -> int:
+    """Асинхронная часть run_report_job."""
+    engine = create_async_engine(config.db.database_url, poolclass=NullPool)
+    apply_sqlite_pragmas(engine, config.db.sqlite_pragmas)
+
+    replica = None
+    if config.db.replica_url:
+        replica = create_async_engine(
+            config.db.replica_url,
+            poolclass=NullPool
+        )
+        apply_sqlite_pragmas(replica, config.db.sqlite_pragmas)
+
+    session_factory = routing_sessionmaker(engine, replica)
+    params = _load_params(kind, data)
+
+    async def on_progress(rows: int) -> None:
+        async with session_factory() as session:
+            await update_job_progress(session, job_id, rows)
+
+    try:
+        async with session_factory() as session:
+            if kind == ReportJobKindEnum.SUMMARY.value:
+                content = await AbsenceReportService().render(session, params)
+                with open(path, "wb") as file:
+                    file.write(content)
+                return 0
+
+            return await RequestExportService().write(
+                session,
+                params,
+                path,
+                on_progress
+            )
+    finally:
+        await engine.dispose()
+        if replica is not None:
+            await replica.dispose()
+
+
+class ReportJobQueue:
+    """Фоновое построение отчётов.
+
+    Хендлер только ставит задание в таблицу report_jobs и сразу
+    освобождает апдейт. Воркеры забирают задания из очереди, а сама
+    выборка и сборка файла идут в пуле процессов, чтобы тяжёлая работа
+    openpyxl не останавливала event loop. Пока файл строится, воркер
+    обновляет сообщение о прогрессе.
+
+    Готовые файлы запоминаются по параметрам и версии набора заявок
+    (request_counters.version) как file_id Telegram: повторный запрос,
+    пока данные не менялись, отвечается сразу, без построения и загрузки.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        workers: int = REPORT_WORKERS,
+        processes: int = REPORT_PROCESSES,
+        poll_interval: float = REPORT_POLL_INTERVAL,
+    ):
+        """Инициализирует очередь."""
+
+        self.bot = bot
+        self.session_factory = session_factory
+        self.workers = workers
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self._files: TTLCache[tuple[str, str]] = TTLCache(
+            maxsize=REPORT_CACHE_MAXSIZE,
+            ttl=REPORT_CACHE_TTL,
+        )
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._pool: ProcessPoolExecutor | None = None
+        self._tmp_dir: tempfile.TemporaryDirectory | None = None
+
+    async def submit(
+        self,
+        session: AsyncSession,
+        kind: ReportJobKindEnum,
+        params: JobParams,
+        chat_id: int,
+        requested_by: int | None
+    ) -> None:
+        """Отправляет готовый файл из кэша или ставит отчёт в очередь."""
+        cached = self._files.get(self._cache_key(kind.value, params))
+        if cached is not MISSING:
+            file_id, caption = cached
+            await telegram_limiter.call(
+                chat_id,
+                lambda: self.bot.send_document(
+                    chat_id,
+                    file_id,
+                    caption=caption
+                )
+            )
+            return
+
+        message = await telegram_limiter.call(
+            chat_id,
+            lambda: self.bot.send_message(chat_id, AdminMessages.REPORT_QUEUED)
+        )
+        await create_report_job(
+            session,
+            kind,
+            _dump_params(params),
+            chat_id,
+            message.message_id,
+            requested_by
+        )
+        self.wakeup()
+
+    def wakeup(self) -> None:
+        """Просит воркеры проверить очередь, не дожидаясь опроса."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Запускает пул процессов и воркеры."""
+        if self._tasks:
+            return
+
+        self._tmp_dir = tempfile.TemporaryDirectory(prefix="reports_")
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        # Процессы стартуют и импортируют модули сразу, а не при первом
+        # отчёте.
+        for _ in range(self.processes):
+            self._pool.submit(_warm_up)
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"reports-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Запущено воркеров отчётов: {self.workers}")
+
+    async def stop(self) -> None:
+        """Останавливает воркеры и пул процессов.
+
+        Недостроенные задания остаются в статусе running и будут взяты
+        снова после истечения аренды.
+        """
+        if not self._tasks:
+            return
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._tmp_dir.cleanup()
+        self._tmp_dir = None
+
+    async def _worker(self) -> None:
+        """Забирает задания из очереди по одному."""
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    job = await claim_next_job(session)
+            except Exception:
+                logger.exception("Не удалось получить задание отчёта")
+                job = None
+
+            if job is not None:
+                try:
+                    await self._run_job(job)
+                except Exception:
+                    logger.exception(f"Ошибка воркера на отчёте #{job.id}")
+                continue
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=self.poll_interval
+                )
+            self._wakeup.clear()
+
+    async def _run_job(self, job: ReportJob) -> None:
+        """Строит файл задания в пуле процессов и отправляет его."""
+        data = json.loads(job.params)
+        params = _load_params(job.kind, data)
+        cache_key = self._cache_key(job.kind, params)
+        path = os.path.join(self._tmp_dir.name, f"{job.id}_{params.filename}")
+
+        try:
+            await self._show(job, AdminMessages.REPORT_RUNNING)
+
+            future = asyncio.get_running_loop().run_in_executor(
+                self._pool,
+                run_report_job,
+                job.id,
+                job.kind,
+                data,
+                path
+            )
+            rows = await self._wait_with_progress(job, future)
+
+            caption = _caption(job.kind, params, rows)
+            message = await telegram_limiter.call(
+                job.chat_id,
+                lambda: self.bot.send_document(
+                    job.chat_id,
+                    FSInputFile(path, filename=params.filename),
+                    caption=caption
+                )
+            )
+            self._files.set(cache_key, (message.document.file_id, caption))
+
+            async with self.session_factory() as session:
+                await finish_job(session, job.id)
+            # Файл уже доставлен: ошибка правки сообщения не делает
+            # задание неудачным.
+            with suppress(Exception):
+                await self._show(job, AdminMessages.REPORT_DONE)
+
+            logger.info(f"Отчёт #{job.id} ({params.filename}) отправлен")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Не удалось построить отчёт #{job.id}")
+
+            async with self.session_factory() as session:
+                await finish_job(session, job.id, error=repr(e))
+            with suppress(Exception):
+                await self._show(job, AdminMessages.REPORT_FAILED)
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    async def _wait_with_progress(
+        self,
+        job: ReportJob,
+        future: asyncio.Future
+    ) -> int:
+        """Ждёт процесс, периодически показывая прогресс задания.
+
+        Процесс в пуле нельзя прервать, поэтому ошибка при показе
+        прогресса не прекращает ожидание: результат задания определяет
+        только future.
+        """
+        while True:
+            done, _ = await asyncio.wait(
+                {future},
+                timeout=REPORT_PROGRESS_INTERVAL
+            )
+            if done:
+                return future.result()
+
+            try:
+                async with self.session_factory() as session:
+                    progress = await get_job_progress(session, job.id)
+            except Exception:
+                logger.warning(
+                    f"Не удалось прочитать прогресс отчёта #{job.id}",
+                    exc_info=True
+                )
+                continue
+
+            if progress:
+                await self._show(
+                    job,
+                    AdminMessages.REPORT_PROGRESS.format(rows=progress)
+                )
+
+    async def _show(self, job: ReportJob, text: str) -> None:
+        """Обновляет сообщение о ходе задания.
+
+        Правка сообщения необязательна: ошибка Telegram только пишется в
+        лог и не прерывает задание.
+        """
+        if not job.message_id:
+            return
+
+        try:
+            await message_editor.edit(
+                self.bot,
+                job.chat_id,
+                job.message_id,
+                text
+            )
+        except TelegramAPIError as e:
+            logger.warning(
+                f"Не удалось обновить сообщение отчёта #{job.id}: {e!r}"
+            )
+
+    @staticmethod
+    def _cache_key(kind: str, params: JobParams) -> tuple:
+        """Ключ кэша готовых файлов."""
+        return kind, params, request_counters.version
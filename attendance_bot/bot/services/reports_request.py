@@ -0,0 +1,204 @@
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Literal
+
+from openpyxl import Workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.lexicon.lexicon import status_names, type_names
+from database.crud.reports import get_absence_summary
+from database.enums import RequestStatusEnum, RequestTypeEnum
+
+ReportFormat = Literal["xlsx", "csv"]
+
+REQUEST_TYPES = [item.value for item in RequestTypeEnum]
+REQUEST_STATUSES = [item.value for item in RequestStatusEnum]
+
+
+@dataclass(frozen=True)
+class ReportParams:
+    """Параметры отчёта по отсутствиям."""
+
+    date_from: date
+    date_to: date
+    fmt: ReportFormat = "xlsx"
+    employee_id: int | None = None
+    request_type: str | None = None
+    status: str | None = None
+
+    @property
+    def filename(self) -> str:
+        """Имя файла отчёта."""
+        return (
+            f"absences_{self.date_from:%Y%m%d}_{self.date_to:%Y%m%d}"
+            f".{self.fmt}"
+        )
+
+
+def report_period(key: str, today: date | None = None) -> tuple[date, date]:
+    """Границы периода отчёта по его ключу из меню."""
+    today = today or date.today()
+    month_start = today.replace(day=1)
+
+    if key == "month":
+        return month_start, today
+    if key == "prev_month":
+        prev_month_end = month_start - timedelta(days=1)
+        return prev_month_end.replace(day=1), prev_month_end
+    if key == "year":
+        return today.replace(month=1, day=1), today
+
+    raise ValueError(f"Неизвестный период отчёта: {key}")
+
+
+@dataclass
+class _EmployeeRow:
+    """Строка сводки: один сотрудник со всеми его агрегатами."""
+
+    full_name: str
+    email: str
+    position: str
+    days: dict[str, int]
+    requests: dict[str, int]
+
+    def cells(self) -> list:
+        """Значения ячеек в порядке колонок SUMMARY_HEADER."""
+        type_days = [self.days.get(name, 0) for name in REQUEST_TYPES]
+        status_counts = [
+            self.requests.get(name, 0) for name in REQUEST_STATUSES
+        ]
+        return [
+            self.full_name,
+            self.email,
+            self.position,
+            *type_days,
+            sum(type_days),
+            *status_counts,
+            sum(status_counts),
+        ]
+
+
+SUMMARY_HEADER = [
+    "Сотрудник",
+    "Email",
+    "Должность",
+    *(f"{type_names[name]}, дн." for name in REQUEST_TYPES),
+    "Всего дней",
+    *(f"{status_names[name]}, заявок" for name in REQUEST_STATUSES),
+    "Всего заявок",
+]
+
+
+class AbsenceReportService:
+    """Отчёты по отсутствиям за период.
+
+    Агрегаты считаются в БД одним запросом (get_absence_summary), а сюда
+    приходят уже сгруппированные строки, отсортированные по сотруднику.
+    Сводка собирается потоком: в памяти держится только текущий сотрудник
+    и небольшая таблица тип × статус.
+
+    Дни в сводке — одобренные дни отсутствия внутри периода, счётчики
+    заявок — по всем статусам.
+    """
+
+    async def render(
+        self,
+        session: AsyncSession,
+        params: ReportParams
+    ) -> bytes:
+        """Строит отчёт и возвращает содержимое файла."""
+        result = await get_absence_summary(
+            session,
+            params.date_from,
+            params.date_to,
+            employee_id=params.employee_id,
+            request_type=params.request_type,
+            status=params.status
+        )
+
+        if params.fmt == "csv":
+            return self.render_csv(result)
+        return self.render_xlsx(result)
+
+    def render_xlsx(self, rows: Iterable) -> bytes:
+        """Сводка по сотрудникам и таблица тип × статус в XLSX."""
+        workbook = Workbook(write_only=True)
+
+        summary = workbook.create_sheet("Сводка")
+        summary.append(SUMMARY_HEADER)
+
+        totals: dict[tuple[str, str], list[int]] = {}
+        for employee in self._employees(rows, totals):
+            summary.append(employee.cells())
+
+        by_type = workbook.create_sheet("По типам")
+        by_type.append(["Тип", "Статус", "Заявок", "Дней"])
+        for (request_type, status), (count, days) in sorted(totals.items()):
+            by_type.append([
+                type_names.get(request_type, request_type),
+                status_names.get(status, status),
+                count,
+                days,
+            ])
+
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    def render_csv(self, rows: Iterable) -> bytes:
+        """Сводка по сотрудникам в CSV (UTF-8 с BOM для Excel)."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=";")
+        writer.writerow(SUMMARY_HEADER)
+
+        for employee in self._employees(rows, {}):
+            writer.writerow(employee.cells())
+
+        return buffer.getvalue().encode("utf-8-sig")
+
+    @staticmethod
+    def _employees(
+        rows: Iterable,
+        totals: dict[tuple[str, str], list[int]]
+    ) -> Iterable[_EmployeeRow]:
+        """Сворачивает строки агрегата в строки сводки по сотрудникам.
+
+        Попутно накапливает в totals число заявок и дней по (тип, статус).
+        """
+        current_id = None
+        current: _EmployeeRow | None = None
+
+        for row in rows:
+            if row.employee_id != current_id:
+                if current is not None:
+                    yield current
+
+                current_id = row.employee_id
+                current = _EmployeeRow(
+                    full_name=f"{row.last_name} {row.name}",
+                    email=row.email,
+                    position=row.position or "",
+                    days={},
+                    requests={},
+                )
+
+            if row.request_type is None:
+                continue
+
+            days = int(row.days)
+            current.requests[row.status] = (
+                current.requests.get(row.status, 0) + row.requests
+            )
+            if row.status == RequestStatusEnum.APPROVED.value:
+                current.days[row.request_type] = (
+                    current.days.get(row.request_type, 0) + days
+                )
+
+            total = totals.setdefault((row.request_type, row.status), [0, 0])
+            total[0] += row.requests
+            total[1] += days
+
+        if current is not None:
+            yield current
@@ -0,0 +1,153 @@
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable
+
+from consts import (
+    REQUEST_WINDOW_MAXSIZE,
+    REQUEST_WINDOW_SIZE,
+    REQUEST_WINDOW_TTL,
+)
+from core.cache import MISSING, TTLCache
+from database.counters import request_counters
+from database.models import AbsenceRequest
+
+PageLoader = Callable[..., Awaitable[list[AbsenceRequest]]]
+
+
+@dataclass
+class RequestWindow:
+    """Загруженный кусок списка заявок в порядке показа."""
+
+    version: int
+    requests: list[AbsenceRequest] = field(default_factory=list)
+    at_start: bool = False
+    at_end: bool = False
+
+    def position(self, request_id: int) -> int | None:
+        """Позиция заявки в окне или None."""
+        for position, request in enumerate(self.requests):
+            if request.id == request_id:
+                return position
+        return None
+
+
+class RequestWindowCache:
+    """Окна заявок для просмотрщиков «по одной заявке на экран».
+
+    Вместо одной строки на каждое нажатие ◀️/▶️ загружается окно из
+    window_size заявок вместе с сотрудниками, и соседние заявки берутся
+    из памяти. Окно хранится по чату и виду просмотра и сбрасывается, как
+    только меняется request_counters.version, то есть набор заявок.
+    """
+
+    def __init__(
+        self,
+        window_size: int = REQUEST_WINDOW_SIZE,
+        ttl: float = REQUEST_WINDOW_TTL,
+        maxsize: int = REQUEST_WINDOW_MAXSIZE,
+    ):
+        """Инициализирует кэш окон."""
+
+        self.window_size = window_size
+        self._windows: TTLCache[RequestWindow] = TTLCache(
+            maxsize=maxsize,
+            ttl=ttl,
+        )
+
+    async def first(
+        self,
+        key: Hashable,
+        loader: PageLoader
+    ) -> AbsenceRequest | None:
+        """Первая заявка списка; загружает окно с начала списка."""
+        window = self._get(key)
+
+        if window is None or not window.at_start:
+            requests = await loader(cursor=None, limit=self.window_size)
+            window = RequestWindow(
+                version=request_counters.version,
+                requests=requests,
+                at_start=True,
+                at_end=len(requests) < self.window_size,
+            )
+            self._windows.set(key, window)
+
+        return window.requests[0] if window.requests else None
+
+    async def neighbour(
+        self,
+        key: Hashable,
+        loader: PageLoader,
+        cursor: int,
+        backward: bool = False
+    ) -> AbsenceRequest | None:
+        """Заявка сразу после (или до, если backward) заявки cursor."""
+        window = self._get(key)
+        position = window.position(cursor) if window else None
+
+        if position is not None:
+            target = position - 1 if backward else position + 1
+            if 0 <= target < len(window.requests):
+                return window.requests[target]
+
+            edge = window.at_start if backward else window.at_end
+            if edge:
+                return None
+
+        requests = await loader(
+            cursor=cursor,
+            limit=self.window_size,
+            backward=backward
+        )
+        exhausted = len(requests) < self.window_size
+
+        # Текущую заявку оставляем в новом окне, чтобы шаг назад
+        # на границе окна тоже обслуживался из памяти.
+        current = []
+        if position is not None:
+            current = [window.requests[position]]
+
+        if backward:
+            window = RequestWindow(
+                version=request_counters.version,
+                requests=requests + current,
+                at_start=exhausted,
+            )
+        else:
+            window = RequestWindow(
+                version=request_counters.version,
+                requests=current + requests,
+                at_end=exhausted,
+            )
+        self._windows.set(key, window)
+
+        if not requests:
+            return None
+        return requests[-1] if backward else requests[0]
+
+    def get(self, key: Hashable, request_id: int) -> AbsenceRequest | None:
+        """Заявка из актуального окна, если она туда загружена."""
+        window = self._get(key)
+        if window is None:
+            return None
+
+        position = window.position(request_id)
+        return None if position is None else window.requests[position]
+
+    def drop(self, key: Hashable) -> None:
+        """Забывает окно, например при закрытии просмотра."""
+        self._windows.pop(key)
+
+    def _get(self, key: Hashable) -> RequestWindow | None:
+        """Окно для ключа, если оно есть и набор заявок не менялся."""
+        window = self._windows.get(key)
+        if window is MISSING:
+            return None
+
+        if window.version != request_counters.version:
+            self._windows.pop(key)
+            return None
+
+        return window
+
+
+request_windows = RequestWindowCache()
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup
+
+from consts import (
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_MAX_RETRIES,
+)
+from core.cache import MISSING, TTLCache
+from core.logger import setup_logging
+
+logger = setup_logging(__name__)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Token bucket: не больше rate операций в секунду."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """Инициализирует ведро с заданной скоростью пополнения."""
+
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Ждёт, пока в ведре появится токен, и забирает его."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class TelegramRateLimiter:
+    """Глобальный и по-чатовый лимиты Telegram Bot API."""
+
+    def __init__(
+        self,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+    ):
+        """Инициализирует лимитер."""
+
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self._global = TokenBucket(global_rate)
+        self._chats: TTLCache[TokenBucket] = TTLCache(
+            maxsize=10_000,
+            ttl=60,
+        )
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Возвращает ведро для чата, создавая его при необходимости."""
+        bucket = self._chats.get(chat_id)
+        if bucket is MISSING:
+            bucket = TokenBucket(self.chat_rate, capacity=1)
+            self._chats.set(chat_id, bucket)
+        return bucket
+
+    async def acquire(self, chat_id: int) -> None:
+        """Ждёт разрешения на запрос в чат."""
+        await self._chat_bucket(chat_id).acquire()
+        await self._global.acquire()
+
+    async def call(
+        self,
+        chat_id: int,
+        make_request: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Выполняет запрос с учётом лимитов и повторяет при RetryAfter."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(chat_id)
+            try:
+                return await make_request()
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(
+                    f"Flood control для чата {chat_id}, "
+                    f"повтор через {e.retry_after} с"
+                )
+                await asyncio.sleep(e.retry_after)
+
+
+telegram_limiter = TelegramRateLimiter()
+
+
+class MessageEditCoalescer:
+    """Редактирует сообщения через лимитер, склеивая правки одного сообщения.
+
+    Пока правка ждёт своей очереди в лимитере, новые правки того же
+    сообщения только заменяют текст: в Telegram уходит последняя версия,
+    а все ожидающие получают её результат. Коалесцер один на процесс
+    (message_editor), иначе сервисы склеивали бы правки только у себя.
+    """
+
+    def __init__(self, limiter: TelegramRateLimiter = telegram_limiter):
+        """Инициализирует коалесцер."""
+
+        self.limiter = limiter
+        self._latest: dict[
+            tuple[int, int],
+            tuple[Bot, str, InlineKeyboardMarkup | None]
+        ] = {}
+        self._tasks: dict[tuple[int, int], asyncio.Task] = {}
+
+    async def edit(
+        self,
+        bot: Bot,
+        chat_id: int,
+        message_id: int,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> bool:
+        """Ставит правку сообщения. False, если Telegram её отклонил."""
+        key = (chat_id, message_id)
+        self._latest[key] = (bot, text, reply_markup)
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send(key))
+            self._tasks[key] = task
+
+        return await asyncio.shield(task)
+
+    async def _send(self, key: tuple[int, int]) -> bool:
+        """Отправляет правки, пока в Telegram не уйдёт последняя версия.
+
+        Версия читается на каждой попытке, в том числе после RetryAfter.
+        Если новая правка пришла, пока запрос был в пути, сообщение
+        редактируется ещё раз.
+        """
+        chat_id, message_id = key
+        payload = None
+
+        def make_request():
+            nonlocal payload
+            payload = self._latest[key]
+
+            bot, text, reply_markup = payload
+            return bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                reply_markup=reply_markup,
+                parse_mode="HTML"
+            )
+
+        try:
+            while True:
+                try:
+                    await self.limiter.call(chat_id, make_request)
+                    edited = True
+                except TelegramBadRequest:
+                    edited = False
+
+                if self._latest[key] is payload:
+                    return edited
+        finally:
+            del self._tasks[key]
+            del self._latest[key]
+
+
+message_editor = MessageEditCoalescer()
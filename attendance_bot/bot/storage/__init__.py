@@ -0,0 +1,44 @@
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.storage.buffered import BufferedFSMContext
+from bot.storage.cached import CachedStorage
+from bot.storage.sql import SQLAlchemyStorage
+from config import FsmConfig
+
+__all__ = [
+    "BufferedFSMContext",
+    "CachedStorage",
+    "SQLAlchemyStorage",
+    "build_fsm_storage",
+]
+
+
+def build_fsm_storage(
+    fsm_config: FsmConfig,
+    session_factory: async_sessionmaker[AsyncSession],
+) -> BaseStorage:
+    """Создаёт FSM-хранилище по конфигурации."""
+    if fsm_config.backend == "memory":
+        return MemoryStorage()
+
+    if fsm_config.backend == "redis":
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        storage = RedisStorage.from_url(
+            fsm_config.redis_url,
+            state_ttl=fsm_config.state_ttl,
+            data_ttl=fsm_config.state_ttl,
+        )
+    else:
+        storage = SQLAlchemyStorage(
+            session_factory,
+            state_ttl=fsm_config.state_ttl,
+            flush_interval=fsm_config.flush_interval,
+        )
+
+    if fsm_config.cache_ttl > 0:
+        storage = CachedStorage(storage, ttl=fsm_config.cache_ttl)
+
+    return storage
@@ -0,0 +1,86 @@
+from typing import Any
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from core.cache import MISSING
+
+
+class BufferedFSMContext(FSMContext):
+    """FSMContext, который копит изменения и пишет их в хранилище разом.
+
+    Данные читаются из хранилища не больше одного раза, все set_state/
+    update_data/clear меняют только локальную копию, а flush() отправляет
+    в хранилище итоговое состояние и данные.
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        key: StorageKey,
+        raw_state: str | None = MISSING,
+    ):
+        """Инициализирует контекст; raw_state — уже прочитанное состояние."""
+
+        super().__init__(storage, key)
+        self._state = raw_state
+        self._data: dict[str, Any] = MISSING
+        self._state_dirty = False
+        self._data_dirty = False
+
+    async def set_state(self, state: StateType = None) -> None:
+        self._state = state.state if isinstance(state, State) else state
+        self._state_dirty = True
+
+    async def get_state(self) -> str | None:
+        if self._state is MISSING:
+            self._state = await self.storage.get_state(self.key)
+        return self._state
+
+    async def set_data(self, data: dict[str, Any]) -> None:
+        self._data = data.copy()
+        self._data_dirty = True
+
+    async def get_data(self) -> dict[str, Any]:
+        return (await self._load_data()).copy()
+
+    async def get_value(self, key: str, default: Any = None) -> Any:
+        return (await self._load_data()).get(key, default)
+
+    async def update_data(
+        self,
+        data: dict[str, Any] | None = None,
+        **kwargs: Any
+    ) -> dict[str, Any]:
+        if data:
+            kwargs.update(data)
+
+        current = await self._load_data()
+        current.update(kwargs)
+        self._data_dirty = True
+        return current.copy()
+
+    async def clear(self) -> None:
+        await self.set_state(None)
+        await self.set_data({})
+
+    async def flush(self) -> None:
+        """Записывает накопленные изменения в хранилище.
+
+        Данные пишутся раньше состояния: буферизующее хранилище
+        сохраняет их вместе с состоянием одной записью.
+        """
+        if self._data_dirty:
+            await self.storage.set_data(self.key, self._data)
+            self._data_dirty = False
+
+        if self._state_dirty:
+            await self.storage.set_state(self.key, self._state)
+            self._state_dirty = False
+
+    async def _load_data(self) -> dict[str, Any]:
+        """Загружает данные из хранилища при первом обращении."""
+        if self._data is MISSING:
+            self._data = await self.storage.get_data(self.key)
+        return self._data
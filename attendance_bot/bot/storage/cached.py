@@ -0,0 +1,65 @@
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from consts import FSM_CACHE_MAXSIZE
+from core.cache import MISSING, TTLCache
+
+
+class CachedStorage(BaseStorage):
+    """Write-through кэш в памяти процесса поверх другого FSM-хранилища.
+
+    Записи сразу уходят во внутреннее хранилище, чтения обслуживаются из
+    кэша. Только для одного инстанса бота: кэш не знает о записях других
+    процессов, и до истечения TTL инстанс может читать чужое устаревшее
+    состояние. Поэтому по умолчанию кэш выключен (FSM__CACHE_TTL=0).
+    """
+
+    def __init__(
+        self,
+        storage: BaseStorage,
+        ttl: float,
+        maxsize: int = FSM_CACHE_MAXSIZE,
+    ):
+        """Инициализирует кэш над хранилищем."""
+
+        self.storage = storage
+        self._cache: TTLCache[dict[str, Any]] = TTLCache(
+            maxsize=maxsize,
+            ttl=ttl,
+        )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.storage.set_state(key, state)
+        self._entry(key)["state"] = (
+            state.state if isinstance(state, State) else state
+        )
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        entry = self._entry(key)
+        if "state" not in entry:
+            entry["state"] = await self.storage.get_state(key)
+        return entry["state"]
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+        self._entry(key)["data"] = data.copy()
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        entry = self._entry(key)
+        if "data" not in entry:
+            entry["data"] = await self.storage.get_data(key)
+        return entry["data"].copy()
+
+    async def close(self) -> None:
+        self._cache.clear()
+        await self.storage.close()
+
+    def _entry(self, key: StorageKey) -> dict[str, Any]:
+        """Запись кэша для ключа; поля подгружаются по мере обращения."""
+        entry = self._cache.get(key)
+        if entry is MISSING:
+            entry = {}
+            self._cache.set(key, entry)
+        return entry
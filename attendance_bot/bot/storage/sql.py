@@ -0,0 +1,260 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from consts import (
+    FSM_FLUSH_BACKOFF_MAX,
+    FSM_FLUSH_RETRIES,
+    FSM_PURGE_INTERVAL,
+)
+from core.logger import setup_logging
+from database.models import FsmState
+
+logger = setup_logging(__name__)
+
+_PRIMARY_KEY = ("bot_id", "chat_id", "user_id", "thread_id", "destiny")
+
+
+def _state_name(state: StateType) -> str | None:
+    """Приводит State к строке, как это делает MemoryStorage."""
+    return state.state if isinstance(state, State) else state
+
+
+class SQLAlchemyStorage(BaseStorage):
+    """FSM-хранилище в таблице fsm_states.
+
+    set_data не уходит в БД сразу: изменения копятся в буфере и
+    сбрасываются одной транзакцией раз в flush_interval секунд. set_state
+    сбрасывает буфер сразу, поэтому после него состояние уже в БД и его
+    видят другие инстансы; данные, записанные перед ним, попадают в ту же
+    транзакцию. Чтение учитывает буфер.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        state_ttl: float | None = None,
+        flush_interval: float = 0.2,
+    ):
+        """Инициализирует хранилище."""
+
+        self.session_factory = session_factory
+        self.state_ttl = state_ttl
+        self.flush_interval = flush_interval
+        self._pending: dict[StorageKey, dict[str, Any]] = {}
+        self._flushing: dict[StorageKey, dict[str, Any]] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._last_purge = 0.0
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        self._write(key, state=_state_name(state))
+        await self.flush()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        fields = await self._read(key, "state")
+        return fields["state"]
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        self._write(key, data=data.copy())
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        fields = await self._read(key, "data")
+        return fields["data"].copy()
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Сбрасывает накопленные изменения в БД одной транзакцией."""
+        async with self._flush_lock:
+            if self._pending:
+                await self._flush_batch()
+
+    async def _flush_batch(self) -> None:
+        """Сохраняет текущий буфер; при ошибке возвращает его обратно."""
+        batch, self._pending = self._pending, {}
+        self._flushing = batch
+
+        try:
+            async with self.session_factory() as session:
+                insert = self._insert_for(session)
+                expires_at = self._expires_at()
+
+                for key, fields in batch.items():
+                    if self._is_cleared(fields):
+                        await session.execute(
+                            delete(FsmState).where(*self._where(key))
+                        )
+                        continue
+
+                    values = self._key_values(key)
+                    values["expires_at"] = expires_at
+                    if "state" in fields:
+                        values["state"] = fields["state"]
+                    if "data" in fields:
+                        values["data"] = json.dumps(
+                            fields["data"],
+                            ensure_ascii=False
+                        )
+
+                    stmt = insert(FsmState).values(**values)
+                    await session.execute(
+                        stmt.on_conflict_do_update(
+                            index_elements=list(_PRIMARY_KEY),
+                            set_={
+                                name: stmt.excluded[name]
+                                for name in values
+                                if name not in _PRIMARY_KEY
+                            }
+                        )
+                    )
+
+                if time.monotonic() - self._last_purge > FSM_PURGE_INTERVAL:
+                    await session.execute(
+                        delete(FsmState).where(
+                            FsmState.expires_at < datetime.now(timezone.utc)
+                        )
+                    )
+                    self._last_purge = time.monotonic()
+
+                await session.commit()
+        except BaseException:
+            # Вернуть несохранённое в буфер, не затирая более новые записи
+            for key, fields in batch.items():
+                self._pending[key] = {**fields, **self._pending.get(key, {})}
+            raise
+        finally:
+            self._flushing = {}
+
+    def _write(self, key: StorageKey, **fields) -> None:
+        """Кладёт изменение в буфер и планирует сброс."""
+        self._pending.setdefault(key, {}).update(fields)
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Сбрасывает буфер после задержки, собирая записи в пачку.
+
+        Ошибки БД повторяются с растущей задержкой, но не больше
+        FSM_FLUSH_RETRIES раз подряд. Дальше изменения ждут в буфере
+        следующей записи или close().
+        """
+        delay = self.flush_interval
+        failures = 0
+
+        try:
+            while self._pending:
+                await asyncio.sleep(delay)
+
+                try:
+                    await self.flush()
+                except Exception:
+                    failures += 1
+                    if failures > FSM_FLUSH_RETRIES:
+                        logger.exception(
+                            "Не удалось сохранить состояния FSM, "
+                            "повторы исчерпаны"
+                        )
+                        return
+
+                    delay = min(
+                        self.flush_interval * 2 ** failures,
+                        FSM_FLUSH_BACKOFF_MAX
+                    )
+                    logger.warning(
+                        f"Не удалось сохранить состояния FSM, "
+                        f"повтор через {delay:.1f} с",
+                        exc_info=True
+                    )
+                else:
+                    failures = 0
+                    delay = self.flush_interval
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+
+    async def _read(self, key: StorageKey, field: str) -> dict[str, Any]:
+        """Возвращает поля записи с учётом ещё не сохранённых изменений."""
+        buffered = {
+            **self._flushing.get(key, {}),
+            **self._pending.get(key, {}),
+        }
+        if field in buffered:
+            return buffered
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(FsmState.state, FsmState.data)
+                .where(
+                    *self._where(key),
+                    or_(
+                        FsmState.expires_at.is_(None),
+                        FsmState.expires_at > datetime.now(timezone.utc)
+                    )
+                )
+            )
+            row = result.first()
+
+        stored = {
+            "state": row.state if row else None,
+            "data": json.loads(row.data) if row and row.data else {},
+        }
+        return {**stored, **buffered}
+
+    def _expires_at(self) -> datetime | None:
+        """Время истечения для записываемых состояний."""
+        if self.state_ttl is None:
+            return None
+        return datetime.now(timezone.utc) + timedelta(seconds=self.state_ttl)
+
+    @staticmethod
+    def _is_cleared(fields: dict[str, Any]) -> bool:
+        """Запись после state.clear(): строку можно удалить."""
+        return (
+            "state" in fields
+            and fields["state"] is None
+            and fields.get("data") == {}
+        )
+
+    @staticmethod
+    def _key_values(key: StorageKey) -> dict[str, Any]:
+        """Значения первичного ключа для StorageKey."""
+        return {
+            "bot_id": key.bot_id,
+            "chat_id": key.chat_id,
+            "user_id": key.user_id,
+            "thread_id": key.thread_id or 0,
+            "destiny": key.destiny,
+        }
+
+    def _where(self, key: StorageKey) -> list:
+        """Условие выборки строки по StorageKey."""
+        return [
+            getattr(FsmState, name) == value
+            for name, value in self._key_values(key).items()
+        ]
+
+    @staticmethod
+    def _insert_for(session: AsyncSession):
+        """insert() с поддержкой ON CONFLICT для текущего диалекта."""
+        if session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert
+        return sqlite.insert
@@ -17,6 +17,7 @@ from bot.lexicon.lexicon import (
     status_icons,
     type_names,
 )
+from database.crud.requests import get_overlapping_requests
 from database.models import AbsenceRequest
 
 REQUESTS_PER_PAGE = 3
@@ -77,7 +78,38 @@ def build_page_text(
     return text
 
 
-def format_request_preview(data: dict) -> str:
+def format_request_dates(req: AbsenceRequest) -> str:
+    """Форматирует период заявки."""
+    if req.request_type == "partial_absence":
+        return (
+            f"{req.start_date.strftime('%d.%m.%Y')} "
+            f"{req.start_date.strftime('%H:%M')} — "
+            f"{req.end_date.strftime('%H:%M')}"
+        )
+    return (
+        f"{req.start_date.strftime('%d.%m.%Y')} — "
+        f"{req.end_date.strftime('%d.%m.%Y')}"
+    )
+
+
+async def find_request_conflicts(
+    session,
+    employee_id: int,
+    data: dict
+) -> list[AbsenceRequest]:
+    """Ищет заявки сотрудника, пересекающиеся с заявкой из state."""
+    return await get_overlapping_requests(
+        session,
+        employee_id,
+        datetime.fromisoformat(data["start_date"]),
+        datetime.fromisoformat(data["end_date"])
+    )
+
+
+def format_request_preview(
+    data: dict,
+    conflicts: list[AbsenceRequest] | None = None
+) -> str:
     """Форматирует предпросмотр заявки."""
     type_name = REQUEST_TYPE_LABELS.get(
         data["request_type"],
@@ -107,7 +139,25 @@ def format_request_preview(data: dict) -> str:
             comment=comment
         )
 
-    return f"{RequestMessages.PREVIEW_REQUEST}\n\n{preview}"
+    text = f"{RequestMessages.PREVIEW_REQUEST}\n\n{preview}"
+
+    if conflicts:
+        text += RequestMessages.REQUEST_CONFLICTS.format(
+            conflicts="".join(
+                RequestMessages.REQUEST_CONFLICT_ITEM.format(
+                    status_icon=status_icons.get(req.status, "❓"),
+                    id=req.id,
+                    type_name=type_names.get(
+                        req.request_type,
+                        req.request_type
+                    ),
+                    dates=format_request_dates(req)
+                )
+                for req in conflicts
+            )
+        )
+
+    return text
 
 
 async def safe_delete_message(
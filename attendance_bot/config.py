@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 from urllib.parse import quote
 
 from pydantic import Field
@@ -17,6 +18,22 @@ class DbConfig(BaseSettings):
     user: str = Field(default="postgres")
     password: str = Field(default="password")
     sqlite_path: str = Field(default="database.db")
+    replica_url: str = Field(default="")
+
+    pool_size: int = Field(default=10)
+    max_overflow: int = Field(default=20)
+    pool_timeout: float = Field(default=30)
+    pool_recycle: int = Field(default=1800)
+    pool_pre_ping: bool = Field(default=True)
+    pool_warmup: int = Field(default=5)
+    pool_stats_interval: float = Field(default=300)
+    connect_timeout: float = Field(default=10)
+    statement_cache_size: int = Field(default=100)
+
+    sqlite_tuning: bool = Field(default=True)
+    sqlite_mmap_size: int = Field(default=256 * 2**20)
+    sqlite_cache_size: int = Field(default=-64_000)
+    sqlite_maintenance_interval: float = Field(default=3600)
 
     @property
     def database_url(self) -> str:
@@ -29,6 +46,49 @@ class DbConfig(BaseSettings):
             )
         return f"sqlite+aiosqlite:///{BASE_DIR / self.sqlite_path}"
 
+    @property
+    def engine_options(self) -> dict:
+        """Параметры пула и подключения для create_async_engine.
+
+        statement_cache_size=0 нужен asyncpg за pgbouncer в режиме
+        transaction pooling.
+        """
+        if not self.prod_db:
+            return {"connect_args": {"timeout": self.connect_timeout}}
+
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "connect_args": {
+                "timeout": self.connect_timeout,
+                "statement_cache_size": self.statement_cache_size,
+            },
+        }
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        """PRAGMA для каждого нового соединения SQLite.
+
+        WAL позволяет читать во время записи, synchronous=NORMAL в WAL
+        не теряет целостность и убирает fsync на каждый commit, а
+        busy_timeout заставляет писателей ждать блокировку вместо ошибки
+        «database is locked».
+        """
+        if self.prod_db or not self.sqlite_tuning:
+            return {}
+
+        return {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": int(self.connect_timeout * 1000),
+            "mmap_size": self.sqlite_mmap_size,
+            "cache_size": self.sqlite_cache_size,
+            "temp_store": "MEMORY",
+        }
+
 
 class BotConfig(BaseSettings):
     """Конфигурация Telegram бота."""
@@ -36,6 +96,42 @@ class BotConfig(BaseSettings):
     token: str = Field(default="")
 
 
+class WebhookConfig(BaseSettings):
+    """Конфигурация webhook-режима (по умолчанию бот работает через polling)."""
+
+    # Без префикса поле path подхватило бы системную переменную PATH
+    model_config = SettingsConfigDict(env_prefix="WEBHOOK__")
+
+    enabled: bool = Field(default=False)
+    base_url: str = Field(default="")
+    path: str = Field(default="/webhook")
+    secret: str = Field(default="")
+    host: str = Field(default="0.0.0.0")
+    port: int = Field(default=8080)
+
+    @property
+    def url(self) -> str:
+        """Публичный адрес webhook, который регистрируется в Telegram."""
+        return f"{self.base_url.rstrip('/')}{self.path}"
+
+
+class FsmConfig(BaseSettings):
+    """Конфигурация хранилища состояний FSM.
+
+    backend=redis работает с любым сервером по протоколу Redis.
+    state_ttl, cache_ttl и flush_interval задаются в секундах;
+    cache_ttl=0 отключает кэш в памяти процесса. Кэш безопасен только
+    при одном инстансе бота: с общим sql/redis другие инстансы не
+    сбрасывают его, и состояние может читаться устаревшим до cache_ttl.
+    """
+
+    backend: Literal["memory", "sql", "redis"] = Field(default="sql")
+    redis_url: str = Field(default="redis://localhost:6379/0")
+    state_ttl: int | None = Field(default=7 * 24 * 3600)
+    cache_ttl: int = Field(default=0)
+    flush_interval: float = Field(default=0.2)
+
+
 class Config(BaseSettings):
     """Основной класс конфигурации."""
 
@@ -49,6 +145,8 @@ class Config(BaseSettings):
 
     db: DbConfig = Field(default_factory=DbConfig)
     bot: BotConfig = Field(default_factory=BotConfig)
+    webhook: WebhookConfig = Field(default_factory=WebhookConfig)
+    fsm: FsmConfig = Field(default_factory=FsmConfig)
 
 
 config = Config()
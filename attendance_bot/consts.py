@@ -1,3 +1,52 @@
 INVITE_EXPIRE_HOURS = 24
 
 REQUESTS_PER_PAGE = 3
+
+ROLE_CACHE_TTL = 60
+ROLE_CACHE_MAXSIZE = 4096
+
+TELEGRAM_GLOBAL_RATE = 30
+TELEGRAM_CHAT_RATE = 1
+TELEGRAM_MAX_RETRIES = 3
+NOTIFY_CONCURRENCY = 10
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_POLL_INTERVAL = 5
+OUTBOX_LEASE_SECONDS = 60
+OUTBOX_LEASE_MARGIN = 10
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE = 2
+OUTBOX_BACKOFF_MAX = 600
+OUTBOX_RETENTION_DAYS = 7
+
+FSM_CACHE_MAXSIZE = 10_000
+FSM_PURGE_INTERVAL = 3600
+FSM_FLUSH_RETRIES = 5
+FSM_FLUSH_BACKOFF_MAX = 30
+
+UPDATE_WORKERS = 8
+UPDATE_QUEUE_SIZE = 100
+UPDATE_METRICS_INTERVAL = 60
+
+COUNTERS_RECONCILE_INTERVAL = 300
+COUNTERS_MAXSIZE = 10_000
+
+REQUEST_WINDOW_SIZE = 20
+REQUEST_WINDOW_TTL = 300
+REQUEST_WINDOW_MAXSIZE = 1000
+
+EXPORT_CHUNK_SIZE = 5000
+XLSX_MAX_ROWS = 1_048_576
+
+REPORT_WORKERS = 2
+REPORT_PROCESSES = 2
+REPORT_POLL_INTERVAL = 10
+REPORT_PROGRESS_INTERVAL = 3
+REPORT_JOB_LEASE_SECONDS = 1800
+REPORT_JOB_MAX_ATTEMPTS = 3
+REPORT_CACHE_TTL = 600
+REPORT_CACHE_MAXSIZE = 100
+
+DIGEST_HOUR = 9
+DIGEST_MINUTE = 0
+DIGEST_WEEKDAYS = (0, 1, 2, 3, 4)
@@ -1,3 +1,4 @@
+from .cache import MISSING, TTLCache
 from .logger import setup_logging, get_logger
 
-__all__ = ["setup_logging", "get_logger"]
+__all__ = ["setup_logging", "get_logger", "TTLCache", "MISSING"]
@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+MISSING: Any = object()
+
+
+class TTLCache(Generic[V]):
+    """LRU-кэш в памяти процесса с ограничением времени жизни записей."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Инициализирует кэш с размером и TTL в секундах."""
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> V | Any:
+        """Возвращает значение или default, если записи нет или она устарела."""
+        item = self._data.get(key)
+
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Сохраняет значение, вытесняя самые старые записи."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаляет запись, если она есть."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
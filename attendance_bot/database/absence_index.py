@@ -0,0 +1,145 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from itertools import accumulate
+
+import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logger import setup_logging
+from database.enums import RequestStatusEnum
+from database.models import AbsenceRequest
+
+logger = setup_logging(__name__)
+
+LOCAL_TIMEZONE = pytz.timezone('Europe/Moscow')
+
+
+def _timestamp(value: datetime | date) -> float:
+    """Момент времени в секундах; даты без tzinfo считаются московскими."""
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = LOCAL_TIMEZONE.localize(value)
+    return value.timestamp()
+
+
+class AbsenceIndex:
+    """Индекс одобренных отсутствий в памяти процесса.
+
+    Интервалы хранятся как отсортированный массив событий «начало» и
+    «конец» с накопленным числом активных отсутствий после каждого
+    события. Пик за период — бинарный поиск границ и max по срезу
+    массива, без обращения к БД. Индекс загружается при старте бота,
+    после чего CRUD-функции обновляют его после успешного commit;
+    накопленные суммы пересчитываются при первом запросе после изменения.
+
+    Интервалы полуоткрытые: отсутствие, которое заканчивается ровно в
+    момент начала другого, с ним не пересекается.
+    """
+
+    def __init__(self):
+        """Инициализирует пустой индекс."""
+
+        self.loaded = False
+        self._intervals: dict[int, tuple[float, float, int]] = {}
+        self._events: list[tuple[float, int, int]] = []
+        self._times: list[float] = []
+        self._active: list[int] = []
+        self._dirty = False
+
+    async def load(self, session: AsyncSession) -> None:
+        """Загружает все одобренные заявки из БД."""
+        result = await session.execute(
+            select(
+                AbsenceRequest.id,
+                AbsenceRequest.employee_id,
+                AbsenceRequest.start_date,
+                AbsenceRequest.end_date,
+            )
+            .where(AbsenceRequest.status == RequestStatusEnum.APPROVED.value)
+        )
+
+        self._intervals = {
+            row.id: (
+                _timestamp(row.start_date),
+                _timestamp(row.end_date),
+                row.employee_id,
+            )
+            for row in result
+        }
+        self._events = sorted(
+            event
+            for request_id, (start, end, _) in self._intervals.items()
+            for event in ((start, 1, request_id), (end, -1, request_id))
+        )
+        self._dirty = True
+        self.loaded = True
+
+        logger.info(f"Индекс отсутствий загружен: {len(self._intervals)}")
+
+    def add(self, request: AbsenceRequest) -> None:
+        """Добавляет одобренную заявку."""
+        if not self.loaded or request.id in self._intervals:
+            return
+
+        start = _timestamp(request.start_date)
+        end = _timestamp(request.end_date)
+
+        self._intervals[request.id] = (start, end, request.employee_id)
+        insort(self._events, (start, 1, request.id))
+        insort(self._events, (end, -1, request.id))
+        self._dirty = True
+
+    def remove(self, request_id: int) -> None:
+        """Убирает заявку, если она есть в индексе."""
+        interval = self._intervals.pop(request_id, None)
+        if interval is None:
+            return
+
+        start, end, _ = interval
+        for event in ((start, 1, request_id), (end, -1, request_id)):
+            del self._events[bisect_left(self._events, event)]
+        self._dirty = True
+
+    def remove_employee(self, employee_id: int) -> None:
+        """Убирает все заявки удалённого сотрудника."""
+        request_ids = [
+            request_id
+            for request_id, (_, _, owner) in self._intervals.items()
+            if owner == employee_id
+        ]
+        for request_id in request_ids:
+            self.remove(request_id)
+
+    def peak(
+        self,
+        start_date: datetime | date,
+        end_date: datetime | date
+    ) -> int | None:
+        """Наибольшее число одновременных отсутствий в периоде.
+
+        Возвращает None, если индекс ещё не загружен.
+        """
+        if not self.loaded:
+            return None
+
+        if self._dirty:
+            # При совпадении времени конец стоит раньше начала, поэтому
+            # соприкасающиеся интервалы не завышают накопленную сумму.
+            self._times = [moment for moment, _, _ in self._events]
+            self._active = list(accumulate(
+                delta for _, delta, _ in self._events
+            ))
+            self._dirty = False
+
+        first = bisect_right(self._times, _timestamp(start_date))
+        last = bisect_left(self._times, _timestamp(end_date))
+
+        active = self._active[first - 1] if first else 0
+        if last > first:
+            return max(active, max(self._active[first:last]))
+        return active
+
+
+absence_index = AbsenceIndex()
@@ -0,0 +1,126 @@
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from consts import COUNTERS_MAXSIZE, COUNTERS_RECONCILE_INTERVAL
+from core.cache import MISSING, TTLCache
+from database.enums import RequestStatusEnum
+from database.models import AbsenceRequest
+
+
+class RequestCounters:
+    """Счётчики заявок в памяти процесса.
+
+    CRUD-функции заявок обновляют счётчики после успешного commit, так что
+    заголовки страниц не требуют COUNT(*). Раз в reconcile_interval секунд
+    значения перечитываются из БД: это исправляет расхождения из-за
+    изменений, сделанных другими процессами или в обход CRUD.
+
+    version растёт при каждом изменении набора заявок — по нему кэши
+    просмотра понимают, что их данные устарели.
+    """
+
+    def __init__(
+        self,
+        reconcile_interval: float = COUNTERS_RECONCILE_INTERVAL,
+        maxsize: int = COUNTERS_MAXSIZE,
+    ):
+        """Инициализирует пустые счётчики."""
+
+        self.reconcile_interval = reconcile_interval
+        self.version = 0
+        self._pending: int | None = None
+        self._total: int | None = None
+        self._loaded_at = 0.0
+        self._by_employee: TTLCache[int] = TTLCache(
+            maxsize=maxsize,
+            ttl=reconcile_interval,
+        )
+
+    async def pending(self, session: AsyncSession) -> int:
+        """Количество заявок, ожидающих решения."""
+        await self._ensure_totals(session)
+        return self._pending
+
+    async def total(self, session: AsyncSession) -> int:
+        """Общее количество заявок."""
+        await self._ensure_totals(session)
+        return self._total
+
+    async def for_employee(
+        self,
+        session: AsyncSession,
+        employee_id: int
+    ) -> int:
+        """Количество заявок сотрудника."""
+        count = self._by_employee.get(employee_id)
+
+        if count is MISSING:
+            result = await session.execute(
+                select(func.count(AbsenceRequest.id))
+                .where(AbsenceRequest.employee_id == employee_id)
+            )
+            count = result.scalar() or 0
+            self._by_employee.set(employee_id, count)
+
+        return count
+
+    def request_created(self, employee_id: int) -> None:
+        """Учитывает новую заявку в статусе pending."""
+        if self._total is not None:
+            self._total += 1
+            self._pending += 1
+
+        count = self._by_employee.get(employee_id)
+        if count is not MISSING:
+            self._by_employee.set(employee_id, count + 1)
+
+        self.version += 1
+
+    def status_changed(self, old_status: str, new_status: str) -> None:
+        """Учитывает смену статуса заявки."""
+        pending = RequestStatusEnum.PENDING.value
+
+        if self._pending is not None:
+            if old_status == pending:
+                self._pending -= 1
+            if new_status == pending:
+                self._pending += 1
+
+        self.version += 1
+
+    def invalidate(self) -> None:
+        """Сбрасывает все счётчики; они перечитаются при следующем запросе."""
+        self._pending = None
+        self._total = None
+        self._by_employee.clear()
+        self.version += 1
+
+    async def _ensure_totals(self, session: AsyncSession) -> None:
+        """Перечитывает общие счётчики, если они не загружены или устарели."""
+        if (
+            self._total is not None
+            and time.monotonic() - self._loaded_at < self.reconcile_interval
+        ):
+            return
+
+        result = await session.execute(
+            select(
+                func.count(AbsenceRequest.id),
+                func.count(AbsenceRequest.id).filter(
+                    AbsenceRequest.status == RequestStatusEnum.PENDING.value
+                ),
+            )
+        )
+        total, pending = result.one()
+
+        if (total, pending) != (self._total, self._pending):
+            self.version += 1
+
+        self._total = total
+        self._pending = pending
+        self._loaded_at = time.monotonic()
+
+
+request_counters = RequestCounters()
@@ -0,0 +1,103 @@
+from datetime import date
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from consts import EXPORT_CHUNK_SIZE
+from database.crud.requests import absence_day_rows
+from database.enums import RequestStatusEnum
+from database.models import AbsenceDay, AbsenceRequest, Employee
+from database.routing import read_only
+
+
+@read_only
+async def get_absences_on(
+    session: AsyncSession,
+    day: date,
+    status: str = RequestStatusEnum.APPROVED.value
+) -> list[Row]:
+    """Кто отсутствует в указанный день: тип, заявка и сотрудник."""
+    result = await session.execute(
+        select(
+            AbsenceDay.request_id,
+            AbsenceDay.request_type,
+            AbsenceRequest.start_date,
+            AbsenceRequest.end_date,
+            Employee.id.label("employee_id"),
+            Employee.last_name,
+            Employee.name,
+        )
+        .join(AbsenceRequest, AbsenceRequest.id == AbsenceDay.request_id)
+        .join(Employee, Employee.id == AbsenceDay.employee_id)
+        .where(AbsenceDay.day == day, AbsenceDay.status == status)
+        .order_by(AbsenceDay.request_type, Employee.last_name, Employee.name)
+    )
+    return list(result.all())
+
+
+@read_only
+async def count_absence_days(
+    session: AsyncSession,
+    date_from: date,
+    date_to: date,
+    status: str = RequestStatusEnum.APPROVED.value,
+    request_type: str | None = None,
+    employee_ids: list[int] | None = None
+) -> list[Row]:
+    """Число дней отсутствия за период по сотрудникам и типам."""
+    query = (
+        select(
+            AbsenceDay.employee_id,
+            AbsenceDay.request_type,
+            func.count().label("days"),
+        )
+        .where(
+            AbsenceDay.day >= date_from,
+            AbsenceDay.day <= date_to,
+            AbsenceDay.status == status
+        )
+        .group_by(AbsenceDay.employee_id, AbsenceDay.request_type)
+    )
+
+    if request_type is not None:
+        query = query.where(AbsenceDay.request_type == request_type)
+    if employee_ids is not None:
+        query = query.where(AbsenceDay.employee_id.in_(employee_ids))
+
+    result = await session.execute(query)
+    return list(result.all())
+
+
+async def rebuild_absence_days(
+    session: AsyncSession,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> int:
+    """Пересобирает absence_days из заявок одной транзакцией.
+
+    Возвращает число записанных дней.
+    """
+    await session.execute(delete(AbsenceDay))
+
+    result = await session.stream(
+        select(
+            AbsenceRequest.id,
+            AbsenceRequest.employee_id,
+            AbsenceRequest.request_type,
+            AbsenceRequest.status,
+            AbsenceRequest.start_date,
+            AbsenceRequest.end_date,
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+
+    total = 0
+    async for chunk in result.partitions():
+        rows = [day for request in chunk for day in absence_day_rows(request)]
+        if rows:
+            await session.execute(insert(AbsenceDay), rows)
+        total += len(rows)
+
+    await session.commit()
+
+    return total
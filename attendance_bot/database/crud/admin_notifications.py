@@ -1,4 +1,4 @@
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models import AdminNotification
@@ -25,6 +25,45 @@ async def create_admin_notification(
     return notification
 
 
+async def create_admin_notifications(
+    session: AsyncSession,
+    request_id: int,
+    sent: list[tuple[int, int, int]]
+) -> None:
+    """Создаёт записи об уведомлениях одним INSERT.
+
+    sent — список (admin_id, message_id, chat_id).
+    """
+    if not sent:
+        return
+
+    await session.execute(
+        insert(AdminNotification),
+        [
+            {
+                "request_id": request_id,
+                "admin_id": admin_id,
+                "message_id": message_id,
+                "chat_id": chat_id,
+                "is_active": True,
+            }
+            for admin_id, message_id, chat_id in sent
+        ]
+    )
+
+
+async def get_notified_admin_ids(
+    session: AsyncSession,
+    request_id: int
+) -> set[int]:
+    """Получает id админов, которым уже отправлено уведомление о заявке."""
+    result = await session.execute(
+        select(AdminNotification.admin_id)
+        .where(AdminNotification.request_id == request_id)
+    )
+    return set(result.scalars().all())
+
+
 async def get_active_notifications_for_request(
     session: AsyncSession,
     request_id: int,
@@ -63,3 +102,20 @@ async def deactivate_notifications_for_request(
 
     await session.execute(query)
     await session.flush()
+
+
+async def deactivate_admin_notification(
+    session: AsyncSession,
+    request_id: int,
+    admin_id: int
+) -> None:
+    """Деактивирует уведомление о заявке у одного админа."""
+    await session.execute(
+        update(AdminNotification)
+        .where(
+            AdminNotification.request_id == request_id,
+            AdminNotification.admin_id == admin_id,
+            AdminNotification.is_active.is_(True)
+        )
+        .values(is_active=False)
+    )
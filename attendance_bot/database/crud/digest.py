@@ -0,0 +1,22 @@
+from datetime import date
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import DigestRun
+
+
+async def claim_digest_day(session: AsyncSession, day: date) -> bool:
+    """Закрепляет рассылку сводки за день за текущим инстансом.
+
+    Возвращает False, если сводку за этот день уже забрал кто-то другой.
+    """
+    session.add(DigestRun(day=day))
+
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        return False
+
+    return True
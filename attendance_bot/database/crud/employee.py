@@ -1,14 +1,44 @@
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func, select, update
+from sqlalchemy import event, func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from consts import INVITE_EXPIRE_HOURS
+from consts import INVITE_EXPIRE_HOURS, ROLE_CACHE_MAXSIZE, ROLE_CACHE_TTL
+from core.cache import MISSING, TTLCache
+from database.absence_index import absence_index
+from database.counters import request_counters
 from database.enums import RoleEnum
 from database.models import AbsenceRequest, Employee, InviteCode
-from schemas.employee import EmployeeCreate
+from database.routing import read_only
+from schemas.employee import EmployeeCreate, EmployeeIdentity
+
+_WITH_INVITES = (selectinload(Employee.invite_codes),)
+
+_FOR_DELETE = (
+    selectinload(Employee.invite_codes),
+    selectinload(Employee.created_invites),
+    selectinload(Employee.request_changes),
+    selectinload(Employee.notifications),
+    selectinload(Employee.absence_requests)
+    .selectinload(AbsenceRequest.history),
+    selectinload(Employee.absence_requests)
+    .selectinload(AbsenceRequest.notifications),
+    selectinload(Employee.absence_requests)
+    .selectinload(AbsenceRequest.days),
+)
+
+_role_cache: TTLCache[EmployeeIdentity | None] = TTLCache(
+    maxsize=ROLE_CACHE_MAXSIZE,
+    ttl=ROLE_CACHE_TTL,
+)
+
+
+def invalidate_role_cache(telegram_id: int | None) -> None:
+    """Сбрасывает закэшированную роль для telegram_id."""
+    if telegram_id is not None:
+        _role_cache.pop(telegram_id)
 
 
 async def create_employee(
@@ -51,6 +81,7 @@ async def create_employee(
 
     try:
         await session.commit()
+        invalidate_role_cache(employee.telegram_id)
         await session.refresh(employee, ["invite_codes"])
         return employee
     except IntegrityError:
@@ -77,7 +108,7 @@ async def get_employee_by_id(
     result = await session.execute(
         select(Employee)
         .where(Employee.id == employee_id)
-        .options(selectinload(Employee.invite_codes))
+        .options(*_WITH_INVITES)
     )
     return result.scalar_one_or_none()
 
@@ -93,6 +124,7 @@ async def get_employee_by_telegram_id(
     return result.scalar_one_or_none()
 
 
+@read_only
 async def list_employees(session: AsyncSession) -> list[Employee]:
     """Получает всех сотрудников."""
     result = await session.execute(
@@ -101,6 +133,7 @@ async def list_employees(session: AsyncSession) -> list[Employee]:
     return list(result.scalars().all())
 
 
+@read_only
 async def count_employees(session: AsyncSession) -> int:
     """Подсчитывает общее количество сотрудников."""
     result = await session.execute(
@@ -114,7 +147,13 @@ async def bind_telegram_to_employee(
     employee_id: int,
     telegram_id: int,
 ) -> None:
-    """Привязывает telegram_id к сотруднику."""
+    """Привязывает telegram_id к сотруднику.
+
+    Изменение только отправляется в БД (flush): commit делает
+    вызывающий код вместе с погашением инвайт-кода. Кэш ролей
+    сбрасывается после этого commit — раньше параллельный апдейт мог бы
+    прочитать старое состояние и снова закэшировать «не зарегистрирован».
+    """
     await session.execute(
         update(Employee)
         .where(Employee.id == employee_id)
@@ -122,13 +161,25 @@ async def bind_telegram_to_employee(
     )
     await session.flush()
 
+    event.listen(
+        session.sync_session,
+        "after_commit",
+        lambda _: invalidate_role_cache(telegram_id),
+        once=True
+    )
+
 
 async def delete_employee_by_id(
     session: AsyncSession,
     employee_id: int
 ) -> Employee | None:
     """Удаляет сотрудника по ID."""
-    employee = await session.get(Employee, employee_id)
+    employee = await session.get(
+        Employee,
+        employee_id,
+        options=_FOR_DELETE,
+        populate_existing=True,
+    )
 
     if not employee:
         return None
@@ -140,21 +191,55 @@ async def delete_employee_by_id(
         email=employee.email
     )
 
+    telegram_id = employee.telegram_id
+
     await session.delete(employee)
     await session.commit()
+    invalidate_role_cache(telegram_id)
+    request_counters.invalidate()
+    absence_index.remove_employee(employee_id)
 
     return deleted
 
 
+async def get_employee_identity(
+    session: AsyncSession,
+    telegram_id: int,
+) -> EmployeeIdentity | None:
+    """Получает краткие данные сотрудника по telegram_id через кэш."""
+    cached = _role_cache.get(telegram_id)
+    if cached is not MISSING:
+        return cached
+
+    result = await session.execute(
+        select(
+            Employee.id,
+            Employee.role,
+            Employee.is_active,
+            Employee.name,
+            Employee.last_name,
+            Employee.patronymic,
+            Employee.email,
+            Employee.position,
+        )
+        .where(Employee.telegram_id == telegram_id)
+    )
+    row = result.one_or_none()
+    identity = EmployeeIdentity(*row) if row else None
+
+    _role_cache.set(telegram_id, identity)
+    return identity
+
+
 async def get_employee_role(
     session: AsyncSession,
     telegram_id: int,
 ) -> str | None:
     """Получает роль пользователя."""
-    employee = await get_employee_by_telegram_id(session, telegram_id)
-    if not employee:
+    identity = await get_employee_identity(session, telegram_id)
+    if not identity:
         return None
-    return employee.role
+    return identity.role
 
 
 async def get_admin_telegram_ids(session: AsyncSession) -> list[int]:
@@ -169,6 +254,21 @@ async def get_admin_telegram_ids(session: AsyncSession) -> list[int]:
     return list(result.scalars().all())
 
 
+async def get_admin_recipients(
+    session: AsyncSession
+) -> list[tuple[int, int]]:
+    """Получает (id, telegram_id) всех активных администраторов."""
+    result = await session.execute(
+        select(Employee.id, Employee.telegram_id).where(
+            Employee.role.in_(["admin", "superuser"]),
+            Employee.telegram_id.isnot(None),
+            Employee.is_active.is_(True)
+        )
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@read_only
 async def get_employee_requests_count(
     session: AsyncSession,
     employee_id: int
@@ -0,0 +1,137 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from consts import (
+    OUTBOX_BACKOFF_BASE,
+    OUTBOX_BACKOFF_MAX,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+)
+from database.enums import OutboxEventEnum, OutboxStatusEnum
+from database.models import NotificationOutbox
+
+
+def _utc_now() -> datetime:
+    """Текущее время в UTC."""
+    return datetime.now(timezone.utc)
+
+
+def enqueue_event(
+    session: AsyncSession,
+    event_type: OutboxEventEnum,
+    **payload
+) -> NotificationOutbox:
+    """Добавляет событие в outbox в рамках текущей транзакции (без commit)."""
+    event = NotificationOutbox(
+        event_type=event_type.value,
+        payload=json.dumps(payload, ensure_ascii=False),
+        status=OutboxStatusEnum.PENDING.value,
+        attempts=0
+    )
+    session.add(event)
+
+    return event
+
+
+async def claim_due_events(
+    session: AsyncSession,
+    limit: int
+) -> list[NotificationOutbox]:
+    """Забирает готовые к отправке события и продлевает их аренду.
+
+    Аренда (next_attempt_at в будущем) не даёт другому воркеру взять те же
+    события; если процесс упадёт, они снова станут доступны по истечении
+    OUTBOX_LEASE_SECONDS.
+    """
+    now = _utc_now()
+
+    result = await session.execute(
+        select(NotificationOutbox)
+        .where(
+            NotificationOutbox.status == OutboxStatusEnum.PENDING.value,
+            NotificationOutbox.next_attempt_at <= now
+        )
+        .order_by(NotificationOutbox.id.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    events = list(result.scalars().all())
+
+    if events:
+        await session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_([e.id for e in events]))
+            .values(
+                next_attempt_at=now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+            )
+        )
+
+    await session.commit()
+
+    return events
+
+
+async def mark_event_sent(session: AsyncSession, event_id: int) -> None:
+    """Помечает событие как отправленное."""
+    await session.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id == event_id)
+        .values(
+            status=OutboxStatusEnum.SENT.value,
+            sent_at=_utc_now(),
+            last_error=None
+        )
+    )
+    await session.commit()
+
+
+async def mark_event_failed(
+    session: AsyncSession,
+    event: NotificationOutbox,
+    error: str
+) -> bool:
+    """Планирует повтор с экспоненциальной задержкой.
+
+    Возвращает True, если попытки исчерпаны и событие ушло в dead letter.
+    """
+    attempts = event.attempts + 1
+    dead = attempts >= OUTBOX_MAX_ATTEMPTS
+    delay = min(OUTBOX_BACKOFF_BASE ** attempts, OUTBOX_BACKOFF_MAX)
+
+    await session.execute(
+        update(NotificationOutbox)
+        .where(NotificationOutbox.id == event.id)
+        .values(
+            status=(
+                OutboxStatusEnum.DEAD.value
+                if dead
+                else OutboxStatusEnum.PENDING.value
+            ),
+            attempts=attempts,
+            next_attempt_at=_utc_now() + timedelta(seconds=delay),
+            last_error=error[:2000]
+        )
+    )
+    await session.commit()
+
+    return dead
+
+
+async def purge_sent_events(
+    session: AsyncSession,
+    older_than: timedelta
+) -> int:
+    """Удаляет отправленные события старше заданного возраста."""
+    result = await session.execute(
+        delete(NotificationOutbox)
+        .where(
+            NotificationOutbox.status == OutboxStatusEnum.SENT.value,
+            NotificationOutbox.sent_at < _utc_now() - older_than
+        )
+    )
+    await session.commit()
+
+    return result.rowcount or 0
@@ -0,0 +1,137 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from consts import REPORT_JOB_LEASE_SECONDS, REPORT_JOB_MAX_ATTEMPTS
+from database.enums import ReportJobKindEnum, ReportJobStatusEnum
+from database.models import ReportJob
+
+
+def _utc_now() -> datetime:
+    """Текущее время в UTC."""
+    return datetime.now(timezone.utc)
+
+
+async def create_report_job(
+    session: AsyncSession,
+    kind: ReportJobKindEnum,
+    params: dict,
+    chat_id: int,
+    message_id: int | None,
+    requested_by: int | None
+) -> ReportJob:
+    """Ставит отчёт в очередь."""
+    job = ReportJob(
+        kind=kind.value,
+        params=json.dumps(params, ensure_ascii=False),
+        status=ReportJobStatusEnum.QUEUED.value,
+        chat_id=chat_id,
+        message_id=message_id,
+        requested_by=requested_by,
+        progress=0,
+        attempts=0
+    )
+    session.add(job)
+    await session.commit()
+
+    return job
+
+
+async def claim_next_job(session: AsyncSession) -> ReportJob | None:
+    """Забирает следующее задание из очереди.
+
+    Задание в статусе running, которое REPORT_JOB_LEASE_SECONDS не
+    сообщало о прогрессе, считается брошенным (процесс упал) и берётся
+    снова, пока не исчерпаны попытки.
+    """
+    now = _utc_now()
+    stale = and_(
+        ReportJob.status == ReportJobStatusEnum.RUNNING.value,
+        ReportJob.started_at
+        < now - timedelta(seconds=REPORT_JOB_LEASE_SECONDS)
+    )
+
+    await session.execute(
+        update(ReportJob)
+        .where(stale, ReportJob.attempts >= REPORT_JOB_MAX_ATTEMPTS)
+        .values(
+            status=ReportJobStatusEnum.FAILED.value,
+            error="Задание не завершилось за отведённое время",
+            finished_at=now
+        )
+    )
+
+    result = await session.execute(
+        select(ReportJob)
+        .where(
+            or_(
+                ReportJob.status == ReportJobStatusEnum.QUEUED.value,
+                stale
+            ),
+            ReportJob.attempts < REPORT_JOB_MAX_ATTEMPTS
+        )
+        .order_by(ReportJob.id.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = result.scalar_one_or_none()
+
+    if job is not None:
+        job.status = ReportJobStatusEnum.RUNNING.value
+        job.started_at = now
+        job.attempts += 1
+        job.progress = 0
+
+    await session.commit()
+
+    return job
+
+
+async def update_job_progress(
+    session: AsyncSession,
+    job_id: int,
+    progress: int
+) -> None:
+    """Сохраняет прогресс задания и продлевает его аренду.
+
+    started_at сдвигается на текущее время: claim_next_job отсчитывает
+    аренду от него и не заберёт задание, которое ещё строится.
+    """
+    await session.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id)
+        .values(progress=progress, started_at=_utc_now())
+    )
+    await session.commit()
+
+
+async def get_job_progress(session: AsyncSession, job_id: int) -> int:
+    """Текущий прогресс задания."""
+    result = await session.execute(
+        select(ReportJob.progress).where(ReportJob.id == job_id)
+    )
+    return result.scalar() or 0
+
+
+async def finish_job(
+    session: AsyncSession,
+    job_id: int,
+    error: str | None = None
+) -> None:
+    """Помечает задание выполненным или, если передана ошибка, упавшим."""
+    status = ReportJobStatusEnum.DONE
+    if error is not None:
+        status = ReportJobStatusEnum.FAILED
+
+    await session.execute(
+        update(ReportJob)
+        .where(ReportJob.id == job_id)
+        .values(
+            status=status.value,
+            error=error[:2000] if error else None,
+            finished_at=_utc_now()
+        )
+    )
+    await session.commit()
@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+
+from sqlalchemy import Date, Integer, and_, cast, func, literal, select
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import aliased
+
+from consts import EXPORT_CHUNK_SIZE
+from database.crud.requests import LOCAL_TIMEZONE, ensure_timezone
+from database.models import AbsenceRequest, AbsenceRequestHistory, Employee
+from database.routing import read_only
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _day_number(column, dialect: str):
+    """Номер календарного дня (по местному времени) для даты в колонке.
+
+    Разность двух таких номеров — число дней между датами. В PostgreSQL
+    timestamptz сначала переводится в местную таймзону; SQLite хранит
+    даты без смещения, уже в местном времени.
+    """
+    if dialect == "postgresql":
+        local = func.timezone(LOCAL_TIMEZONE.zone, column)
+        return cast(local, Date) - literal(_EPOCH, Date)
+    return cast(func.julianday(func.date(column)), Integer)
+
+
+def _clamp(column, bound, dialect: str, upper: bool):
+    """Ограничивает дату колонки границей периода."""
+    if dialect == "postgresql":
+        pick = func.least if upper else func.greatest
+    else:
+        pick = func.min if upper else func.max
+    return pick(column, literal(bound, column.type))
+
+
+@read_only
+async def get_absence_summary(
+    session: AsyncSession,
+    date_from: date,
+    date_to: date,
+    employee_id: int | None = None,
+    request_type: str | None = None,
+    status: str | None = None
+) -> Result:
+    """Агрегирует заявки за период по сотруднику, типу и статусу.
+
+    Одна строка на (сотрудник, тип, статус) с числом заявок и дней
+    отсутствия внутри периода; сотрудники без заявок попадают в выборку
+    одной строкой с пустыми типом и статусом. Строки отсортированы по
+    сотруднику, так что их можно обрабатывать потоком.
+    """
+    dialect = session.get_bind().dialect.name
+    period_start = ensure_timezone(date_from)
+    period_end = ensure_timezone(date_to)
+
+    conditions = [
+        AbsenceRequest.employee_id == Employee.id,
+        AbsenceRequest.start_date < period_end + timedelta(days=1),
+        AbsenceRequest.end_date >= period_start,
+    ]
+    if request_type is not None:
+        conditions.append(AbsenceRequest.request_type == request_type)
+    if status is not None:
+        conditions.append(AbsenceRequest.status == status)
+
+    start = _clamp(AbsenceRequest.start_date, period_start, dialect, False)
+    end = _clamp(AbsenceRequest.end_date, period_end, dialect, True)
+    days = _day_number(end, dialect) - _day_number(start, dialect) + 1
+
+    query = (
+        select(
+            Employee.id.label("employee_id"),
+            Employee.last_name,
+            Employee.name,
+            Employee.email,
+            Employee.position,
+            AbsenceRequest.request_type,
+            AbsenceRequest.status,
+            func.count(AbsenceRequest.id).label("requests"),
+            func.coalesce(func.sum(days), 0).label("days"),
+        )
+        .outerjoin(AbsenceRequest, and_(*conditions))
+        .group_by(
+            Employee.id,
+            Employee.last_name,
+            Employee.name,
+            Employee.email,
+            Employee.position,
+            AbsenceRequest.request_type,
+            AbsenceRequest.status,
+        )
+        .order_by(Employee.last_name, Employee.name, Employee.id)
+    )
+
+    if employee_id is not None:
+        query = query.where(Employee.id == employee_id)
+
+    return await session.execute(query)
+
+
+@read_only
+async def stream_requests_export(
+    session: AsyncSession,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> AsyncResult:
+    """Потоково выбирает заявки с сотрудниками и историей изменений.
+
+    Одна строка на запись истории (заявка без истории — одна строка с
+    пустыми полями истории), по порядку заявок. Строки читаются
+    серверным курсором пачками по chunk_size: перебирайте результат
+    через partitions(), не загружая его целиком.
+    """
+    changer = aliased(Employee)
+    history = AbsenceRequestHistory
+
+    query = (
+        select(
+            AbsenceRequest.id,
+            AbsenceRequest.request_type,
+            AbsenceRequest.status,
+            AbsenceRequest.start_date,
+            AbsenceRequest.end_date,
+            AbsenceRequest.comment,
+            AbsenceRequest.rejected_reason,
+            AbsenceRequest.created_at,
+            Employee.last_name,
+            Employee.name,
+            Employee.email,
+            Employee.position,
+            history.change_type,
+            history.old_value,
+            history.new_value,
+            history.reason.label("change_reason"),
+            history.changed_at,
+            changer.last_name.label("changer_last_name"),
+            changer.name.label("changer_name"),
+        )
+        .join(Employee, Employee.id == AbsenceRequest.employee_id)
+        .outerjoin(history, history.request_id == AbsenceRequest.id)
+        .outerjoin(changer, changer.id == history.changed_by)
+        .order_by(AbsenceRequest.id, history.changed_at, history.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    if date_from is not None:
+        query = query.where(
+            AbsenceRequest.end_date >= ensure_timezone(date_from)
+        )
+    if date_to is not None:
+        query = query.where(
+            AbsenceRequest.start_date
+            < ensure_timezone(date_to) + timedelta(days=1)
+        )
+
+    return await session.stream(query)
@@ -1,13 +1,22 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Literal
 
 import pytz
-from sqlalchemy import func, select
+from sqlalchemy import Select, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-
-from database.enums import ChangeTypeEnum, RequestStatusEnum
-from database.models import AbsenceRequest, AbsenceRequestHistory, Employee
+from sqlalchemy.orm import joinedload, selectinload
+
+from database.absence_index import absence_index
+from database.counters import request_counters
+from database.crud.admin_notifications import deactivate_admin_notification
+from database.crud.outbox import enqueue_event
+from database.enums import ChangeTypeEnum, OutboxEventEnum, RequestStatusEnum
+from database.models import (
+    AbsenceDay,
+    AbsenceRequest,
+    AbsenceRequestHistory,
+)
+from database.routing import read_only
 
 LOCAL_TIMEZONE = pytz.timezone('Europe/Moscow')
 
@@ -22,25 +31,97 @@ def ensure_timezone(dt: datetime | date) -> datetime:
     return dt
 
 
+def absence_day_rows(request) -> list[dict]:
+    """Строки absence_days для заявки: по одной на каждый её день."""
+    first = ensure_timezone(request.start_date).astimezone(LOCAL_TIMEZONE)
+    last = ensure_timezone(request.end_date).astimezone(LOCAL_TIMEZONE)
+
+    return [
+        {
+            "request_id": request.id,
+            "day": first.date() + timedelta(days=offset),
+            "employee_id": request.employee_id,
+            "request_type": request.request_type,
+            "status": request.status,
+        }
+        for offset in range((last.date() - first.date()).days + 1)
+    ]
+
+
+async def _set_absence_days_status(
+    session: AsyncSession,
+    request_id: int,
+    status: str
+) -> None:
+    """Переносит новый статус заявки в её дни отсутствия."""
+    await session.execute(
+        update(AbsenceDay)
+        .where(AbsenceDay.request_id == request_id)
+        .values(status=status)
+    )
+
+
+def _keyset_page(
+    query: Select,
+    cursor: int | None,
+    limit: int,
+    newest_first: bool,
+    backward: bool
+) -> Select:
+    """Добавляет к запросу keyset-пагинацию по (created_at, id).
+
+    cursor — id заявки, после (или до, если backward) которой нужна
+    страница; позиция курсора берётся подзапросом по первичному ключу,
+    так что переход на любую глубину стоит одного поиска по индексу.
+    """
+    key = tuple_(AbsenceRequest.created_at, AbsenceRequest.id)
+    ascending = newest_first == backward
+
+    if cursor is not None:
+        cursor_created_at = (
+            select(AbsenceRequest.created_at)
+            .where(AbsenceRequest.id == cursor)
+            .scalar_subquery()
+        )
+        cursor_key = tuple_(cursor_created_at, cursor)
+        query = query.where(
+            key > cursor_key if ascending else key < cursor_key
+        )
+
+    if ascending:
+        order = (AbsenceRequest.created_at.asc(), AbsenceRequest.id.asc())
+    else:
+        order = (AbsenceRequest.created_at.desc(), AbsenceRequest.id.desc())
+
+    return query.order_by(*order).limit(limit)
+
+
+async def _fetch_page(
+    session: AsyncSession,
+    query: Select,
+    backward: bool
+) -> list[AbsenceRequest]:
+    """Выполняет запрос страницы и возвращает заявки в порядке показа."""
+    result = await session.execute(query)
+    requests = list(result.scalars().all())
+
+    if backward:
+        requests.reverse()
+
+    return requests
+
+
 async def create_absence_request(
     session: AsyncSession,
-    telegram_id: int,
+    employee_id: int,
     request_type: str,
     start_date: datetime | date,
     end_date: datetime | date,
     comment: str | None = None
-) -> AbsenceRequest | None:
-    """Создаёт новую заявку на отсутствие."""
-    result = await session.execute(
-        select(Employee).where(Employee.telegram_id == telegram_id)
-    )
-    employee = result.scalar_one_or_none()
-
-    if not employee:
-        return None
-
+) -> AbsenceRequest:
+    """Создаёт новую заявку на отсутствие и событие для уведомления админов."""
     request = AbsenceRequest(
-        employee_id=employee.id,
+        employee_id=employee_id,
         request_type=request_type,
         start_date=ensure_timezone(start_date),
         end_date=ensure_timezone(end_date),
@@ -49,12 +130,49 @@ async def create_absence_request(
     )
 
     session.add(request)
+    await session.flush()
+
+    await session.execute(insert(AbsenceDay), absence_day_rows(request))
+
+    enqueue_event(
+        session,
+        OutboxEventEnum.REQUEST_CREATED,
+        request_id=request.id
+    )
     await session.commit()
+    request_counters.request_created(employee_id)
     await session.refresh(request)
 
     return request
 
 
+async def get_overlapping_requests(
+    session: AsyncSession,
+    employee_id: int,
+    start_date: datetime | date,
+    end_date: datetime | date
+) -> list[AbsenceRequest]:
+    """Ожидающие и одобренные заявки сотрудника, пересекающие период.
+
+    Один запрос по индексу idx_absence_request_employee_dates. Заявки,
+    которые только соприкасаются с периодом, пересечением не считаются.
+    """
+    result = await session.execute(
+        select(AbsenceRequest)
+        .where(
+            AbsenceRequest.employee_id == employee_id,
+            AbsenceRequest.start_date < ensure_timezone(end_date),
+            AbsenceRequest.end_date > ensure_timezone(start_date),
+            AbsenceRequest.status.in_([
+                RequestStatusEnum.PENDING.value,
+                RequestStatusEnum.APPROVED.value,
+            ])
+        )
+        .order_by(AbsenceRequest.start_date)
+    )
+    return list(result.scalars().all())
+
+
 async def get_request_by_id(
     session: AsyncSession,
     request_id: int
@@ -69,37 +187,33 @@ async def get_request_by_id(
 
 
 async def count_all_requests(session: AsyncSession) -> int:
-    """Подсчитывает общее количество всех заявок."""
-    result = await session.execute(
-        select(func.count(AbsenceRequest.id))
-    )
-    return result.scalar() or 0
+    """Возвращает общее количество всех заявок (из счётчиков)."""
+    return await request_counters.total(session)
 
 
 async def count_pending_requests(session: AsyncSession) -> int:
-    """Подсчитывает количество ожидающих заявок."""
-    result = await session.execute(
-        select(func.count(AbsenceRequest.id))
-        .where(AbsenceRequest.status == RequestStatusEnum.PENDING.value)
-    )
-    return result.scalar() or 0
+    """Возвращает количество ожидающих заявок (из счётчиков)."""
+    return await request_counters.pending(session)
 
 
+@read_only
 async def get_pending_requests_paginated(
     session: AsyncSession,
-    offset: int = 0,
-    limit: int = 1
+    cursor: int | None = None,
+    limit: int = 1,
+    backward: bool = False
 ) -> list[AbsenceRequest]:
-    """Получает ожидающие заявки с пагинацией."""
-    result = await session.execute(
+    """Получает ожидающие заявки (старые первыми) после курсора."""
+    query = _keyset_page(
         select(AbsenceRequest)
-        .options(selectinload(AbsenceRequest.employee))
-        .where(AbsenceRequest.status == RequestStatusEnum.PENDING.value)
-        .order_by(AbsenceRequest.created_at.asc())
-        .offset(offset)
-        .limit(limit)
+        .options(joinedload(AbsenceRequest.employee))
+        .where(AbsenceRequest.status == RequestStatusEnum.PENDING.value),
+        cursor,
+        limit,
+        newest_first=False,
+        backward=backward
     )
-    return list(result.scalars().all())
+    return await _fetch_page(session, query, backward)
 
 
 async def update_request_status(
@@ -109,58 +223,90 @@ async def update_request_status(
     changed_by_id: int,
     reason: str | None = None
 ) -> AbsenceRequest | None:
-    """Обновляет статус заявки и записывает в историю."""
-    request = await get_request_by_id(session, request_id)
+    """Переводит ожидающую заявку в новый статус и записывает в историю.
+
+    Статус меняется условным UPDATE ... WHERE status = 'pending'
+    RETURNING, без предварительного чтения заявки. Если заявки нет или
+    её уже обработал другой админ, ничего не меняется и возвращается
+    None. В той же транзакции пишется история, дни отсутствия, событие
+    outbox и гасится уведомление обработавшего админа.
+    """
+    values = {"status": new_status}
+    if new_status == RequestStatusEnum.REJECTED.value and reason:
+        values["rejected_reason"] = reason
+
+    result = await session.execute(
+        update(AbsenceRequest)
+        .where(
+            AbsenceRequest.id == request_id,
+            AbsenceRequest.status == RequestStatusEnum.PENDING.value
+        )
+        .values(**values)
+        .returning(AbsenceRequest)
+    )
+    request = result.scalar_one_or_none()
     if not request:
         return None
 
-    old_status = request.status
-    request.status = new_status
-
-    if new_status == RequestStatusEnum.REJECTED.value and reason:
-        request.rejected_reason = reason
-
-    history = AbsenceRequestHistory(
+    session.add(AbsenceRequestHistory(
         request_id=request_id,
         changed_by=changed_by_id,
         change_type=ChangeTypeEnum.STATUS_CHANGED.value,
-        old_value=old_status,
+        old_value=RequestStatusEnum.PENDING.value,
         new_value=new_status,
         reason=reason
+    ))
+    await _set_absence_days_status(session, request_id, new_status)
+    await deactivate_admin_notification(session, request_id, changed_by_id)
+
+    enqueue_event(
+        session,
+        OutboxEventEnum.REQUEST_STATUS_CHANGED,
+        request_id=request_id,
+        admin_id=changed_by_id,
+        status=new_status,
+        reason=reason
     )
-    session.add(history)
     await session.commit()
+    request_counters.status_changed(
+        RequestStatusEnum.PENDING.value,
+        new_status
+    )
+
+    if new_status == RequestStatusEnum.APPROVED.value:
+        absence_index.add(request)
+    else:
+        absence_index.remove(request_id)
 
     return request
 
 
+@read_only
 async def get_user_requests_paginated(
     session: AsyncSession,
     employee_id: int,
-    offset: int = 0,
-    limit: int = 1
+    cursor: int | None = None,
+    limit: int = 1,
+    backward: bool = False
 ) -> list[AbsenceRequest]:
-    """Получает заявки пользователя с пагинацией."""
-    result = await session.execute(
+    """Получает заявки пользователя (новые первыми) после курсора."""
+    query = _keyset_page(
         select(AbsenceRequest)
-        .where(AbsenceRequest.employee_id == employee_id)
-        .order_by(AbsenceRequest.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+        .where(AbsenceRequest.employee_id == employee_id),
+        cursor,
+        limit,
+        newest_first=True,
+        backward=backward
     )
-    return list(result.scalars().all())
+    return await _fetch_page(session, query, backward)
 
 
 async def count_user_requests(
     session: AsyncSession,
     employee_id: int
 ) -> int:
-    """Подсчитывает количество заявок пользователя."""
-    result = await session.execute(
-        select(func.count(AbsenceRequest.id))
-        .where(AbsenceRequest.employee_id == employee_id)
-    )
-    return result.scalar() or 0
+    """Возвращает количество заявок пользователя (из счётчиков)."""
+    return await request_counters.for_employee(session, employee_id)
 
 
 async def cancel_request_by_user(
@@ -168,49 +314,69 @@ async def cancel_request_by_user(
     request_id: int,
     employee_id: int
 ) -> AbsenceRequest | None:
-    """Отменяет заявку пользователем."""
+    """Отменяет ожидающую заявку пользователем.
+
+    Как и update_request_status, меняет статус условным UPDATE ...
+    WHERE status = 'pending' RETURNING: отмена, совпавшая по времени с
+    решением админа, не перезапишет его. Возвращает None, если заявки
+    нет, она чужая или уже не ожидает решения.
+    """
     result = await session.execute(
-        select(AbsenceRequest)
+        update(AbsenceRequest)
         .where(
             AbsenceRequest.id == request_id,
-            AbsenceRequest.employee_id == employee_id
+            AbsenceRequest.employee_id == employee_id,
+            AbsenceRequest.status == RequestStatusEnum.PENDING.value
         )
+        .values(status=RequestStatusEnum.CANCELLED.value)
+        .returning(AbsenceRequest)
     )
     request = result.scalar_one_or_none()
-
     if not request:
         return None
 
-    if request.status != RequestStatusEnum.PENDING.value:
-        return None
-
-    request.status = RequestStatusEnum.CANCELLED.value
-
-    history = AbsenceRequestHistory(
+    session.add(AbsenceRequestHistory(
         request_id=request_id,
         changed_by=employee_id,
         change_type=ChangeTypeEnum.CANCELLED.value,
         old_value=RequestStatusEnum.PENDING.value,
         new_value=RequestStatusEnum.CANCELLED.value,
         reason="Отменено пользователем"
+    ))
+    await _set_absence_days_status(
+        session,
+        request_id,
+        RequestStatusEnum.CANCELLED.value
+    )
+
+    enqueue_event(
+        session,
+        OutboxEventEnum.REQUEST_CANCELLED,
+        request_id=request_id
     )
-    session.add(history)
     await session.commit()
+    request_counters.status_changed(
+        RequestStatusEnum.PENDING.value,
+        RequestStatusEnum.CANCELLED.value
+    )
 
     return request
 
 
+@read_only
 async def get_all_requests_paginated(
     session: AsyncSession,
-    offset: int = 0,
-    limit: int = 5
+    cursor: int | None = None,
+    limit: int = 5,
+    backward: bool = False
 ) -> list[AbsenceRequest]:
-    """Получает все заявки с пагинацией."""
-    result = await session.execute(
+    """Получает все заявки (новые первыми) после курсора."""
+    query = _keyset_page(
         select(AbsenceRequest)
-        .options(selectinload(AbsenceRequest.employee))
-        .order_by(AbsenceRequest.created_at.desc())
-        .offset(offset)
-        .limit(limit)
+        .options(selectinload(AbsenceRequest.employee)),
+        cursor,
+        limit,
+        newest_first=True,
+        backward=backward
     )
-    return list(result.scalars().all())
+    return await _fetch_page(session, query, backward)
@@ -36,3 +36,35 @@ class ChangeTypeEnum(str, Enum):
     COMMENT_UPDATED = "comment_updated"
     CANCELLED = "cancelled"
     COMMENT_ADDED = "comment_added"
+
+
+class OutboxEventEnum(str, Enum):
+    """Enum для типов событий в outbox уведомлений"""
+
+    REQUEST_CREATED = "request_created"
+    REQUEST_STATUS_CHANGED = "request_status_changed"
+    REQUEST_CANCELLED = "request_cancelled"
+
+
+class OutboxStatusEnum(str, Enum):
+    """Enum для статусов событий в outbox уведомлений"""
+
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class ReportJobKindEnum(str, Enum):
+    """Enum для видов фоновых отчётов"""
+
+    SUMMARY = "summary"
+    EXPORT = "export"
+
+
+class ReportJobStatusEnum(str, Enum):
+    """Enum для статусов фоновых отчётов"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime, timezone
 import uuid
 
 from sqlalchemy import (
     BigInteger,
+    Date,
     DateTime,
     ForeignKey,
     Index,
@@ -17,7 +18,11 @@ from database.base import Base
 
 
 class Employee(Base):
-    """Сотрудник компании."""
+    """Сотрудник компании.
+
+    Связи не загружаются неявно (lazy="raise"): каждая CRUD-функция
+    сама указывает через options(), какие связи ей нужны.
+    """
 
     __tablename__ = "employees"
 
@@ -45,22 +50,27 @@ class Employee(Base):
         back_populates="employee",
         foreign_keys="[InviteCode.employee_id]",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
     )
     created_invites: Mapped[list["InviteCode"]] = relationship(
         foreign_keys="[InviteCode.created_by]",
         back_populates="creator",
-        lazy="selectin"
+        lazy="raise",
     )
     absence_requests: Mapped[list["AbsenceRequest"]] = relationship(
-        back_populates="employee", cascade="all, delete-orphan"
+        back_populates="employee",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
     request_changes: Mapped[list["AbsenceRequestHistory"]] = relationship(
         foreign_keys="[AbsenceRequestHistory.changed_by]",
-        back_populates="changer"
+        back_populates="changer",
+        lazy="raise",
     )
     notifications: Mapped[list["AdminNotification"]] = relationship(
-        back_populates="admin", cascade="all, delete-orphan"
+        back_populates="admin",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
 
 
@@ -114,6 +124,19 @@ class AbsenceRequest(Base):
             "start_date",
             "end_date",
         ),
+        Index("idx_absence_request_created", "created_at", "id"),
+        Index(
+            "idx_absence_request_status_created",
+            "status",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "idx_absence_request_employee_created",
+            "employee_id",
+            "created_at",
+            "id",
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -144,6 +167,38 @@ class AbsenceRequest(Base):
     notifications: Mapped[list["AdminNotification"]] = relationship(
         back_populates="request", cascade="all, delete-orphan"
     )
+    days: Mapped[list["AbsenceDay"]] = relationship(
+        back_populates="request", cascade="all, delete-orphan"
+    )
+
+
+class AbsenceDay(Base):
+    """День отсутствия по заявке (материализованная развёртка заявок).
+
+    Строка на каждый календарный день заявки; статус и тип дублируют
+    заявку и обновляются вместе с ней в той же транзакции. Вопросы «кто
+    отсутствует в этот день» и «сколько дней за месяц» решаются поиском
+    по индексу без арифметики над датами.
+    """
+
+    __tablename__ = "absence_days"
+    __table_args__ = (
+        Index("idx_absence_day_status", "day", "status"),
+        Index("idx_absence_day_employee", "employee_id", "day"),
+    )
+
+    request_id: Mapped[int] = mapped_column(
+        ForeignKey("absence_requests.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    employee_id: Mapped[int] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE")
+    )
+    request_type: Mapped[str] = mapped_column(String(50))
+    status: Mapped[str] = mapped_column(String(50))
+
+    request: Mapped["AbsenceRequest"] = relationship(back_populates="days")
 
 
 class AbsenceRequestHistory(Base):
@@ -211,3 +266,98 @@ class AdminNotification(Base):
         back_populates="notifications"
     )
     admin: Mapped["Employee"] = relationship(back_populates="notifications")
+
+
+def _utc_now() -> datetime:
+    """Текущее время в UTC."""
+    return datetime.now(timezone.utc)
+
+
+class NotificationOutbox(Base):
+    """Событие для отправки уведомлений в Telegram (transactional outbox)."""
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index("idx_outbox_due", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(50))
+    payload: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String(20), default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now
+    )
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+class FsmState(Base):
+    """Состояние и данные FSM aiogram для пары чат/пользователь."""
+
+    __tablename__ = "fsm_states"
+
+    bot_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    chat_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    thread_id: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, default=0
+    )
+    destiny: Mapped[str] = mapped_column(
+        String(32), primary_key=True, default="default"
+    )
+    state: Mapped[str | None] = mapped_column(String(255))
+    data: Mapped[str | None] = mapped_column(Text)
+    expires_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
+
+
+class ReportJob(Base):
+    """Задание на построение отчёта в фоне."""
+
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        Index("idx_report_job_due", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    params: Mapped[str] = mapped_column(Text)
+    status: Mapped[str] = mapped_column(String(20), default="queued")
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    message_id: Mapped[int | None] = mapped_column(BigInteger)
+    requested_by: Mapped[int | None] = mapped_column(
+        ForeignKey("employees.id", ondelete="SET NULL")
+    )
+    progress: Mapped[int] = mapped_column(default=0)
+    attempts: Mapped[int] = mapped_column(default=0)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True)
+    )
+
+
+class DigestRun(Base):
+    """Утренняя сводка, уже разосланная за день.
+
+    Строку вставляет инстанс, который рассылает сводку: первичный ключ по
+    дню не даёт второму инстансу или перезапуску разослать её повторно.
+    """
+
+    __tablename__ = "digest_runs"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    sent_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=_utc_now
+    )
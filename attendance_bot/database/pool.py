@@ -0,0 +1,94 @@
+import asyncio
+from contextlib import AsyncExitStack, suppress
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import NullPool
+
+from core.logger import setup_logging
+
+logger = setup_logging(__name__)
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Заранее открывает connections соединений и оставляет их в пуле.
+
+    Соединения открываются одновременно, поэтому пул действительно
+    получает столько разных соединений, а не одно, взятое несколько раз.
+    Для NullPool прогревать нечего.
+    """
+    if connections <= 0 or isinstance(engine.pool, NullPool):
+        return
+
+    async with AsyncExitStack() as stack:
+        opened = await asyncio.gather(*(
+            stack.enter_async_context(engine.connect())
+            for _ in range(connections)
+        ))
+        await asyncio.gather(*(
+            connection.execute(text("SELECT 1"))
+            for connection in opened
+        ))
+
+    logger.info(f"Пул соединений прогрет: {connections}")
+
+
+class PoolMonitor:
+    """Периодически пишет в лог состояние пула соединений.
+
+    Кроме снимка пула (занято, свободно, сверх лимита) считает, сколько
+    новых соединений было открыто за интервал: частые открытия под
+    нагрузкой означают, что pool_size мал.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float):
+        """Инициализирует монитор и подписывается на открытие соединений."""
+
+        self.engine = engine
+        self.interval = interval
+        self.connects = 0
+        self._task: asyncio.Task | None = None
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+
+    def start(self) -> None:
+        """Запускает фоновую задачу."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(
+                self._run(),
+                name="pool-monitor"
+            )
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def snapshot(self) -> str:
+        """Текущее состояние пула одной строкой."""
+        pool = self.engine.pool
+        stats = pool.status()
+
+        if hasattr(pool, "checkedout"):
+            stats = (
+                f"размер {pool.size()}, занято {pool.checkedout()}, "
+                f"свободно {pool.checkedin()}, "
+                f"сверх лимита {max(pool.overflow(), 0)}"
+            )
+
+        return f"{stats}, новых соединений {self.connects}"
+
+    async def _run(self) -> None:
+        """Основной цикл: раз в interval секунд пишет снимок пула."""
+        while True:
+            await asyncio.sleep(self.interval)
+            logger.info(f"Пул БД: {self.snapshot()}")
+            self.connects = 0
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        """Считает новые соединения с БД."""
+        self.connects += 1
@@ -0,0 +1,85 @@
+import functools
+from contextvars import ContextVar
+from typing import Awaitable, Callable, ParamSpec, TypeVar
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+
+
+def read_only(
+    func: Callable[P, Awaitable[T]]
+) -> Callable[P, Awaitable[T]]:
+    """Помечает CRUD-функцию как только читающую.
+
+    Пока выполняется такая функция, её SELECT-запросы могут уйти в
+    реплику. Функции без пометки всегда работают с основной БД.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        token = _read_only.set(True)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
+
+
+class RoutingSession(Session):
+    """Сессия, которая отправляет чтение в реплику, а запись — в основную БД.
+
+    В реплику уходят только обычные SELECT из функций, помеченных
+    read_only. Как только сессия что-то записала (flush или
+    INSERT/UPDATE/DELETE), все её дальнейшие запросы идут в основную БД:
+    в пределах одного апдейта пользователь видит свои изменения, даже
+    если реплика отстаёт.
+    """
+
+    def __init__(self, *args, replica: AsyncEngine | None = None, **kwargs):
+        """Инициализирует сессию; replica — движок реплики или None."""
+
+        super().__init__(*args, **kwargs)
+        self.replica = replica.sync_engine if replica is not None else None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Выбирает движок для запроса."""
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif (
+            self.replica is not None
+            and _read_only.get()
+            and not self.info.get("wrote")
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return self.replica
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def routing_sessionmaker(
+    engine: AsyncEngine,
+    replica: AsyncEngine | None = None
+) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий с маршрутизацией чтения в реплику."""
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        replica=replica,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
@@ -1,20 +1,24 @@
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_sessionmaker,
-    create_async_engine
-)
+from sqlalchemy.ext.asyncio import create_async_engine
+
 from config import config
+from database.routing import routing_sessionmaker
+from database.sqlite import apply_sqlite_pragmas
 
 
 engine = create_async_engine(
     config.db.database_url,
     future=True,
+    **config.db.engine_options,
 )
+apply_sqlite_pragmas(engine, config.db.sqlite_pragmas)
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+replica_engine = None
+if config.db.replica_url:
+    replica_engine = create_async_engine(
+        config.db.replica_url,
+        future=True,
+        **config.db.engine_options,
+    )
+    apply_sqlite_pragmas(replica_engine, config.db.sqlite_pragmas)
+
+AsyncSessionLocal = routing_sessionmaker(engine, replica_engine)
@@ -0,0 +1,83 @@
+import asyncio
+from contextlib import suppress
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.logger import setup_logging
+
+logger = setup_logging(__name__)
+
+
+def apply_sqlite_pragmas(
+    engine: AsyncEngine,
+    pragmas: dict[str, str | int]
+) -> None:
+    """Выполняет pragmas на каждом новом соединении движка."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class SqliteMaintenance:
+    """Периодическое обслуживание SQLite.
+
+    PRAGMA optimize обновляет статистику планировщика по таблицам, где она
+    устарела, а wal_checkpoint(TRUNCATE) переносит WAL в основной файл и
+    обрезает его, чтобы журнал не рос между автоматическими чекпойнтами.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float):
+        """Инициализирует обслуживание."""
+
+        self.engine = engine
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Запускает фоновую задачу."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(
+                self._run(),
+                name="sqlite-maintenance"
+            )
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def run_once(self) -> None:
+        """Выполняет optimize и чекпойнт WAL."""
+        async with self.engine.connect() as connection:
+            await connection.exec_driver_sql("PRAGMA optimize")
+            result = await connection.exec_driver_sql(
+                "PRAGMA wal_checkpoint(TRUNCATE)"
+            )
+            busy, log_pages, checkpointed = result.one()
+
+        logger.info(
+            f"Обслуживание SQLite: страниц WAL {log_pages}, "
+            f"перенесено {checkpointed}"
+            + (", чекпойнт не завершён" if busy else "")
+        )
+
+    async def _run(self) -> None:
+        """Основной цикл."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Ошибка обслуживания SQLite")
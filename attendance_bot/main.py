@@ -1,55 +1,195 @@
 import asyncio
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
+from aiogram.webhook.aiohttp_server import (
+    SimpleRequestHandler,
+    setup_application,
+)
+from aiohttp import web
 
 from config import config
 from core.logger import setup_logging
 
+from database.absence_index import absence_index
+from database.pool import PoolMonitor, warm_up_pool
 from database.session import AsyncSessionLocal as async_session
+from database.session import engine, replica_engine
+from database.sqlite import SqliteMaintenance
 from middlewares.db import DbSessionMiddleware
+from middlewares.fsm_buffer import FSMBufferMiddleware
+from middlewares.identity import IdentityMiddleware
+from middlewares.scheduler import UpdateScheduler
 # from middlewares.bot import BotMiddleware
 
 from bot.handlers import admin_router, user_router, anonymous_router
+from bot.services.digest import DailyDigest
+from bot.services.outbox import OutboxDispatcher
+from bot.services.report_jobs import ReportJobQueue
+from bot.storage import build_fsm_storage
 
 logger = setup_logging(__name__)
 
+SCHEDULER_KEY = web.AppKey("scheduler", UpdateScheduler)
 
-async def on_startup(bot: Bot) -> None:
+
+async def on_startup(
+    bot: Bot,
+    outbox: OutboxDispatcher,
+    scheduler: UpdateScheduler,
+    reports: ReportJobQueue,
+    digest: DailyDigest,
+    pool_monitor: PoolMonitor,
+    sqlite_maintenance: SqliteMaintenance
+) -> None:
     """Действия при запуске бота."""
 
+    await warm_up_pool(engine, config.db.pool_warmup)
+    pool_monitor.start()
+    sqlite_maintenance.start()
+
+    async with async_session() as session:
+        await absence_index.load(session)
+
+    scheduler.start()
+    outbox.start()
+    reports.start()
+    digest.start()
     logger.info("Бот запущен")
 
 
-async def on_shutdown(bot: Bot) -> None:
+async def on_shutdown(
+    bot: Bot,
+    dispatcher: Dispatcher,
+    outbox: OutboxDispatcher,
+    scheduler: UpdateScheduler,
+    reports: ReportJobQueue,
+    digest: DailyDigest,
+    pool_monitor: PoolMonitor,
+    sqlite_maintenance: SqliteMaintenance
+) -> None:
     """Действия при остановке бота."""
 
+    await digest.stop()
+    await scheduler.stop()
+    await reports.stop()
+    await outbox.stop()
+    await dispatcher.storage.close()
+    await pool_monitor.stop()
+    await sqlite_maintenance.stop()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Бот остановлен")
 
 
-async def main():
+async def set_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Регистрирует webhook в Telegram."""
 
-    bot = Bot(
-        token=config.bot.token,
-        default=DefaultBotProperties(parse_mode="HTML")
+    await bot.set_webhook(
+        config.webhook.url,
+        secret_token=config.webhook.secret,
+        allowed_updates=dispatcher.resolve_used_update_types()
     )
-    dp = Dispatcher(storage=MemoryStorage())
+    logger.info(f"Webhook установлен: {config.webhook.url}")
+
+
+async def metrics(request: web.Request) -> web.Response:
+    """Отдаёт метрики очередей апдейтов."""
+
+    return web.Response(text=request.app[SCHEDULER_KEY].render_metrics())
 
+
+def create_dispatcher(bot: Bot) -> Dispatcher:
+    """Создаёт диспетчер с хранилищем, middleware и роутерами."""
+
+    dp = Dispatcher(storage=build_fsm_storage(config.fsm, async_session))
+    dp["outbox"] = OutboxDispatcher(bot, async_session)
+    dp["scheduler"] = UpdateScheduler()
+    dp["reports"] = ReportJobQueue(bot, async_session)
+    dp["digest"] = DailyDigest(bot, async_session)
+    dp["pool_monitor"] = PoolMonitor(engine, config.db.pool_stats_interval)
+
+    # Обслуживание нужно только SQLite в режиме WAL.
+    maintenance_interval = 0
+    if config.db.sqlite_pragmas:
+        maintenance_interval = config.db.sqlite_maintenance_interval
+    dp["sqlite_maintenance"] = SqliteMaintenance(engine, maintenance_interval)
+
+    dp["scheduler"].install(dp)
     dp.update.middleware(DbSessionMiddleware(async_session))
+    dp.update.middleware(IdentityMiddleware())
+    dp.message.middleware(FSMBufferMiddleware())
+    dp.callback_query.middleware(FSMBufferMiddleware())
     # dp.update.middleware(BotMiddleware(bot))
 
     dp.include_router(admin_router)
     dp.include_router(user_router)
     dp.include_router(anonymous_router)
 
-    logger.info("Запуск бота")
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
 
+    return dp
+
+
+async def run_polling(bot: Bot, dp: Dispatcher) -> None:
+    """Запуск в режиме long polling (для разработки)."""
+
+    logger.info("Запуск бота в режиме polling")
+    await bot.delete_webhook(drop_pending_updates=True)
+    await dp.start_polling(bot, handle_as_tasks=False)
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """Запуск aiohttp-сервера, принимающего апдейты через webhook."""
+
+    if not config.webhook.secret:
+        raise RuntimeError("Для webhook-режима задайте WEBHOOK__SECRET")
+
+    dp.startup.register(set_webhook)
+
+    app = web.Application()
+    # Без фоновых задач aiogram ответ Telegram ждёт места в очереди
+    # шарда: при переполнении webhook притормаживает, а не копит задачи.
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=False,
+        secret_token=config.webhook.secret
+    ).register(app, path=config.webhook.path)
+    app.router.add_get("/metrics", metrics)
+    app[SCHEDULER_KEY] = dp["scheduler"]
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, config.webhook.host, config.webhook.port)
+
+    logger.info(
+        f"Запуск бота в режиме webhook на "
+        f"{config.webhook.host}:{config.webhook.port}{config.webhook.path}"
+    )
+
+    try:
+        await site.start()
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def main():
+
+    bot = Bot(
+        token=config.bot.token,
+        default=DefaultBotProperties(parse_mode="HTML")
+    )
+    dp = create_dispatcher(bot)
+
     try:
-        await dp.start_polling(bot)
+        if config.webhook.enabled:
+            await run_webhook(bot, dp)
+        else:
+            await run_polling(bot, dp)
     except asyncio.CancelledError:
         logger.info("Получен сигнал остановки")
     finally:
@@ -1,15 +1,23 @@
 from aiogram import BaseMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
 class DbSessionMiddleware(BaseMiddleware):
+    """Передаёт хендлерам AsyncSession на время апдейта.
 
-    def __init__(self, sessionmaker):
+    Хендлер получает обычную AsyncSession, без прокси: она сама ленивая
+    и берёт соединение из пула только на первом запросе. Апдейты, которые
+    не ходят в БД (кнопки календаря, подсказки), соединение не занимают,
+    а закрытие неиспользованной сессии ничего не стоит.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession]):
         """Инициализирует middleware с фабрикой сессий."""
 
         self.sessionmaker = sessionmaker
 
     async def __call__(self, handler, event, data):
-        """Создаёт сессию БД и передаёт её в обработчик."""
+        """Создаёт сессию БД и закрывает её после обработчика."""
 
         async with self.sessionmaker() as session:
             data["session"] = session
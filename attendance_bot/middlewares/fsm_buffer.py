@@ -0,0 +1,27 @@
+from aiogram import BaseMiddleware
+
+from bot.storage.buffered import BufferedFSMContext
+from core.cache import MISSING
+
+
+class FSMBufferMiddleware(BaseMiddleware):
+    """Подменяет FSMContext буферизованным на время хендлера."""
+
+    async def __call__(self, handler, event, data):
+        """Сбрасывает изменения состояния один раз после хендлера."""
+
+        state = data.get("state")
+        if state is None:
+            return await handler(event, data)
+
+        buffered = BufferedFSMContext(
+            state.storage,
+            state.key,
+            raw_state=data.get("raw_state", MISSING)
+        )
+        data["state"] = buffered
+
+        try:
+            return await handler(event, data)
+        finally:
+            await buffered.flush()
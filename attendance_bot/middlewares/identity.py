@@ -0,0 +1,19 @@
+from aiogram import BaseMiddleware
+
+from database.crud.employee import get_employee_identity
+
+
+class IdentityMiddleware(BaseMiddleware):
+    """Определяет текущего сотрудника один раз на апдейт."""
+
+    async def __call__(self, handler, event, data):
+        """Кладёт EmployeeIdentity (или None) в данные хендлера."""
+
+        user = data.get("event_from_user")
+        identity = None
+
+        if user is not None:
+            identity = await get_employee_identity(data["session"], user.id)
+
+        data["identity"] = identity
+        return await handler(event, data)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from contextlib import suppress
+
+from aiogram import BaseMiddleware, Dispatcher
+
+from consts import (
+    UPDATE_METRICS_INTERVAL,
+    UPDATE_QUEUE_SIZE,
+    UPDATE_WORKERS,
+)
+from core.logger import setup_logging
+
+logger = setup_logging(__name__)
+
+
+class UpdateScheduler(BaseMiddleware):
+    """Распределяет апдейты по воркерам по chat_id.
+
+    Встраивается в outer-middleware апдейтов через install(): апдейт
+    кладётся в очередь своего шарда и обрабатывается воркером этого шарда,
+    поэтому апдейты одного чата идут строго по порядку, а медленный
+    хендлер задерживает только свой шард. Очереди ограничены: если шард
+    переполнен, put() ждёт, и получение новых апдейтов притормаживает.
+    Для polling нужен handle_as_tasks=False, для webhook —
+    handle_in_background=False, иначе aiogram обойдёт очереди своими
+    задачами.
+    """
+
+    def __init__(
+        self,
+        workers: int = UPDATE_WORKERS,
+        queue_size: int = UPDATE_QUEUE_SIZE,
+    ):
+        """Инициализирует шарды и счётчики метрик."""
+
+        self.workers = workers
+        self._queues: list[asyncio.Queue] = [
+            asyncio.Queue(maxsize=queue_size) for _ in range(workers)
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+        self.processed = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.handle_seconds = 0.0
+        self._window = [0, 0.0, 0.0, 0.0, 0.0]
+
+    async def __call__(self, handler, event, data):
+        """Ставит апдейт в очередь шарда и сразу возвращает управление."""
+
+        if not self._tasks:
+            return await handler(event, data)
+
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        shard_key = chat.id if chat else user.id if user else 0
+
+        queue = self._queues[shard_key % self.workers]
+        await queue.put((handler, event, data, time.monotonic()))
+
+    def install(self, dispatcher: Dispatcher) -> None:
+        """Ставит планировщик в outer-middleware апдейтов перед FSM.
+
+        aiogram читает состояние FSM в своём outer-middleware. Если он
+        стоит после планировщика, состояние читается уже в воркере шарда:
+        один раз на апдейт и после того, как предыдущие апдейты чата
+        записали свои изменения.
+        """
+        outer = dispatcher.update.outer_middleware
+        outer.unregister(dispatcher.fsm)
+        outer.register(self)
+        outer.register(dispatcher.fsm)
+
+    def start(self) -> None:
+        """Запускает воркеры и периодический лог метрик."""
+        if self._tasks:
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"updates-{i}")
+            for i, queue in enumerate(self._queues)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._log_metrics(), name="updates-metrics")
+        )
+        logger.info(f"Запущено воркеров апдейтов: {self.workers}")
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Дожидается разбора очередей и останавливает воркеры."""
+        if not self._tasks:
+            return
+
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.join(), timeout=timeout)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        """Ждёт, пока воркеры разберут все поставленные апдейты."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    def queue_depths(self) -> list[int]:
+        """Текущая длина очереди каждого шарда."""
+        return [queue.qsize() for queue in self._queues]
+
+    def render_metrics(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines = [
+            f"bot_updates_processed_total {self.processed}",
+            f"bot_updates_failed_total {self.failed}",
+            f"bot_update_wait_seconds_sum {self.wait_seconds:.6f}",
+            f"bot_update_handle_seconds_sum {self.handle_seconds:.6f}",
+        ]
+        lines += [
+            f'bot_update_queue_depth{{shard="{i}"}} {depth}'
+            for i, depth in enumerate(self.queue_depths())
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Обрабатывает апдейты одного шарда по очереди."""
+        while True:
+            handler, event, data, enqueued_at = await queue.get()
+            started_at = time.monotonic()
+
+            try:
+                await handler(event, data)
+            except Exception:
+                self.failed += 1
+                logger.exception("Ошибка при обработке апдейта")
+            finally:
+                finished_at = time.monotonic()
+                self._record(
+                    started_at - enqueued_at,
+                    finished_at - started_at
+                )
+                queue.task_done()
+
+    def _record(self, wait: float, handle: float) -> None:
+        """Обновляет счётчики после обработки апдейта."""
+        self.processed += 1
+        self.wait_seconds += wait
+        self.handle_seconds += handle
+
+        window = self._window
+        window[0] += 1
+        window[1] += wait
+        window[2] = max(window[2], wait)
+        window[3] += handle
+        window[4] = max(window[4], handle)
+
+    async def _log_metrics(self) -> None:
+        """Периодически пишет в лог сводку по очередям и задержкам."""
+        while True:
+            await asyncio.sleep(UPDATE_METRICS_INTERVAL)
+
+            count, wait_sum, wait_max, handle_sum, handle_max = self._window
+            self._window = [0, 0.0, 0.0, 0.0, 0.0]
+
+            if not count:
+                continue
+
+            logger.info(
+                f"Апдейты за {UPDATE_METRICS_INTERVAL} с: {count}, "
+                f"ошибок всего: {self.failed}, "
+                f"очереди: {self.queue_depths()}, "
+                f"ожидание avg/max: {wait_sum / count * 1000:.0f}/"
+                f"{wait_max * 1000:.0f} мс, "
+                f"обработка avg/max: {handle_sum / count * 1000:.0f}/"
+                f"{handle_max * 1000:.0f} мс"
+            )
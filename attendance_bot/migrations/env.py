@@ -17,7 +17,12 @@ from database.models import (
     InviteCode,
     AbsenceRequest,
     AbsenceRequestHistory,
+    AbsenceDay,
     AdminNotification,
+    DigestRun,
+    NotificationOutbox,
+    FsmState,
+    ReportJob,
 )
 
 config = context.config
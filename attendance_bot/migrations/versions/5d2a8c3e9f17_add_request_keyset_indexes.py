@@ -0,0 +1,31 @@
+"""add keyset pagination indexes for absence requests
+
+Revision ID: 5d2a8c3e9f17
+Revises: 3b7e9f01c2d4
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a8c3e9f17'
+down_revision: Union[str, Sequence[str], None] = '3b7e9f01c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_absence_request_created', 'absence_requests', ['created_at', 'id'], unique=False)
+    op.create_index('idx_absence_request_status_created', 'absence_requests', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('idx_absence_request_employee_created', 'absence_requests', ['employee_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_absence_request_employee_created', table_name='absence_requests')
+    op.drop_index('idx_absence_request_status_created', table_name='absence_requests')
+    op.drop_index('idx_absence_request_created', table_name='absence_requests')
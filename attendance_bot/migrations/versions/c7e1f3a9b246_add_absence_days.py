@@ -0,0 +1,83 @@
+"""add absence days
+
+Revision ID: c7e1f3a9b246
+Revises: 9a4c6e2b1d58
+Create Date: 2026-10-18 16:00:00.000000
+
+Таблица заполняется по существующим заявкам здесь же, пачками.
+Пересобрать её позже можно через python scripts/rebuild_absence_days.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.crud.requests import absence_day_rows
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1f3a9b246'
+down_revision: Union[str, Sequence[str], None] = '9a4c6e2b1d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+absence_requests = sa.table(
+    'absence_requests',
+    sa.column('id', sa.Integer()),
+    sa.column('employee_id', sa.Integer()),
+    sa.column('request_type', sa.String()),
+    sa.column('status', sa.String()),
+    sa.column('start_date', sa.DateTime(timezone=True)),
+    sa.column('end_date', sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    absence_days = op.create_table('absence_days',
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('request_type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['request_id'], ['absence_requests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('request_id', 'day')
+    )
+    _backfill_absence_days(absence_days)
+    op.create_index('idx_absence_day_status', 'absence_days', ['day', 'status'], unique=False)
+    op.create_index('idx_absence_day_employee', 'absence_days', ['employee_id', 'day'], unique=False)
+
+
+def _backfill_absence_days(absence_days: sa.Table) -> None:
+    """Разворачивает существующие заявки в дни пачками по id заявки.
+
+    Индексы создаются уже после заполнения, так вставка быстрее.
+    """
+    connection = op.get_bind()
+    last_id = 0
+
+    while True:
+        requests = connection.execute(
+            sa.select(absence_requests)
+            .where(absence_requests.c.id > last_id)
+            .order_by(absence_requests.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not requests:
+            break
+
+        op.bulk_insert(
+            absence_days,
+            [day for request in requests for day in absence_day_rows(request)]
+        )
+        last_id = requests[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_absence_day_employee', table_name='absence_days')
+    op.drop_index('idx_absence_day_status', table_name='absence_days')
+    op.drop_table('absence_days')
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 
@@ -45,3 +45,21 @@ class EmployeeUpdate(BaseModel):
         if v is not None and len(v.strip()) < 2:
             raise ValueError("Должно быть не менее 2 символов")
         return v
+
+
+class EmployeeIdentity(NamedTuple):
+    """Краткие данные текущего пользователя для фильтров и хендлеров."""
+
+    id: int
+    role: str
+    is_active: bool
+    name: str
+    last_name: str
+    patronymic: str | None
+    email: str
+    position: str | None
+
+    @property
+    def is_admin(self) -> bool:
+        """Является ли сотрудник админом или суперюзером."""
+        return self.role in ("admin", "superuser")
@@ -0,0 +1,170 @@
+"""Бенчмарк потоковой выгрузки заявок.
+
+Создаёт временную SQLite-базу с синтетическими заявками (по одной записи
+истории на заявку), выгружает её в CSV и XLSX и печатает RSS процесса
+по ходу выгрузки. При потоковой записи RSS должен оставаться ровным,
+сколько бы строк ни было.
+
+    python scripts/bench_export.py --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from bot.services.exports import ExportParams, RequestExportService
+from database.base import Base
+from database.enums import ChangeTypeEnum, RequestStatusEnum, RequestTypeEnum
+from database.models import AbsenceRequest, AbsenceRequestHistory, Employee
+
+EMPLOYEES = 2000
+INSERT_BATCH = 50_000
+
+
+def rss_mb() -> float:
+    """Текущий RSS процесса в МБ (пиковый, если /proc недоступен)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**10 if sys.platform != "darwin" else peak / 2**20
+
+
+async def populate(session_factory, rows: int) -> None:
+    """Заполняет базу сотрудниками и rows заявками с историей."""
+    types = [item.value for item in RequestTypeEnum]
+    statuses = [item.value for item in RequestStatusEnum]
+    start = datetime(2024, 1, 1)
+
+    async with session_factory() as session:
+        await session.execute(insert(Employee), [
+            {
+                "name": f"Имя{i}",
+                "last_name": f"Фамилия{i}",
+                "email": f"employee{i}@example.com",
+                "position": "Инженер",
+                "role": "user",
+            }
+            for i in range(1, EMPLOYEES + 1)
+        ])
+
+        for offset in range(0, rows, INSERT_BATCH):
+            batch = range(offset + 1, min(offset + INSERT_BATCH, rows) + 1)
+            requests = []
+            history = []
+
+            for request_id in batch:
+                begins = start + timedelta(days=random.randrange(730))
+                requests.append({
+                    "id": request_id,
+                    "employee_id": random.randint(1, EMPLOYEES),
+                    "request_type": random.choice(types),
+                    "status": random.choice(statuses),
+                    "start_date": begins,
+                    "end_date": begins + timedelta(days=random.randrange(14)),
+                    "comment": "Синтетическая заявка",
+                    "created_at": begins - timedelta(days=7),
+                })
+                history.append({
+                    "request_id": request_id,
+                    "changed_by": random.randint(1, EMPLOYEES),
+                    "change_type": ChangeTypeEnum.CREATED.value,
+                    "new_value": RequestStatusEnum.PENDING.value,
+                    "changed_at": begins - timedelta(days=7),
+                })
+
+            await session.execute(insert(AbsenceRequest), requests)
+            await session.execute(insert(AbsenceRequestHistory), history)
+
+        await session.commit()
+
+
+async def run_export(session_factory, fmt: str, tmp_dir: str) -> None:
+    """Выгружает базу в формате fmt и печатает RSS по ходу выгрузки."""
+    service = RequestExportService()
+    params = ExportParams(fmt=fmt)
+    path = os.path.join(tmp_dir, params.filename)
+    samples: list[tuple[int, float]] = []
+    next_sample = 0
+
+    async def on_progress(rows: int) -> None:
+        nonlocal next_sample
+        if rows >= next_sample:
+            samples.append((rows, rss_mb()))
+            next_sample = rows + 100_000
+
+    baseline = rss_mb()
+    started = time.perf_counter()
+
+    async with session_factory() as session:
+        rows = await service.write(session, params, path, on_progress)
+
+    samples.append((rows, rss_mb()))
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path) / 2**20
+    os.remove(path)
+
+    print(f"\n{fmt.upper()}: {rows} строк за {elapsed:.1f} с, {size:.0f} МБ")
+    print(f"  RSS до выгрузки: {baseline:.0f} МБ")
+    for done, rss in samples:
+        print(f"  {done:>9} строк: RSS {rss:.0f} МБ")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["csv", "xlsx"],
+        default=["csv", "xlsx"]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_dir}/bench.db"
+        )
+        session_factory = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        started = time.perf_counter()
+        await populate(session_factory, args.rows)
+        print(
+            f"Создано {args.rows} заявок за "
+            f"{time.perf_counter() - started:.1f} с"
+        )
+
+        for fmt in args.formats:
+            await run_export(session_factory, fmt, tmp_dir)
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+"""Бенчмарк записи в SQLite с профилем PRAGMA и без него.
+
+Для каждого режима создаёт временную базу и запускает несколько
+конкурентных писателей: каждый создаёт заявки через create_absence_request
+(заявка, дни отсутствия и событие outbox в одной транзакции), а читатели
+тем временем считают ожидающие заявки. Печатает число коммитов в секунду,
+задержки и количество ошибок «database is locked».
+
+    python scripts/bench_sqlite.py --writers 8 --requests 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from config import DbConfig
+from database.base import Base
+from database.crud.requests import create_absence_request
+from database.enums import RequestStatusEnum
+from database.models import AbsenceRequest, Employee
+from database.sqlite import apply_sqlite_pragmas
+
+EMPLOYEES = 100
+
+
+async def writer(
+    session_factory,
+    writer_id: int,
+    requests: int,
+    latencies: list[float],
+    errors: list[str]
+) -> None:
+    """Создаёт requests заявок, по транзакции на заявку."""
+    start = date(2030, 1, 1)
+
+    for i in range(requests):
+        began = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                await create_absence_request(
+                    session,
+                    employee_id=(writer_id * requests + i) % EMPLOYEES + 1,
+                    request_type="vacation",
+                    start_date=start + timedelta(days=i % 300),
+                    end_date=start + timedelta(days=i % 300 + 6),
+                    comment="Бенчмарк"
+                )
+        except OperationalError as e:
+            errors.append(str(e.orig))
+        latencies.append(time.perf_counter() - began)
+
+
+async def reader(session_factory, stop: asyncio.Event) -> int:
+    """Читает число ожидающих заявок, пока писатели работают."""
+    reads = 0
+
+    while not stop.is_set():
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    select(func.count(AbsenceRequest.id))
+                    .where(
+                        AbsenceRequest.status
+                        == RequestStatusEnum.PENDING.value
+                    )
+                )
+            reads += 1
+        except OperationalError:
+            pass
+        await asyncio.sleep(0)
+
+    return reads
+
+
+async def run(db: DbConfig, path: str, args) -> None:
+    """Прогоняет нагрузку на одной базе и печатает результат."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        **db.engine_options
+    )
+    apply_sqlite_pragmas(engine, db.sqlite_pragmas)
+    session_factory = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Employee), [
+            {
+                "name": f"Имя{i}",
+                "last_name": f"Фамилия{i}",
+                "email": f"employee{i}@example.com",
+                "role": "user",
+            }
+            for i in range(1, EMPLOYEES + 1)
+        ])
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    stop = asyncio.Event()
+
+    readers = [
+        asyncio.create_task(reader(session_factory, stop))
+        for _ in range(args.readers)
+    ]
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        writer(session_factory, i, args.requests, latencies, errors)
+        for i in range(args.writers)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    reads = sum(await asyncio.gather(*readers))
+
+    await engine.dispose()
+
+    commits = len(latencies) - len(errors)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    mode = "с профилем" if db.sqlite_pragmas else "без профиля"
+
+    print(f"\nSQLite {mode}:")
+    print(f"  коммитов: {commits} за {elapsed:.1f} с "
+          f"({commits / elapsed:.0f}/с)")
+    print(f"  задержка: медиана {statistics.median(latencies) * 1000:.1f} мс, "
+          f"p95 {p95 * 1000:.1f} мс")
+    print(f"  чтений: {reads}")
+    print(f"  ошибок блокировки: {len(errors)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for tuning in (False, True):
+            db = DbConfig(
+                prod_db=False,
+                sqlite_tuning=tuning,
+                connect_timeout=args.timeout
+            )
+            await run(db, f"{tmp_dir}/bench_{tuning}.db", args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
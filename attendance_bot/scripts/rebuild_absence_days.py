@@ -0,0 +1,36 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+current_dir = Path(__file__).parent
+project_root = current_dir.parent
+sys.path.insert(0, str(project_root))
+
+from database.crud.absence_days import rebuild_absence_days
+from database.session import AsyncSessionLocal
+
+
+async def main():
+    """Пересобирает таблицу absence_days по всем заявкам."""
+
+    print("\n" + "=" * 50)
+    print("Пересборка дней отсутствия".center(50))
+    print("=" * 50)
+
+    try:
+        async with AsyncSessionLocal() as session:
+            days = await rebuild_absence_days(session)
+
+        print(f"Готово! Записано дней отсутствия: {days}")
+
+    except OperationalError as e:
+        print(f"\n❌ Ошибка базы данных: {e}")
+        print("ℹ️  Возможно таблицы не созданы. Выполните миграции:")
+        print("   alembic upgrade head")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
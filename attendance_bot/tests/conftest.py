@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.crud.employee import _role_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_role_cache():
+    """Кэш ролей общий на процесс: каждый тест начинает с пустого."""
+    _role_cache.clear()
+    yield
+    _role_cache.clear()
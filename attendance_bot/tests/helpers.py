@@ -0,0 +1,120 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
+
+from database.base import Base
+from database.routing import routing_sessionmaker
+
+
+class StatementCounter:
+    """Запоминает SQL-запросы, которые движки отправляют в БД.
+
+    PRAGMA при подключении и BEGIN/COMMIT драйвера не учитываются:
+    они не проходят через before_cursor_execute.
+    """
+
+    def __init__(self, *engines: AsyncEngine):
+        """Инициализирует счётчик для engines."""
+
+        self.statements: list[tuple[AsyncEngine, str]] = []
+        self._listeners = {
+            engine: self._listener(engine) for engine in engines
+        }
+
+    def __enter__(self) -> "StatementCounter":
+        """Подписывается на выполнение запросов."""
+        for engine, listener in self._listeners.items():
+            event.listen(
+                engine.sync_engine,
+                "before_cursor_execute",
+                listener
+            )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Отписывается от движков."""
+        for engine, listener in self._listeners.items():
+            event.remove(
+                engine.sync_engine,
+                "before_cursor_execute",
+                listener
+            )
+
+    def _listener(self, engine: AsyncEngine):
+        """Обработчик события для одного движка."""
+        def on_execute(conn, cursor, statement, *args) -> None:
+            self.statements.append((engine, statement))
+
+        return on_execute
+
+    @property
+    def count(self) -> int:
+        """Сколько запросов выполнено."""
+        return len(self.statements)
+
+    def on(self, engine: AsyncEngine) -> list[str]:
+        """Запросы, выполненные на engine."""
+        return [sql for target, sql in self.statements if target is engine]
+
+    def reset(self) -> None:
+        """Забывает учтённые запросы."""
+        self.statements.clear()
+
+
+@dataclass
+class SqliteDatabase:
+    """Временная база SQLite и, если нужно, её реплика."""
+
+    engine: AsyncEngine
+    replica: AsyncEngine | None
+    session_factory: async_sessionmaker[AsyncSession]
+
+    def count_statements(self) -> StatementCounter:
+        """Счётчик запросов ко всем движкам базы."""
+        if self.replica is None:
+            return StatementCounter(self.engine)
+        return StatementCounter(self.engine, self.replica)
+
+
+def _create_engine(path: Path) -> AsyncEngine:
+    """Движок SQLite без пула: процесс не зависает на выходе."""
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        poolclass=NullPool
+    )
+
+
+@asynccontextmanager
+async def sqlite_database(path: Path, replica_path: Path | None = None):
+    """Создаёт схему в path (и в replica_path) и отдаёт SqliteDatabase.
+
+    Реплика — отдельный файл со своей схемой; данные между файлами не
+    копируются, так что по содержимому видно, какой файл прочитан.
+    """
+    engine = _create_engine(path)
+    replica = _create_engine(replica_path) if replica_path else None
+
+    try:
+        for target in (engine, replica):
+            if target is not None:
+                async with target.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+
+        yield SqliteDatabase(
+            engine,
+            replica,
+            routing_sessionmaker(engine, replica)
+        )
+    finally:
+        await engine.dispose()
+        if replica is not None:
+            await replica.dispose()
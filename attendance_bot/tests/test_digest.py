@@ -0,0 +1,76 @@
+"""Утренняя сводка рассылается один раз за день."""
+import asyncio
+from datetime import date, datetime
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message
+
+from bot.services.digest import DailyDigest
+from database.crud.employee import bind_telegram_to_employee, create_employee
+from database.enums import RoleEnum
+from helpers import sqlite_database
+from schemas.employee import EmployeeCreate
+
+DAY = date(2030, 1, 10)
+
+
+class CountingTelegram(BaseSession):
+    """Сессия бота без сети, считающая отправленные сообщения."""
+
+    def __init__(self):
+        """Инициализирует счётчик."""
+
+        super().__init__()
+        self.sent = 0
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def make_request(self, bot, method, timeout=None):
+        if not isinstance(method, SendMessage):
+            return True
+
+        self.sent += 1
+        return Message(
+            message_id=self.sent,
+            date=datetime.now(),
+            chat=Chat(id=method.chat_id, type="private"),
+            text=method.text
+        )
+
+
+def test_digest_sent_once_per_day(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            async with db.session_factory() as session:
+                admin = await create_employee(
+                    session,
+                    EmployeeCreate(
+                        name="Анна",
+                        last_name="Админова",
+                        email="admin@example.com"
+                    ),
+                    role=RoleEnum.ADMIN
+                )
+                await bind_telegram_to_employee(session, admin.id, 101)
+                await session.commit()
+
+            telegram = CountingTelegram()
+            bot = Bot("123:abc", session=telegram)
+            instances = [
+                DailyDigest(bot, db.session_factory) for _ in range(2)
+            ]
+
+            await asyncio.gather(*(digest.send(DAY) for digest in instances))
+            await instances[0].send(DAY)
+            same_day = telegram.sent
+
+            await instances[1].send(DAY.replace(day=11))
+            return same_day, telegram.sent
+
+    assert asyncio.run(scenario()) == (1, 2)
@@ -0,0 +1,243 @@
+"""Сколько SQL-запросов выполняет каждая CRUD-функция сотрудников.
+
+Связи Employee объявлены с lazy="raise", поэтому чтение сотрудника
+не тянет за собой invite_codes и created_invites: дополнительный запрос
+появляется только там, где функция явно просит связь.
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import InvalidRequestError
+
+from database.crud.admin_notifications import create_admin_notifications
+from database.crud.employee import (
+    bind_telegram_to_employee,
+    count_employees,
+    create_employee,
+    delete_employee_by_id,
+    get_admin_recipients,
+    get_employee_by_email,
+    get_employee_by_id,
+    get_employee_by_telegram_id,
+    get_employee_identity,
+    get_employee_role,
+    list_employees,
+)
+from database.crud.requests import (
+    create_absence_request,
+    update_request_status,
+)
+from database.enums import RequestStatusEnum, RoleEnum
+from database.models import (
+    AbsenceDay,
+    AbsenceRequest,
+    AbsenceRequestHistory,
+    AdminNotification,
+)
+from helpers import sqlite_database
+from schemas.employee import EmployeeCreate
+
+TELEGRAM_ID = 42
+EMAIL = "ivanov@example.com"
+
+
+async def _seed(db) -> int:
+    """Создаёт админа с привязанным telegram_id и возвращает его id."""
+    async with db.session_factory() as session:
+        employee = await create_employee(
+            session,
+            EmployeeCreate(name="Иван", last_name="Иванов", email=EMAIL),
+            role=RoleEnum.ADMIN
+        )
+        await bind_telegram_to_employee(session, employee.id, TELEGRAM_ID)
+        await session.commit()
+    return employee.id
+
+
+READS = [
+    ("get_employee_by_email", lambda s, _: get_employee_by_email(s, EMAIL), 1),
+    ("get_employee_by_id", lambda s, id_: get_employee_by_id(s, id_), 2),
+    (
+        "get_employee_by_telegram_id",
+        lambda s, _: get_employee_by_telegram_id(s, TELEGRAM_ID),
+        1,
+    ),
+    ("list_employees", lambda s, _: list_employees(s), 1),
+    ("count_employees", lambda s, _: count_employees(s), 1),
+    ("get_admin_recipients", lambda s, _: get_admin_recipients(s), 1),
+    (
+        "get_employee_identity",
+        lambda s, _: get_employee_identity(s, TELEGRAM_ID),
+        1,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "call, expected",
+    [(call, expected) for _, call, expected in READS],
+    ids=[name for name, _, _ in READS]
+)
+def test_read_statements(tmp_path, call, expected):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            employee_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    await call(session, employee_id)
+
+            return counter.count
+
+    assert asyncio.run(scenario()) == expected
+
+
+def test_create_employee_statements(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    await create_employee(
+                        session,
+                        EmployeeCreate(
+                            name="Иван",
+                            last_name="Иванов",
+                            email=EMAIL
+                        )
+                    )
+            return counter.count
+
+    # Проверка email, INSERT сотрудника, INSERT кода, refresh id и
+    # загрузка invite_codes для ответа.
+    assert asyncio.run(scenario()) == 5
+
+
+def test_bind_telegram_statements(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            employee_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    await bind_telegram_to_employee(
+                        session,
+                        employee_id,
+                        TELEGRAM_ID + 1
+                    )
+            return counter.count
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_role_lookup_cached(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    first = await get_employee_role(session, TELEGRAM_ID)
+                    second = await get_employee_role(session, TELEGRAM_ID)
+            return first, second, counter.count
+
+    assert asyncio.run(scenario()) == (RoleEnum.ADMIN.value,) * 2 + (1,)
+
+
+def test_bind_telegram_invalidates_role_after_commit(tmp_path):
+    new_id = TELEGRAM_ID + 1
+
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            employee_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                assert await get_employee_role(session, new_id) is None
+
+                await bind_telegram_to_employee(session, employee_id, new_id)
+                before_commit = await get_employee_role(session, new_id)
+                await session.commit()
+                after_commit = await get_employee_role(session, new_id)
+
+            return before_commit, after_commit
+
+    assert asyncio.run(scenario()) == (None, RoleEnum.ADMIN.value)
+
+
+def test_relationships_not_loaded_implicitly(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                employee = await get_employee_by_email(session, EMAIL)
+
+                with pytest.raises(InvalidRequestError):
+                    employee.invite_codes
+
+    asyncio.run(scenario())
+
+
+def test_delete_employee_with_requests(tmp_path):
+    children = (
+        AbsenceRequest,
+        AbsenceRequestHistory,
+        AbsenceDay,
+        AdminNotification,
+    )
+
+    async def count_children(session) -> list[int]:
+        return [
+            await session.scalar(select(func.count()).select_from(model))
+            for model in children
+        ]
+
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            admin_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                employee = await create_employee(
+                    session,
+                    EmployeeCreate(
+                        name="Пётр",
+                        last_name="Петров",
+                        email="petrov@example.com"
+                    )
+                )
+                for start in (date(2030, 1, 10), date(2030, 2, 10)):
+                    request = await create_absence_request(
+                        session,
+                        employee.id,
+                        "vacation",
+                        start,
+                        start.replace(day=12)
+                    )
+                    await create_admin_notifications(
+                        session,
+                        request.id,
+                        [(admin_id, request.id, TELEGRAM_ID)]
+                    )
+                    await session.commit()
+                await update_request_status(
+                    session,
+                    request.id,
+                    RequestStatusEnum.APPROVED.value,
+                    admin_id
+                )
+
+            async with db.session_factory() as session:
+                before = await count_children(session)
+                deleted = await delete_employee_by_id(session, employee.id)
+
+            async with db.session_factory() as session:
+                after = await count_children(session)
+
+            return before, deleted.id == employee.id, after
+
+    before, deleted, after = asyncio.run(scenario())
+
+    assert before == [2, 1, 6, 2]
+    assert deleted
+    assert after == [0, 0, 0, 0]
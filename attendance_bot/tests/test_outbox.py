@@ -0,0 +1,161 @@
+"""Рассылка новой заявки админам через outbox."""
+import asyncio
+from datetime import date, datetime, timezone
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramNetworkError
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message
+from sqlalchemy import func, select, update
+
+import bot.services.outbox as outbox_module
+from bot.services.outbox import OutboxDispatcher
+from database.crud.employee import bind_telegram_to_employee, create_employee
+from database.crud.requests import create_absence_request
+from database.enums import OutboxStatusEnum, RoleEnum
+from database.models import AdminNotification, NotificationOutbox
+from helpers import sqlite_database
+from schemas.employee import EmployeeCreate
+
+ADMIN_CHATS = (101, 102, 103)
+
+
+class FlakyTelegram(BaseSession):
+    """Сессия бота без сети, которая роняет отправки в failing-чаты."""
+
+    def __init__(self, failing: set[int], delay: float = 0):
+        """Инициализирует журнал отправок."""
+
+        super().__init__()
+        self.failing = failing
+        self.delay = delay
+        self.sent: list[int] = []
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def make_request(self, bot, method, timeout=None):
+        if not isinstance(method, SendMessage):
+            return True
+
+        await asyncio.sleep(self.delay)
+        if method.chat_id in self.failing:
+            raise TelegramNetworkError(method, "Нет связи")
+
+        self.sent.append(method.chat_id)
+        return Message(
+            message_id=len(self.sent),
+            date=datetime.now(),
+            chat=Chat(id=method.chat_id, type="private"),
+            text=method.text
+        )
+
+
+async def _seed(db) -> None:
+    """Создаёт админов и заявку сотрудника с событием в outbox."""
+    async with db.session_factory() as session:
+        for chat_id in ADMIN_CHATS:
+            admin = await create_employee(
+                session,
+                EmployeeCreate(
+                    name="Админ",
+                    last_name=f"Админов{chat_id}",
+                    email=f"admin{chat_id}@example.com"
+                ),
+                role=RoleEnum.ADMIN
+            )
+            await bind_telegram_to_employee(session, admin.id, chat_id)
+        employee = await create_employee(
+            session,
+            EmployeeCreate(
+                name="Пётр",
+                last_name="Петров",
+                email="petrov@example.com"
+            )
+        )
+        await session.commit()
+        await create_absence_request(
+            session,
+            employee.id,
+            "vacation",
+            date(2030, 1, 10),
+            date(2030, 1, 12)
+        )
+
+
+async def _outbox_state(db) -> tuple[str, int]:
+    """Статус события и число сохранённых уведомлений админам."""
+    async with db.session_factory() as session:
+        status = await session.scalar(select(NotificationOutbox.status))
+        notifications = await session.scalar(
+            select(func.count(AdminNotification.id))
+        )
+    return status, notifications
+
+
+async def _make_due(db) -> None:
+    """Снимает задержку повтора с события."""
+    async with db.session_factory() as session:
+        await session.execute(
+            update(NotificationOutbox).values(
+                next_attempt_at=datetime(2000, 1, 1, tzinfo=timezone.utc)
+            )
+        )
+        await session.commit()
+
+
+def test_retry_sends_only_to_missed_admins(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _seed(db)
+            telegram = FlakyTelegram(failing={102})
+            outbox = OutboxDispatcher(
+                Bot("123:abc", session=telegram),
+                db.session_factory
+            )
+
+            await outbox.process_batch()
+            first = telegram.sent[:], await _outbox_state(db)
+
+            telegram.failing.clear()
+            telegram.sent.clear()
+            await _make_due(db)
+            await outbox.process_batch()
+            second = telegram.sent[:], await _outbox_state(db)
+
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert sorted(first[0]) == [101, 103]
+    assert first[1] == (OutboxStatusEnum.PENDING.value, 2)
+    assert second == ([102], (OutboxStatusEnum.SENT.value, 3))
+
+
+def test_fan_out_stops_before_lease_expires(tmp_path, monkeypatch):
+    monkeypatch.setattr(outbox_module, "OUTBOX_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(outbox_module, "OUTBOX_LEASE_MARGIN", 0.1)
+
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _seed(db)
+            telegram = FlakyTelegram(failing=set(), delay=0.5)
+            outbox = OutboxDispatcher(
+                Bot("123:abc", session=telegram),
+                db.session_factory
+            )
+
+            started = asyncio.get_running_loop().time()
+            await outbox.process_batch()
+            elapsed = asyncio.get_running_loop().time() - started
+
+            return elapsed, await _outbox_state(db)
+
+    elapsed, state = asyncio.run(scenario())
+
+    assert elapsed < 0.5
+    assert state == (OutboxStatusEnum.PENDING.value, 0)
@@ -0,0 +1,144 @@
+"""Маршрутизация запросов между основной БД и репликой.
+
+Основная база и реплика — два разных файла SQLite, данные в них
+заполняются независимо, поэтому по ответу видно, какой файл прочитан.
+"""
+import asyncio
+
+from sqlalchemy import insert, select, update
+
+from database.crud.employee import (
+    bind_telegram_to_employee,
+    get_employee_by_email,
+    list_employees,
+)
+from database.models import Employee
+from database.routing import read_only
+from helpers import sqlite_database
+
+
+def _employee(name: str) -> dict:
+    """Строка сотрудника для INSERT."""
+    return {
+        "name": name,
+        "last_name": name,
+        "email": f"{name.lower()}@example.com",
+        "role": "user",
+    }
+
+
+async def _seed(db) -> None:
+    """Кладёт в основную базу и в реплику разных сотрудников."""
+    async with db.engine.begin() as conn:
+        await conn.execute(insert(Employee), [_employee("Primary")])
+    async with db.replica.begin() as conn:
+        await conn.execute(insert(Employee), [_employee("Replica")])
+
+
+def _names(employees) -> list[str]:
+    """Имена сотрудников в порядке выдачи."""
+    return [employee.name for employee in employees]
+
+
+def test_read_only_crud_reads_replica(tmp_path):
+    async def scenario():
+        async with sqlite_database(
+            tmp_path / "primary.db",
+            tmp_path / "replica.db"
+        ) as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    employees = await list_employees(session)
+
+            assert _names(employees) == ["Replica"]
+            assert counter.on(db.engine) == []
+            assert len(counter.on(db.replica)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_unmarked_crud_reads_primary(tmp_path):
+    async def scenario():
+        async with sqlite_database(
+            tmp_path / "primary.db",
+            tmp_path / "replica.db"
+        ) as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    employee = await get_employee_by_email(
+                        session,
+                        "primary@example.com"
+                    )
+
+            assert employee is not None
+            assert counter.on(db.replica) == []
+
+    asyncio.run(scenario())
+
+
+def test_reads_after_write_stay_on_primary(tmp_path):
+    async def scenario():
+        async with sqlite_database(
+            tmp_path / "primary.db",
+            tmp_path / "replica.db"
+        ) as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                employee = await get_employee_by_email(
+                    session,
+                    "primary@example.com"
+                )
+                with db.count_statements() as counter:
+                    await bind_telegram_to_employee(session, employee.id, 7)
+                    employees = await list_employees(session)
+
+            assert _names(employees) == ["Primary"]
+            assert counter.on(db.replica) == []
+
+    asyncio.run(scenario())
+
+
+def test_writes_inside_read_only_go_to_primary(tmp_path):
+    @read_only
+    async def rename_and_list(session):
+        await session.execute(
+            update(Employee).values(position="Инженер")
+        )
+        result = await session.execute(select(Employee.position))
+        return list(result.scalars())
+
+    async def scenario():
+        async with sqlite_database(
+            tmp_path / "primary.db",
+            tmp_path / "replica.db"
+        ) as db:
+            await _seed(db)
+
+            async with db.session_factory() as session:
+                with db.count_statements() as counter:
+                    positions = await rename_and_list(session)
+                await session.commit()
+
+            assert positions == ["Инженер"]
+            assert counter.on(db.replica) == []
+
+    asyncio.run(scenario())
+
+
+def test_without_replica_everything_reads_primary(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "primary.db") as db:
+            async with db.engine.begin() as conn:
+                await conn.execute(insert(Employee), [_employee("Primary")])
+
+            async with db.session_factory() as session:
+                employees = await list_employees(session)
+
+            assert _names(employees) == ["Primary"]
+
+    asyncio.run(scenario())
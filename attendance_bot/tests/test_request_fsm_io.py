@@ -0,0 +1,277 @@
+"""Обращения к FSM-хранилищу из хендлеров создания заявки.
+
+Весь сценарий создания заявки проходит через Dispatcher с теми же
+middleware, что в main.py, включая очереди UpdateScheduler. На каждый
+апдейт состояние читается не больше одного раза (это делает сам aiogram
+для фильтров, уже в воркере шарда), данные — не больше одного раза, и
+каждое из них записывается не больше одного раза, когда хендлер вернул
+управление.
+"""
+import asyncio
+from collections import Counter
+from datetime import datetime
+from itertools import count
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import SendDocument, SendMessage
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.handlers.user import (
+    request_base,
+    request_full,
+    request_navigation,
+    request_partial,
+    user_router,
+)
+from bot.lexicon.lexicon import CallbackData, MenuButtons
+from bot.services.outbox import OutboxDispatcher
+from bot.storage import SQLAlchemyStorage
+from database.crud.employee import bind_telegram_to_employee, create_employee
+from helpers import sqlite_database
+from middlewares.db import DbSessionMiddleware
+from middlewares.fsm_buffer import FSMBufferMiddleware
+from middlewares.identity import IdentityMiddleware
+from middlewares.scheduler import UpdateScheduler
+from schemas.employee import EmployeeCreate
+
+USER_ID = 2
+MODULES = (request_base, request_full, request_navigation, request_partial)
+
+
+class FakeTelegram(BaseSession):
+    """Сессия бота без сети: отправка сообщений возвращает Message."""
+
+    def __init__(self):
+        """Инициализирует счётчик message_id."""
+
+        super().__init__()
+        self.message_ids = count(1000)
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def make_request(self, bot, method, timeout=None):
+        if isinstance(method, (SendMessage, SendDocument)):
+            return Message(
+                message_id=next(self.message_ids),
+                date=datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                text=getattr(method, "text", None)
+            )
+        return True
+
+
+class RecordingStorage(MemoryStorage):
+    """MemoryStorage, который считает обращения."""
+
+    def __init__(self):
+        """Инициализирует пустой счётчик."""
+
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+
+    async def get_state(self, key):
+        self.calls["get_state"] += 1
+        return await super().get_state(key)
+
+    async def get_data(self, key):
+        self.calls["get_data"] += 1
+        return await super().get_data(key)
+
+    async def set_state(self, key, state=None):
+        self.calls["set_state"] += 1
+        return await super().set_state(key, state)
+
+    async def set_data(self, key, data):
+        self.calls["set_data"] += 1
+        return await super().set_data(key, data)
+
+
+_update_ids = count(1)
+
+
+def _user() -> User:
+    """Отправитель тестовых апдейтов."""
+    return User(id=USER_ID, is_bot=False, first_name="Пётр")
+
+
+def _message(text: str) -> Update:
+    """Апдейт с текстовым сообщением."""
+    return Update(
+        update_id=next(_update_ids),
+        message=Message(
+            message_id=next(_update_ids),
+            date=datetime.now(),
+            chat=Chat(id=USER_ID, type="private"),
+            from_user=_user(),
+            text=text
+        )
+    )
+
+
+def _callback(data: str) -> Update:
+    """Апдейт с нажатием инлайн-кнопки."""
+    return Update(
+        update_id=next(_update_ids),
+        callback_query=CallbackQuery(
+            id=str(next(_update_ids)),
+            from_user=_user(),
+            chat_instance="test",
+            message=Message(
+                message_id=1,
+                date=datetime.now(),
+                chat=Chat(id=USER_ID, type="private"),
+                text="—"
+            ),
+            data=data
+        )
+    )
+
+
+FLOW = [
+    _message(MenuButtons.SUBMIT_REQUEST),
+    _callback("req_type:vacation"),
+    _callback("start:prev:2030:1"),
+    _callback("start:next:2030:1"),
+    _callback("start:past:2030:1:1"),
+    _callback("start:ignore"),
+    _callback("start:day:2030:1:10"),
+    _callback("end:day:2030:1:12"),
+    _message("Семейные обстоятельства"),
+    _callback(CallbackData.EDIT_START_DATE),
+    _callback(CallbackData.BACK_TO_PREVIEW),
+    _callback(CallbackData.EDIT),
+    _callback("req_type:remote"),
+    _callback("start:day:2030:2:10"),
+    _callback("end:day:2030:2:11"),
+    _callback(CallbackData.COMMENT_SKIP),
+    _callback(CallbackData.CONFIRM),
+    _message(MenuButtons.SUBMIT_REQUEST),
+    _callback("req_type:partial_absence"),
+    _callback("partial:day:2030:3:5"),
+    _callback("partial_start:hour:9"),
+    _callback("partial_end:hour:12"),
+    _callback(CallbackData.CANCEL),
+]
+
+
+DB_FREE_STEPS = {"start:past:2030:1:1", "start:ignore"}
+
+
+def _request_handlers() -> set:
+    """Все хендлеры модулей request_*."""
+    return {
+        handler.callback
+        for module in MODULES
+        for observer in (module.router.message, module.router.callback_query)
+        for handler in observer.handlers
+    }
+
+
+def test_one_read_and_write_per_update(tmp_path):
+    storage = RecordingStorage()
+    handled = set()
+
+    checkouts = []
+
+    async def track_handler(handler, event, data):
+        """Запоминает, какой хендлер обработал апдейт."""
+        assert isinstance(data["session"], AsyncSession)
+        handled.add(data["handler"].callback)
+        return await handler(event, data)
+
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            async with db.session_factory() as session:
+                employee = await create_employee(
+                    session,
+                    EmployeeCreate(
+                        name="Пётр",
+                        last_name="Петров",
+                        email="petrov@example.com"
+                    )
+                )
+                await bind_telegram_to_employee(session, employee.id, USER_ID)
+                await session.commit()
+
+            bot = Bot("123:abc", session=FakeTelegram())
+            dp = Dispatcher(storage=storage)
+            dp["outbox"] = OutboxDispatcher(bot, db.session_factory)
+            dp["scheduler"] = UpdateScheduler()
+            dp["scheduler"].install(dp)
+            dp.update.middleware(DbSessionMiddleware(db.session_factory))
+            dp.update.middleware(IdentityMiddleware())
+            for observer in (dp.message, dp.callback_query):
+                observer.middleware(FSMBufferMiddleware())
+                observer.middleware(track_handler)
+            dp.include_router(user_router)
+
+            event.listen(
+                db.engine.sync_engine,
+                "checkout",
+                lambda *args: checkouts.append(args)
+            )
+
+            dp["scheduler"].start()
+            try:
+                for update in FLOW:
+                    storage.calls.clear()
+                    checkouts.clear()
+                    await dp.feed_update(bot, update)
+                    await dp["scheduler"].join()
+
+                    received = update.message or update.callback_query
+                    step = getattr(received, "data", None) or received.text
+                    assert max(storage.calls.values(), default=0) <= 1, (
+                        step,
+                        dict(storage.calls)
+                    )
+                    # Кнопки календаря не ходят в БД, а сотрудник уже в
+                    # кэше ролей: сессия не берёт соединение из пула.
+                    if step in DB_FREE_STEPS:
+                        assert checkouts == [], step
+            finally:
+                await dp["scheduler"].stop()
+
+            return dp["scheduler"].processed, dp["scheduler"].failed
+
+    assert asyncio.run(scenario()) == (len(FLOW), 0)
+    assert handled == _request_handlers()
+
+
+def test_sql_storage_writes_state_and_data_together(tmp_path):
+    key = StorageKey(bot_id=1, chat_id=USER_ID, user_id=USER_ID)
+
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            storage = SQLAlchemyStorage(
+                db.session_factory,
+                flush_interval=60
+            )
+
+            with db.count_statements() as counter:
+                await storage.set_data(key, {"request_type": "vacation"})
+                await storage.set_state(key, "CreateRequestStates:confirming")
+                await storage.close()
+
+            # Кроме строки состояния, первый сброс чистит истёкшие записи.
+            upserts = [
+                sql for sql in counter.on(db.engine)
+                if sql.lstrip().upper().startswith("INSERT")
+            ]
+            assert len(upserts) == 1, upserts
+
+            assert await storage.get_state(key) == (
+                "CreateRequestStates:confirming"
+            )
+            assert await storage.get_data(key) == {"request_type": "vacation"}
+
+    asyncio.run(scenario())
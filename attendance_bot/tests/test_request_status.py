@@ -0,0 +1,141 @@
+"""Переходы статуса заявки: решение админа и отмена сотрудником."""
+import asyncio
+from datetime import date
+
+from sqlalchemy import func, select
+
+from database.crud.employee import create_employee
+from database.crud.requests import (
+    cancel_request_by_user,
+    create_absence_request,
+    update_request_status,
+)
+from database.enums import RequestStatusEnum, RoleEnum
+from database.models import AbsenceRequest, AbsenceRequestHistory
+from helpers import sqlite_database
+from schemas.employee import EmployeeCreate
+
+
+async def _seed(db) -> tuple[int, int, int]:
+    """Создаёт админа, сотрудника и его заявку; возвращает их id."""
+    async with db.session_factory() as session:
+        admin = await create_employee(
+            session,
+            EmployeeCreate(
+                name="Анна",
+                last_name="Админова",
+                email="admin@example.com"
+            ),
+            role=RoleEnum.ADMIN
+        )
+        employee = await create_employee(
+            session,
+            EmployeeCreate(
+                name="Пётр",
+                last_name="Петров",
+                email="petrov@example.com"
+            )
+        )
+        request = await create_absence_request(
+            session,
+            employee.id,
+            "vacation",
+            date(2030, 1, 10),
+            date(2030, 1, 12)
+        )
+    return admin.id, employee.id, request.id
+
+
+async def _state(db, request_id: int) -> tuple[str, int]:
+    """Статус заявки и число записей в её истории."""
+    async with db.session_factory() as session:
+        status = await session.scalar(
+            select(AbsenceRequest.status)
+            .where(AbsenceRequest.id == request_id)
+        )
+        history = await session.scalar(
+            select(func.count(AbsenceRequestHistory.id))
+            .where(AbsenceRequestHistory.request_id == request_id)
+        )
+    return status, history
+
+
+def test_cancel_after_approve_keeps_approval(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            admin_id, employee_id, request_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                approved = await update_request_status(
+                    session,
+                    request_id,
+                    RequestStatusEnum.APPROVED.value,
+                    admin_id
+                )
+            async with db.session_factory() as session:
+                cancelled = await cancel_request_by_user(
+                    session,
+                    request_id,
+                    employee_id
+                )
+
+            assert approved is not None
+            assert cancelled is None
+            assert await _state(db, request_id) == (
+                RequestStatusEnum.APPROVED.value,
+                1
+            )
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_transitions_one_wins(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            admin_id, employee_id, request_id = await _seed(db)
+
+            async def approve():
+                async with db.session_factory() as session:
+                    return await update_request_status(
+                        session,
+                        request_id,
+                        RequestStatusEnum.APPROVED.value,
+                        admin_id
+                    )
+
+            async def cancel():
+                async with db.session_factory() as session:
+                    return await cancel_request_by_user(
+                        session,
+                        request_id,
+                        employee_id
+                    )
+
+            results = await asyncio.gather(approve(), approve(), cancel())
+            winners = [result for result in results if result is not None]
+
+            assert len(winners) == 1
+            assert await _state(db, request_id) == (winners[0].status, 1)
+
+    asyncio.run(scenario())
+
+
+def test_cancel_foreign_request(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            admin_id, _, request_id = await _seed(db)
+
+            async with db.session_factory() as session:
+                cancelled = await cancel_request_by_user(
+                    session,
+                    request_id,
+                    admin_id
+                )
+
+            assert cancelled is None
+            assert await _state(db, request_id) == (
+                RequestStatusEnum.PENDING.value,
+                0
+            )
+
+    asyncio.run(scenario())
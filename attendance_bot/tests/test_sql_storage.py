@@ -0,0 +1,94 @@
+"""SQLAlchemyStorage: сохранение состояний FSM в таблице fsm_states."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from aiogram.fsm.storage.base import StorageKey
+from sqlalchemy import func, insert, select
+
+from bot.storage import SQLAlchemyStorage
+from database.models import FsmState
+from helpers import sqlite_database
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=2)
+OTHER_KEY = StorageKey(bot_id=1, chat_id=3, user_id=3)
+
+
+async def _rows(db) -> int:
+    """Сколько строк в fsm_states."""
+    async with db.session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(FsmState))
+
+
+async def _insert_expired(db, key: StorageKey) -> None:
+    """Кладёт в таблицу состояние, истёкшее час назад."""
+    async with db.engine.begin() as conn:
+        await conn.execute(
+            insert(FsmState).values(
+                bot_id=key.bot_id,
+                chat_id=key.chat_id,
+                user_id=key.user_id,
+                state="Old:state",
+                data='{"stale": true}',
+                expires_at=datetime.now(timezone.utc) - timedelta(hours=1)
+            )
+        )
+
+
+def test_state_round_trip(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            writer = SQLAlchemyStorage(db.session_factory, flush_interval=60)
+            await writer.set_data(KEY, {"request_type": "vacation"})
+            await writer.set_state(KEY, "CreateRequestStates:confirming")
+
+            # set_state сохраняет сразу: другой инстанс видит запись
+            # до close() и до срабатывания таймера.
+            reader = SQLAlchemyStorage(db.session_factory)
+            stored = (
+                await reader.get_state(KEY),
+                await reader.get_data(KEY),
+            )
+
+            await writer.set_data(KEY, {})
+            await writer.set_state(KEY, None)
+            await writer.close()
+
+            return stored, await _rows(db)
+
+    stored, rows = asyncio.run(scenario())
+
+    assert stored == (
+        "CreateRequestStates:confirming",
+        {"request_type": "vacation"},
+    )
+    assert rows == 0
+
+
+def test_expired_state_is_not_read(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _insert_expired(db, KEY)
+
+            storage = SQLAlchemyStorage(db.session_factory)
+            return await storage.get_state(KEY), await storage.get_data(KEY)
+
+    assert asyncio.run(scenario()) == (None, {})
+
+
+def test_flush_purges_expired_states(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "test.db") as db:
+            await _insert_expired(db, KEY)
+
+            storage = SQLAlchemyStorage(
+                db.session_factory,
+                state_ttl=3600
+            )
+            await storage.set_state(OTHER_KEY, "CreateRequestStates:comment")
+            await storage.close()
+
+            async with db.session_factory() as session:
+                result = await session.execute(select(FsmState.chat_id))
+                return list(result.scalars())
+
+    assert asyncio.run(scenario()) == [OTHER_KEY.chat_id]
@@ -0,0 +1,67 @@
+"""Склейка правок одного сообщения в MessageEditCoalescer."""
+import asyncio
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText
+
+from bot.services.telegram_limits import (
+    MessageEditCoalescer,
+    TelegramRateLimiter,
+)
+
+
+class SlowTelegram(BaseSession):
+    """Сессия бота без сети: первая правка ждёт release.
+
+    Если задан flood, первая правка после release получает RetryAfter.
+    """
+
+    def __init__(self, flood: bool):
+        """Инициализирует журнал правок."""
+
+        super().__init__()
+        self.flood = flood
+        self.edits: list[str] = []
+        self.in_flight = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def make_request(self, bot, method, timeout=None):
+        first = not self.edits
+        self.edits.append(method.text)
+
+        if first:
+            self.in_flight.set()
+            await self.release.wait()
+            if self.flood:
+                raise TelegramRetryAfter(method, "Flood control", 0)
+        return True
+
+
+@pytest.mark.parametrize("flood", [False, True], ids=["sent", "retry_after"])
+def test_edit_during_request_sends_latest_text(flood):
+    async def scenario():
+        telegram = SlowTelegram(flood)
+        bot = Bot("123:abc", session=telegram)
+        editor = MessageEditCoalescer(
+            TelegramRateLimiter(global_rate=1000, chat_rate=1000)
+        )
+
+        first = asyncio.create_task(editor.edit(bot, 1, 10, "a"))
+        await telegram.in_flight.wait()
+        second = asyncio.create_task(editor.edit(bot, 1, 10, "b"))
+        await asyncio.sleep(0)
+        telegram.release.set()
+
+        results = await asyncio.gather(first, second)
+        return results, telegram.edits, editor._tasks, editor._latest
+
+    assert asyncio.run(scenario()) == ([True, True], ["a", "b"], {}, {})